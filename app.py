@@ -3,50 +3,26 @@ Flask Backend API สำหรับระบบตรวจจับคำซ
 Duplicate Word Detector - Automatic Word Frequency Analysis System
 """
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import json
 import os
 import base64
 import io
 import time
-import matplotlib
-matplotlib.use('Agg')  # ใช้ backend ที่ไม่ต้องการ GUI
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from core.duplicate_word_detector import ThaiDuplicateWordDetector
-from core.performance_utils import PerformanceTracker, CacheManager, ParallelProcessor, get_performance_summary
-from core.word_categorizer import ParliamentWordCategorizer
-from core.pdf_processor import PDFProcessor
-from core.database_manager import DatabaseManager
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from core.performance_utils import CacheManager, ParallelProcessor, LRUMemoryCache, get_performance_summary, performance_tracker
+from core.job_queue import JobQueue
+from core.lazy import LazyComponents
+from core.charts import chart_data
 from config.config import *
-import pandas as pd
-import numpy as np
 
 app = Flask(__name__)
 CORS(app)
 
-# ตั้งค่า matplotlib สำหรับฟอนต์ไทย
-import matplotlib.font_manager as fm
-
-# หาฟอนต์ที่มีในระบบ
-available_fonts = [f.name for f in fm.fontManager.ttflist]
-
-# ลองหาฟอนต์ที่รองรับภาษาไทย
-thai_font_candidates = [
-    'Tahoma', 'Arial', 'Microsoft Sans Serif', 'Segoe UI', 
-    'Calibri', 'Times New Roman', 'Courier New'
-]
-
-selected_font = 'DejaVu Sans'  # default
-for font in thai_font_candidates:
-    if font in available_fonts:
-        selected_font = font
-        break
-
-plt.rcParams['font.family'] = selected_font
-print(f"ใช้ฟอนต์: {selected_font}")
-
 # สร้างโฟลเดอร์สำหรับเก็บไฟล์ชั่วคราว
 UPLOAD_FOLDER = 'uploads'
 STATIC_FOLDER = 'static'
@@ -56,64 +32,143 @@ os.makedirs(STATIC_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['STATIC_FOLDER'] = STATIC_FOLDER
 
+# ==================== Components (สร้างเมื่อใช้งานครั้งแรก) ====================
+# โมเดล NLP, PDF libraries และฐานข้อมูลใช้เวลาโหลดนาน จึงนำเข้าและสร้างเมื่อ request แรกต้องการ
+# ทำให้ import app และการ fork worker เร็วขึ้น
+
+def build_detector():
+    from core.duplicate_word_detector import ThaiDuplicateWordDetector
+    return ThaiDuplicateWordDetector(segment_memo_size=SEGMENT_MEMO_SIZE, dictionary_dir=DICTIONARY_FOLDER)
+
+
+def build_categorizer():
+    from core.word_categorizer import ParliamentWordCategorizer
+    return ParliamentWordCategorizer()
+
+
+def build_pdf_processor():
+    from core.pdf_processor import PDFProcessor
+    return PDFProcessor(
+        max_workers=PDF_MAX_WORKERS,
+        pages_per_task=PDF_PAGES_PER_TASK,
+        min_text_chars=PDF_MIN_TEXT_CHARS,
+        ocr_dpi=OCR_DPI,
+        ocr_language=OCR_LANGUAGE
+    )
+
+
+def build_database():
+    from core.database_manager import DatabaseManager
+    return DatabaseManager(
+        tokenizer=tokenize_document,
+        num_perm=MINHASH_NUM_PERM,
+        lsh_bands=MINHASH_BANDS,
+        shingle_size=MINHASH_SHINGLE_SIZE,
+        kgram_size=PASSAGE_KGRAM_SIZE,
+        winnow_window=PASSAGE_WINDOW
+    )
+
+
+def tokenize_document(text):
+    # แยกคำสำหรับลายเซ็น MinHash และ fingerprint ด้วย dictionary เดียวกับ detector
+    return analysis_data['detector'].document_tokens(text)
+
+
+def build_batch_processor():
+    # ประมวลผลเอกสารจำนวนมาก (ไม่สร้างกราฟ บันทึกฐานข้อมูลแบบ bulk)
+    from core.batch_processor import BatchProcessor
+    return BatchProcessor(max_workers=BATCH_MAX_WORKERS, database=analysis_data['database'],
+                          dictionary_dir=DICTIONARY_FOLDER)
+
+
+def build_chart_service():
+    # กราฟแบบ Figure API (ไม่ใช้ pyplot) พร้อม cache ไฟล์ตาม hash ของข้อมูล
+    from core.charts import ChartService
+    return ChartService(
+        STATIC_FOLDER,
+        dpi=CHART_DPI,
+        figsize=CHART_FIGSIZE,
+        default_format=CHART_FORMAT,
+        max_files=CHART_CACHE_MAX_FILES,
+        colors=CHART_COLORS,
+        font_candidates=THAI_FONT_CANDIDATES,
+        default_font=DEFAULT_FONT
+    )
+
+
+def build_aggregator():
+    # สถิติสะสมของทุก request (None = ปิด)
+    if not ENABLE_CORPUS_STATS:
+        return None
+    from core.aggregator import CorpusAggregator
+    return CorpusAggregator(shards=CORPUS_STATS_SHARDS, history_size=ANALYSIS_HISTORY_SIZE)
+
+
 # ตัวแปรสำหรับเก็บข้อมูลการวิเคราะห์
-analysis_data = {
-    'detector': ThaiDuplicateWordDetector(),
-    'categorizer': ParliamentWordCategorizer(),
-    'pdf_processor': PDFProcessor(),
-    'database': DatabaseManager(),
-    'current_analysis': None,
-    'performance_tracker': PerformanceTracker()
-}
-
-
-def create_chart_image(chart_type, data, filename):
-    """สร้างภาพกราฟและบันทึกเป็นไฟล์"""
-    try:
-        if chart_type == 'word_frequency':
-            words, frequencies = zip(*data)
-            
-            plt.figure(figsize=(14, 10))
-            
-            # สร้างกราฟแบบ horizontal bar ด้วยสี Vibrant theme
-            colors = ['#007BFF', '#FF5733', '#FFEB3B', '#4A90E2', '#FF8A65', 
-                     '#FFD54F', '#212121', '#FF7043', '#FFC107', '#FF9800']
-            bars = plt.barh(range(len(words)), frequencies, 
-                           color=[colors[i % len(colors)] for i in range(len(words))])
-            
-            # ตั้งค่าแกน Y
-            plt.yticks(range(len(words)), words, fontsize=10)
-            plt.gca().invert_yaxis()
-            
-            # ตั้งค่าแกน X
-            plt.xlabel('ความถี่', fontsize=12, fontweight='bold')
-            plt.gca().xaxis.set_major_locator(plt.MaxNLocator(integer=True))
-            
-            # เพิ่มค่าความถี่บนแท่งกราฟ
-            for i, (word, freq) in enumerate(zip(words, frequencies)):
-                plt.text(freq + 0.1, i, str(freq), 
-                        va='center', ha='left', fontsize=9, fontweight='bold')
-            
-            # ตั้งค่าหัวข้อ
-            plt.title(f'คำที่มีความถี่สูงสุด {len(words)} คำ', 
-                     fontsize=14, fontweight='bold', pad=20)
-            
-            # เพิ่ม grid
-            plt.grid(axis='x', alpha=0.3, linestyle='--')
-            
-            # ปรับ layout
-            plt.tight_layout()
-            
-        # บันทึกไฟล์
-        filepath = os.path.join(app.config['STATIC_FOLDER'], filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return filepath
-        
-    except Exception as e:
-        print(f"Error creating chart: {e}")
+analysis_data = LazyComponents(
+    factories={
+        'detector': build_detector,
+        'categorizer': build_categorizer,
+        'pdf_processor': build_pdf_processor,
+        'database': build_database,
+        'batch_processor': build_batch_processor,
+        'chart_service': build_chart_service,
+        'aggregator': build_aggregator
+    },
+    performance_tracker=performance_tracker
+)
+
+# tracker ร่วมของ timing_decorator และ detector (span/histogram ต่อขั้นตอน)
+performance_tracker.enabled = ENABLE_PERFORMANCE_TRACKING
+performance_tracker.system.interval = SYSTEM_METRICS_INTERVAL
+
+# ผลการวิเคราะห์แยกตาม request (analysis_id -> ผลลัพธ์) สำหรับ /api/export
+analysis_results = LRUMemoryCache(max_entries=ANALYSIS_RESULTS_MAX)
+
+# คิวงานเบื้องหลังสำหรับการอัปโหลดไฟล์ (PDF/OCR ใช้เวลานาน)
+job_queue = JobQueue(max_workers=JOB_MAX_WORKERS, max_finished_jobs=JOB_MAX_FINISHED)
+
+
+def record_analysis(result):
+    """ส่งความถี่ของ request เข้าสถิติสะสม (asynchronous ไม่รอการรวม)"""
+    aggregator = analysis_data['aggregator']
+    if aggregator is not None:
+        aggregator.submit(result['word_frequency'], result['pos_frequency'], result['total_words'])
+
+
+def requested_chart_format(value):
+    """
+    รูปแบบกราฟที่ client ขอ
+    
+    Args:
+        value: 'png', 'svg', 'none' (เฉพาะข้อมูล ไม่สร้างภาพที่ server) หรือ None/True = ค่าเริ่มต้น
+    
+    Returns:
+        รูปแบบกราฟ หรือ None ถ้าไม่ต้องสร้างภาพ
+    """
+    if value is None or value is True or value == '':
+        return CHART_FORMAT
+    value = str(value).lower()
+    if value in ('none', 'data', 'false', '0'):
         return None
+    if value not in ('png', 'svg'):
+        raise ValueError(f'ไม่รองรับรูปแบบกราฟ: {value}')
+    return value
+
+
+def build_charts(top_words, chart_format):
+    """ข้อมูลกราฟสำหรับ client และ URL ของภาพ (สร้างภาพเฉพาะเมื่อ chart_format ไม่ใช่ None)"""
+    charts = {
+        'frequency_chart': None,
+        'frequency_data': chart_data('word_frequency', top_words)
+    }
+    if chart_format and top_words:
+        try:
+            filename = analysis_data['chart_service'].get_chart('word_frequency', top_words, chart_format)
+            charts['frequency_chart'] = f'/static/{filename}'
+        except Exception as e:
+            print(f"Error creating chart: {e}")
+    return charts
 
 
 @app.route('/')
@@ -134,16 +189,20 @@ def analyze_text():
         if not text:
             return jsonify({'error': 'ไม่มีข้อความที่ส่งมา'}), 400
         
-        # วิเคราะห์ข้อความ
+        try:
+            chart_format = requested_chart_format(data.get('charts'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # วิเคราะห์ข้อความ (ผลลัพธ์ของ request นี้เท่านั้น)
         detector = analysis_data['detector']
         categorizer = analysis_data['categorizer']
-        result = detector.analyze_text(text, filter_pos=filter_pos, target_pos=target_pos)
+        result = detector.analyze_text(text, filter_pos=filter_pos, target_pos=target_pos, record=False)
+        record_analysis(result)
         
-        # สร้างกราฟ
-        top_words = detector.get_most_frequent_words(10)
-        
-        # สร้างกราฟความถี่
-        freq_chart_path = create_chart_image('word_frequency', top_words, 'word_frequency.png')
+        # สร้างกราฟความถี่ (ใช้ไฟล์เดิมถ้าข้อมูลเหมือนกัน)
+        top_words = result['word_frequency'].most_common(CHART_DEFAULT_TOP_N)
+        charts = build_charts(top_words, chart_format)
         
         # จัดหมวดหมู่คำ
         word_freq_dict = dict(result['word_frequency'])
@@ -152,21 +211,21 @@ def analyze_text():
         top_words_by_category = categorizer.get_top_words_by_category(categorized_words, top_n=5)
         
         # บันทึกข้อมูลการวิเคราะห์
-        analysis_data['current_analysis'] = {
+        analysis_id = uuid.uuid4().hex
+        analysis_results.set(analysis_id, {
             'text': text,
             'result': result,
             'top_words': top_words,
             'categorized_words': categorized_words,
             'category_summary': category_summary,
             'top_words_by_category': top_words_by_category,
-            'charts': {
-                'frequency_chart': freq_chart_path
-            }
-        }
+            'charts': charts
+        })
         
         return jsonify({
             'success': True,
             'data': {
+                'analysis_id': analysis_id,
                 'total_words': result['total_words'],
                 'unique_words': result['unique_words'],
                 'word_frequency': word_freq_dict,
@@ -176,9 +235,43 @@ def analyze_text():
                 'category_summary': [{'category': cat, 'unique_words': unique, 'total_frequency': freq} 
                                     for cat, unique, freq in category_summary],
                 'top_words_by_category': {k: list(v) for k, v in top_words_by_category.items()},
-                'charts': {
-                    'frequency_chart': f'/static/word_frequency.png'
-                }
+                'charts': charts
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
+
+
+@app.route('/api/phrases', methods=['POST'])
+def analyze_phrases():
+    """API สำหรับหาวลี (ลำดับคำ) ที่ซ้ำในข้อความ"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+        mode = data.get('mode', 'maximal')
+        
+        if not text:
+            return jsonify({'error': 'ไม่มีข้อความที่ส่งมา'}), 400
+        
+        try:
+            min_length = int(data.get('min_length', PHRASE_MIN_LENGTH))
+            min_count = int(data.get('min_count', PHRASE_MIN_COUNT))
+            limit = min(int(data.get('limit', PHRASE_MAX_RESULTS)), PHRASE_MAX_RESULTS)
+            detector = analysis_data['detector']
+            result = detector.analyze_phrases(text, min_length=min_length, min_count=min_count,
+                                              mode=mode, limit=limit,
+                                              skip_stopwords=data.get('skip_stopwords', True))
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'mode': result['mode'],
+                'total_tokens': result['total_tokens'],
+                'phrases': result['phrases'],
+                'cleaned_text': result['cleaned_text']
             }
         })
         
@@ -206,11 +299,7 @@ def compare_texts():
             top_words = sorted(comparison_result['overall_frequency'].items(), 
                              key=lambda x: x[1], reverse=True)[:15]
             
-            comparison_chart_path = create_chart_image(
-                'word_frequency', 
-                top_words, 
-                'comparison_chart.png'
-            )
+            comparison_chart_path = build_charts(top_words, requested_chart_format(data.get('charts')))['frequency_chart']
         
         return jsonify({
             'success': True,
@@ -218,7 +307,7 @@ def compare_texts():
                 'comparison_stats': comparison_result['comparison_stats'],
                 'individual_results': comparison_result['individual_results'],
                 'overall_frequency': comparison_result['overall_frequency'],
-                'comparison_chart': f'/static/comparison_chart.png' if comparison_chart_path else None
+                'comparison_chart': comparison_chart_path
             }
         })
         
@@ -226,9 +315,103 @@ def compare_texts():
         return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
 
 
+UPLOAD_STAGES = ['extract', 'tokenize', 'categorize', 'render']
+
+
+def read_uploaded_text(filepath, filename, page_stats):
+    """
+    ดึงข้อความจากไฟล์ที่อัปโหลด (.txt หรือ .pdf)
+    
+    Returns:
+        Tuple of (content, file_type, extraction_method)
+    """
+    if filename.lower().endswith('.pdf'):
+        # ประมวลผล PDF
+        pdf_processor = analysis_data['pdf_processor']
+        success, content, method = pdf_processor.extract_text_from_pdf(filepath, page_stats)
+        if not success:
+            raise ValueError(f'ไม่สามารถแปลง PDF เป็น text ได้: {method}')
+        return content, "PDF", method
+    
+    # อ่านไฟล์ text ธรรมดา
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read(), "Text", "Direct Read"
+    except UnicodeDecodeError:
+        # ลองใช้ encoding อื่น
+        try:
+            with open(filepath, 'r', encoding='cp874') as f:
+                return f.read(), "Text (TIS-620)", "Direct Read (TIS-620)"
+        except Exception:
+            raise ValueError('ไม่สามารถอ่านไฟล์ได้ กรุณาตรวจสอบ encoding')
+
+
+def process_upload(job, filepath, filename, chart_format=CHART_FORMAT):
+    """ประมวลผลไฟล์ที่อัปโหลดทีละขั้นตอน (ทำงานใน job queue)"""
+    try:
+        job.start_stage('extract', 'กำลังดึงข้อความจากไฟล์')
+        page_stats = []
+        content, file_type, extraction_method = read_uploaded_text(filepath, filename, page_stats)
+        if not content.strip():
+            raise ValueError('ไฟล์ว่างเปล่าหรือไม่มีข้อความ')
+    finally:
+        # ลบไฟล์หลังดึงข้อความเสร็จ
+        try:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+        except OSError:
+            pass
+    
+    detector = analysis_data['detector']
+    categorizer = analysis_data['categorizer']
+    
+    job.start_stage('tokenize', 'กำลังตัดคำและวิเคราะห์ความถี่')
+    if len(content) > STREAMING_THRESHOLD_CHARS:
+        # เอกสารขนาดใหญ่: วิเคราะห์ทีละช่วงเพื่อจำกัดหน่วยความจำ
+        result = detector.analyze_text_stream(content, filter_pos=True,
+                                              chunk_chars=STREAMING_CHUNK_CHARS, record=False)
+    else:
+        result = detector.analyze_text(content, filter_pos=True, record=False)
+    record_analysis(result)
+    top_words = result['word_frequency'].most_common(20)
+    
+    # จัดหมวดหมู่คำ
+    job.start_stage('categorize', 'กำลังจัดหมวดหมู่คำ')
+    word_freq_dict = dict(result['word_frequency'])
+    categorized_words = categorizer.categorize_words(word_freq_dict)
+    category_summary = categorizer.get_category_summary(categorized_words)
+    top_words_by_category = categorizer.get_top_words_by_category(categorized_words, top_n=5)
+    
+    # สร้างกราฟ
+    job.start_stage('render', 'กำลังสร้างกราฟ')
+    charts = build_charts(top_words, chart_format)
+    
+    return {
+        'filename': filename,
+        'file_type': file_type,
+        'extraction_method': extraction_method,
+        'page_stats': page_stats,
+        'content': content[:500] + '...' if len(content) > 500 else content,
+        'total_words': result['total_words'],
+        'unique_words': result['unique_words'],
+        'word_frequency': word_freq_dict,
+        'top_words': top_words,
+        'categorized_words': {k: dict(v) for k, v in categorized_words.items()},
+        'category_summary': [{'category': cat, 'unique_words': unique, 'total_frequency': freq} 
+                            for cat, unique, freq in category_summary],
+        'top_words_by_category': {k: list(v) for k, v in top_words_by_category.items()},
+        'charts': charts
+    }
+
+
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
-    """API สำหรับอัปโหลดไฟล์ (รองรับ .txt และ .pdf)"""
+    """
+    API สำหรับอัปโหลดไฟล์ (รองรับ .txt และ .pdf)
+    สร้างงานเบื้องหลังและคืนค่า job id ทันที (202) ติดตามผลที่ /api/jobs/<job_id>
+    ส่ง ?sync=1 เพื่อรอผลลัพธ์ใน request เดียว (แบบเดิม)
+    ส่ง ?charts=none เพื่อรับเฉพาะข้อมูลกราฟ (ไม่สร้างภาพที่ server)
+    """
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'ไม่มีไฟล์ที่ส่งมา'}), 400
@@ -237,120 +420,185 @@ def upload_file():
         if file.filename == '':
             return jsonify({'error': 'ไม่ได้เลือกไฟล์'}), 400
         
-        if file:
-            filename = file.filename
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            content = ""
-            file_type = ""
-            extraction_method = ""
-            
-            # ตรวจสอบประเภทไฟล์
-            if filename.lower().endswith('.pdf'):
-                # ประมวลผล PDF
-                pdf_processor = analysis_data['pdf_processor']
-                success, content, method = pdf_processor.extract_text_from_pdf(filepath)
-                
-                if not success:
-                    # ลบไฟล์ที่อัปโหลด
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
-                    return jsonify({'error': f'ไม่สามารถแปลง PDF เป็น text ได้: {method}'}), 400
-                
-                file_type = "PDF"
-                extraction_method = method
-                
-            else:
-                # อ่านไฟล์ text ธรรมดา
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    file_type = "Text"
-                    extraction_method = "Direct Read"
-                except UnicodeDecodeError:
-                    # ลองใช้ encoding อื่น
-                    try:
-                        with open(filepath, 'r', encoding='cp874') as f:
-                            content = f.read()
-                        file_type = "Text (TIS-620)"
-                        extraction_method = "Direct Read (TIS-620)"
-                    except:
-                        if os.path.exists(filepath):
-                            os.remove(filepath)
-                        return jsonify({'error': 'ไม่สามารถอ่านไฟล์ได้ กรุณาตรวจสอบ encoding'}), 400
-            
-            # วิเคราะห์ไฟล์
-            if not content.strip():
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                return jsonify({'error': 'ไฟล์ว่างเปล่าหรือไม่มีข้อความ'}), 400
-            
-            detector = analysis_data['detector']
-            categorizer = analysis_data['categorizer']
-            result = detector.analyze_text(content, filter_pos=True)
-            
-            # สร้างกราฟ
-            top_words = detector.get_most_frequent_words(20)
-            freq_chart_path = create_chart_image('word_frequency', top_words, f'{filename}_frequency.png')
-            
-            # จัดหมวดหมู่คำ
-            word_freq_dict = dict(result['word_frequency'])
-            categorized_words = categorizer.categorize_words(word_freq_dict)
-            category_summary = categorizer.get_category_summary(categorized_words)
-            top_words_by_category = categorizer.get_top_words_by_category(categorized_words, top_n=5)
-            
-            # ลบไฟล์หลังประมวลผลเสร็จ
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-            except:
-                pass
-            
-            return jsonify({
-                'success': True,
-                'data': {
-                    'filename': filename,
-                    'file_type': file_type,
-                    'extraction_method': extraction_method,
-                    'content': content[:500] + '...' if len(content) > 500 else content,
-                    'total_words': result['total_words'],
-                    'unique_words': result['unique_words'],
-                    'word_frequency': word_freq_dict,
-                    'top_words': top_words,
-                    'categorized_words': {k: dict(v) for k, v in categorized_words.items()},
-                    'category_summary': [{'category': cat, 'unique_words': unique, 'total_frequency': freq} 
-                                        for cat, unique, freq in category_summary],
-                    'top_words_by_category': {k: list(v) for k, v in top_words_by_category.items()},
-                    'charts': {
-                        'frequency_chart': f'/static/{filename}_frequency.png'
-                    }
-                }
-            })
+        try:
+            chart_format = requested_chart_format(request.args.get('charts', request.form.get('charts')))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        filename = file.filename
+        # ใส่ prefix ไม่ซ้ำกัน ป้องกันไฟล์ชื่อเดียวกันที่อัปโหลดพร้อมกันเขียนทับกัน
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'{uuid.uuid4().hex[:8]}_{filename}')
+        file.save(filepath)
+        
+        if request.args.get('sync') in ('1', 'true') or app.config.get('SYNC_JOBS'):
+            job = job_queue.run_inline(process_upload, filepath, filename, chart_format,
+                                       stages=UPLOAD_STAGES, description=filename)
+            if job.error:
+                return jsonify({'error': job.error}), 400
+            return jsonify({'success': True, 'data': job.result})
+        
+        job = job_queue.submit(process_upload, filepath, filename, chart_format,
+                               stages=UPLOAD_STAGES, description=filename)
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status_url': f'/api/jobs/{job.id}',
+            'events_url': f'/api/jobs/{job.id}/events'
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
+
+
+BATCH_STAGES = ['process', 'report']
+
+
+def process_batch(job, batch_dir, paths, save_to_db, title_prefix):
+    """ประมวลผลเอกสารหลายไฟล์ (ทำงานใน job queue)"""
+    try:
+        job.start_stage('process', f'0/{len(paths)} ไฟล์')
+        report = analysis_data['batch_processor'].run(
+            paths,
+            save_to_db=save_to_db,
+            title_prefix=title_prefix,
+            progress_callback=lambda done, total, name: job.set_message(f'{done}/{total} ไฟล์ ({name})')
+        )
+        job.start_stage('report', 'กำลังสรุปผล')
+        return report
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+@app.route('/api/batch', methods=['POST'])
+def batch_upload():
+    """
+    API สำหรับวิเคราะห์เอกสารหลายไฟล์ในครั้งเดียว (.txt/.pdf หรือไฟล์ tar)
+    ไม่สร้างกราฟ บันทึกผลแต่ละเอกสารลงฐานข้อมูล และคืนค่ารายงานรวมผ่าน /api/jobs/<job_id>
+    ส่ง ?sync=1 เพื่อรอรายงานรวมใน request เดียว
+    
+    Form fields:
+        files: ไฟล์ (ส่งได้หลายไฟล์)
+        save_to_db: 'false' เพื่อไม่บันทึกลงฐานข้อมูล
+        title_prefix: ข้อความนำหน้าชื่อการวิเคราะห์ที่บันทึก
+    """
+    try:
+        from core.batch_processor import extract_tarball, is_tarball, unique_path
+        
+        files = [f for f in request.files.getlist('files') if f.filename]
+        if not files:
+            return jsonify({'error': 'ไม่มีไฟล์ที่ส่งมา'}), 400
+        
+        batch_dir = tempfile.mkdtemp(prefix='batch_', dir=app.config['UPLOAD_FOLDER'])
+        paths = []
+        try:
+            for index, file in enumerate(files):
+                if is_tarball(file.filename):
+                    tar_path = unique_path(batch_dir, index, file.filename)
+                    file.save(tar_path)
+                    paths.extend(extract_tarball(tar_path, os.path.dirname(tar_path)))
+                    os.remove(tar_path)
+                elif file.filename.lower().endswith(('.txt', '.pdf')):
+                    path = unique_path(batch_dir, index, file.filename)
+                    file.save(path)
+                    paths.append(path)
+        except Exception:
+            # ไฟล์ tar เสียหรือเขียนไฟล์ไม่สำเร็จ: ลบโฟลเดอร์ที่เตรียมไว้ ไม่ให้ค้างใน uploads/
+            shutil.rmtree(batch_dir, ignore_errors=True)
+            raise
+        
+        if not paths:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+            return jsonify({'error': 'ไม่พบไฟล์ .txt หรือ .pdf'}), 400
+        
+        save_to_db = request.form.get('save_to_db', 'true').lower() not in ('0', 'false')
+        title_prefix = request.form.get('title_prefix', '')
+        
+        if request.args.get('sync') in ('1', 'true') or app.config.get('SYNC_JOBS'):
+            job = job_queue.run_inline(process_batch, batch_dir, paths, save_to_db, title_prefix,
+                                       stages=BATCH_STAGES, description='batch')
+            if job.error:
+                return jsonify({'error': job.error}), 400
+            return jsonify({'success': True, 'data': job.result})
+        
+        job = job_queue.submit(process_batch, batch_dir, paths, save_to_db, title_prefix,
+                               stages=BATCH_STAGES, description='batch')
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'documents': len(paths),
+            'status_url': f'/api/jobs/{job.id}',
+            'events_url': f'/api/jobs/{job.id}/events'
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """API สำหรับดึงสถานะและผลลัพธ์ของงานเบื้องหลัง (polling)"""
+    try:
+        job = job_queue.get(job_id)
+        if job is None:
+            return jsonify({'error': 'ไม่พบงานที่ระบุ'}), 404
+        
+        return jsonify({'success': True, 'data': job.to_dict()})
         
     except Exception as e:
         return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
 
 
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """API สำหรับติดตามความคืบหน้าของงานแบบ Server-Sent Events"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'ไม่พบงานที่ระบุ'}), 404
+    
+    def generate():
+        for update in job_queue.iter_updates(job):
+            if update is None:
+                yield ': keep-alive\n\n'
+                continue
+            event = 'progress' if update['status'] not in ('done', 'failed') else update['status']
+            yield f"event: {event}\ndata: {json.dumps(update, ensure_ascii=False)}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def worker_scope():
+    """ระบุ worker ที่ตอบ เมื่อสถานะในหน่วยความจำแยกตาม worker (โหมด prefork)"""
+    if not app.config.get('PER_WORKER_STATE'):
+        return {}
+    return {'scope': 'worker', 'worker_pid': os.getpid()}
+
+
 @app.route('/api/export', methods=['POST'])
 def export_results():
-    """API สำหรับส่งออกผลลัพธ์"""
+    """API สำหรับส่งออกผลลัพธ์ (ระบุ analysis_id ที่ได้จาก /api/analyze)"""
     try:
         data = request.get_json()
         export_type = data.get('type', 'excel')
         filename = data.get('filename', 'analysis_results')
+        analysis_id = data.get('analysis_id')
         
-        if not analysis_data['current_analysis']:
+        # ผลการวิเคราะห์ของผู้เรียก (analysis_id จาก /api/analyze)
+        analysis = analysis_results.get(analysis_id) if analysis_id else None
+        if not analysis:
+            if analysis_id and app.config.get('PER_WORKER_STATE'):
+                # โหมด prefork: ผลการวิเคราะห์อยู่ใน worker ที่ตอบ /api/analyze เท่านั้น
+                return jsonify({'error': 'ไม่มีข้อมูลการวิเคราะห์ใน worker นี้ (ผลการวิเคราะห์เก็บแยกตาม worker)',
+                                **worker_scope()}), 400
             return jsonify({'error': 'ไม่มีข้อมูลการวิเคราะห์'}), 400
         
-        detector = analysis_data['detector']
-        
         if export_type == 'json':
             # ส่งออกเป็น JSON
             json_data = {
-                'analysis_result': analysis_data['current_analysis']['result'],
-                'top_words': analysis_data['current_analysis']['top_words'],
-                'timestamp': pd.Timestamp.now().isoformat()
+                'analysis_id': analysis_id,
+                'analysis_result': analysis['result'],
+                'top_words': analysis['top_words'],
+                'timestamp': datetime.now().isoformat()
             }
             
             json_path = os.path.join(app.config['STATIC_FOLDER'], f'{filename}.json')
@@ -375,7 +623,10 @@ def reset_analysis():
     try:
         detector = analysis_data['detector']
         detector.reset()
-        analysis_data['current_analysis'] = None
+        analysis_results.clear()
+        aggregator = analysis_data['aggregator']
+        if aggregator is not None:
+            aggregator.reset()
         
         return jsonify({'success': True, 'message': 'รีเซ็ตการวิเคราะห์เรียบร้อยแล้ว'})
         
@@ -391,16 +642,21 @@ def static_files(filename):
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    """API สำหรับดึงสถิติการใช้งาน"""
+    """API สำหรับดึงสถิติการใช้งาน (สถิติสะสมจาก aggregator อาจตามหลัง request ล่าสุดเล็กน้อย)"""
     try:
-        detector = analysis_data['detector']
+        aggregator = analysis_data['aggregator']
+        if aggregator is None:
+            return jsonify({'error': 'ปิดการเก็บสถิติสะสม (ENABLE_CORPUS_STATS)'}), 404
         
-        stats = {
-            'total_texts_analyzed': len(detector.processed_texts),
-            'total_words_processed': sum(text_data['total_words'] for text_data in detector.processed_texts),
-            'total_unique_words': len(detector.word_frequency),
-            'most_frequent_word': detector.word_frequency.most_common(1)[0] if detector.word_frequency else None
-        }
+        stats = aggregator.get_stats()
+        
+        # ?recent=N: สรุปผลการวิเคราะห์ล่าสุด N รายการ
+        recent = request.args.get('recent', 0, type=int)
+        if recent > 0:
+            stats['recent_analyses'] = aggregator.recent(recent)
+        
+        # โหมด prefork: สถิติเป็นของ worker ที่ตอบเท่านั้น
+        stats.update(worker_scope())
         
         return jsonify({'success': True, 'data': stats})
         
@@ -414,6 +670,7 @@ def get_performance_stats():
     try:
         detector = analysis_data['detector']
         performance_stats = detector.get_performance_stats()
+        performance_stats['system'] = performance_tracker.get_system_metrics()
         
         return jsonify({'success': True, 'data': performance_stats})
         
@@ -421,6 +678,33 @@ def get_performance_stats():
         return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
 
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """เมตริกซ์ใน Prometheus text format (ค่าของ worker process ที่ตอบ request นี้)"""
+    try:
+        gauges = {'analysis_results_cached': len(analysis_results)}
+        if app.config.get('PER_WORKER_STATE'):
+            # แยกชุดค่าของแต่ละ worker
+            gauges['worker_pid'] = os.getpid()
+        
+        # ไม่สร้าง component ใหม่เพียงเพื่อส่งเมตริกซ์
+        if analysis_data.is_built('detector'):
+            cache_stats = analysis_data['detector'].cache_manager.get_stats()
+            gauges['cache_hit_ratio'] = cache_stats['hit_rate']
+            gauges['cache_requests'] = cache_stats['total_requests']
+            segment_memo = analysis_data['detector'].segment_memo
+            if segment_memo is not None:
+                gauges['segment_memo_hit_ratio'] = segment_memo.get_stats()['hit_ratio']
+        if analysis_data.is_built('aggregator') and analysis_data['aggregator'] is not None:
+            gauges['aggregator_pending_updates'] = analysis_data['aggregator'].get_stats()['pending_updates']
+        
+        return Response(performance_tracker.prometheus_text(gauges),
+                        mimetype='text/plain; version=0.0.4; charset=utf-8')
+        
+    except Exception as e:
+        return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
+
+
 
 
 @app.route('/api/check-pdf-support', methods=['GET'])
@@ -520,6 +804,66 @@ def get_analysis(analysis_id):
         return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
 
 
+@app.route('/api/db/similar/<int:analysis_id>', methods=['GET'])
+def find_similar_analyses(analysis_id):
+    """ค้นหาเอกสารที่เกือบซ้ำกับการวิเคราะห์ที่ระบุ (MinHash + LSH)"""
+    try:
+        min_similarity = float(request.args.get('min_similarity', SIMILAR_MIN_SIMILARITY))
+        limit = int(request.args.get('limit', SIMILAR_MAX_RESULTS))
+        
+        db = analysis_data['database']
+        result = db.find_similar(analysis_id, min_similarity=min_similarity, limit=limit)
+        
+        if result is None:
+            return jsonify({'error': 'ไม่พบข้อมูลการวิเคราะห์'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'analysis_id': analysis_id,
+                'min_similarity': min_similarity,
+                **result
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
+
+
+@app.route('/api/db/passages', methods=['POST'])
+def find_passages():
+    """ค้นหาช่วงข้อความในเอกสารใหม่ที่ตรงกับเอกสารที่บันทึกไว้ (winnowing fingerprint)"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+        
+        if not text:
+            return jsonify({'error': 'ไม่มีข้อความที่ส่งมา'}), 400
+        
+        try:
+            min_tokens = int(data.get('min_tokens', PASSAGE_MIN_TOKENS))
+            limit = min(int(data.get('limit', PASSAGE_MAX_SOURCES)), PASSAGE_MAX_SOURCES)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        cleaned_text, words, offsets = analysis_data['detector'].document_words(text)
+        db = analysis_data['database']
+        result = db.find_passages(words, offsets, cleaned_text, min_tokens=min_tokens,
+                                  max_sources=limit, max_postings=PASSAGE_MAX_POSTINGS)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'min_tokens': min_tokens,
+                **result,
+                'cleaned_text': cleaned_text
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'เกิดข้อผิดพลาด: {str(e)}'}), 500
+
+
 @app.route('/api/db/delete/<int:analysis_id>', methods=['DELETE'])
 def delete_analysis(analysis_id):
     """ลบการวิเคราะห์"""
@@ -726,7 +1070,11 @@ if __name__ == '__main__':
     print("🔧 API Endpoints:")
     print("   Analysis:")
     print("   - POST /api/analyze              - วิเคราะห์ข้อความและตรวจสอบคำซ้ำ")
-    print("   - POST /api/upload               - อัปโหลดไฟล์ (txt/pdf)")
+    print("   - POST /api/upload               - อัปโหลดไฟล์ (txt/pdf) คืนค่า job id")
+    print("   - GET  /api/jobs/<id>            - สถานะ/ผลลัพธ์ของงาน")
+    print("   - GET  /api/jobs/<id>/events     - ติดตามความคืบหน้า (SSE)")
+    print("   - POST /api/batch                - วิเคราะห์หลายไฟล์/ไฟล์ tar (รายงานรวม)")
+    print("   - POST /api/phrases              - หาวลีที่ซ้ำ (ลำดับคำ)")
     print("   - POST /api/compare              - เปรียบเทียบข้อความ")
     print("   - POST /api/export               - ส่งออกผลลัพธ์")
     print("")
@@ -734,6 +1082,8 @@ if __name__ == '__main__':
     print("   - POST   /api/db/save            - บันทึกผลลงฐานข้อมูล")
     print("   - GET    /api/db/list            - ดึงรายการทั้งหมด")
     print("   - GET    /api/db/get/<id>        - ดึงข้อมูลตาม ID")
+    print("   - GET    /api/db/similar/<id>    - หาเอกสารที่เกือบซ้ำกัน")
+    print("   - POST   /api/db/passages        - หาช่วงข้อความที่ซ้ำกับเอกสารที่บันทึกไว้")
     print("   - DELETE /api/db/delete/<id>     - ลบการวิเคราะห์")
     print("   - PUT    /api/db/update/<id>     - อัพเดทชื่อ")
     print("   - GET    /api/db/search          - ค้นหาการวิเคราะห์")
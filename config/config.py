@@ -23,7 +23,10 @@ ALLOWED_PDF_EXTENSIONS = {'.pdf'}
 ALLOWED_EXTENSIONS = ALLOWED_TEXT_EXTENSIONS | ALLOWED_PDF_EXTENSIONS
 
 # Chart Settings
-CHART_DPI = 300
+CHART_DPI = 100  # ความละเอียด PNG ที่ server สร้าง (300 ใช้เวลาและขนาดไฟล์มากเกินจำเป็นสำหรับหน้าเว็บ)
+CHART_FIGSIZE = (14, 10)  # ขนาดภาพ (นิ้ว)
+CHART_FORMAT = 'png'  # รูปแบบเริ่มต้น: 'png' หรือ 'svg' (client ส่ง "charts": "none" เพื่อรับเฉพาะข้อมูล)
+CHART_CACHE_MAX_FILES = 500  # จำนวนไฟล์กราฟ (ตั้งชื่อตาม hash ของข้อมูล) ที่เก็บไว้ใน static/
 CHART_DEFAULT_TOP_N = 10
 CHART_COLORS = [
     '#007BFF', '#FF5733', '#FFEB3B', '#4A90E2', '#FF8A65',
@@ -40,6 +43,11 @@ DEFAULT_FONT = 'DejaVu Sans'
 # Analysis Settings
 DEFAULT_FILTER_POS = True
 DEFAULT_TARGET_POS = None
+STREAMING_THRESHOLD_CHARS = 200000  # เอกสารที่ยาวกว่านี้จะวิเคราะห์แบบ streaming
+STREAMING_CHUNK_CHARS = 20000
+PHRASE_MIN_LENGTH = 3  # จำนวนคำขั้นต่ำของวลีซ้ำ (/api/phrases)
+PHRASE_MIN_COUNT = 2  # จำนวนครั้งขั้นต่ำของวลีซ้ำ
+PHRASE_MAX_RESULTS = 100  # จำนวนวลีสูงสุดที่ส่งกลับ
 
 # Pagination Settings
 DEFAULT_ITEMS_PER_PAGE = 25
@@ -49,16 +57,55 @@ ITEMS_PER_PAGE_OPTIONS = [10, 25, 50, 100]
 PDF_EXTRACTION_TIMEOUT = 300  # seconds
 OCR_LANGUAGE = 'tha+eng'
 OCR_DPI = 200
+PDF_MAX_WORKERS = None  # None = จำนวน CPU
+PDF_PAGES_PER_TASK = 8  # จำนวนหน้าต่องานที่ส่งให้ worker
+PDF_MIN_TEXT_CHARS = 20  # หน้าที่มีข้อความน้อยกว่านี้จะใช้ OCR
 
 # Tesseract Configuration (Windows)
 TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Background Job Settings
+JOB_MAX_WORKERS = 2  # จำนวนงานอัปโหลดที่ประมวลผลพร้อมกัน
+JOB_MAX_FINISHED = 100  # จำนวนผลลัพธ์ของงานที่เสร็จแล้วที่เก็บไว้
+BATCH_MAX_WORKERS = None  # จำนวน worker process สำหรับ /api/batch (None = จำนวน CPU)
+
+# Analysis Results (ผลการวิเคราะห์แยกตาม request)
+ANALYSIS_RESULTS_MAX = 100  # จำนวนผลการวิเคราะห์ล่าสุดที่เก็บไว้สำหรับ /api/export (อ้างอิงด้วย analysis_id)
+ENABLE_CORPUS_STATS = True  # รวมสถิติสะสมของทุก request สำหรับ /api/stats (ทำงานเบื้องหลัง)
+CORPUS_STATS_SHARDS = 8  # จำนวน shard ของความถี่คำสะสม
+ANALYSIS_HISTORY_SIZE = 1000  # จำนวนสรุปผลการวิเคราะห์ล่าสุดที่เก็บไว้ (ring buffer)
+
+# Near-duplicate Detection (ฐานข้อมูล)
+MINHASH_NUM_PERM = 128  # ความยาวลายเซ็น MinHash ของเอกสารที่บันทึก (สำหรับ /api/db/similar)
+MINHASH_BANDS = 32  # จำนวน band ของดัชนี LSH (ต้องหาร MINHASH_NUM_PERM ลงตัว; มากขึ้น = หาเอกสารที่คล้ายน้อยกว่าเจอ)
+MINHASH_SHINGLE_SIZE = 3  # จำนวนคำต่อ shingle
+SIMILAR_MIN_SIMILARITY = 0.5  # similarity ขั้นต่ำเริ่มต้นของ /api/db/similar
+SIMILAR_MAX_RESULTS = 20
+
+# Passage Reuse Detection (ฐานข้อมูล, winnowing fingerprint)
+PASSAGE_KGRAM_SIZE = 5  # จำนวนคำต่อ k-gram (ช่วงที่ซ้ำสั้นกว่านี้ไม่ถูกตรวจพบ)
+PASSAGE_WINDOW = 8  # ขนาดหน้าต่าง winnowing (ช่วงที่ซ้ำยาว PASSAGE_WINDOW + PASSAGE_KGRAM_SIZE - 1 คำขึ้นไปพบเสมอ)
+PASSAGE_MIN_TOKENS = 5  # ความยาวขั้นต่ำเริ่มต้นของช่วงที่ตรงกันใน /api/db/passages (5 = ทุกช่วงที่มี fingerprint ร่วม)
+PASSAGE_MAX_POSTINGS = 1000  # fingerprint ที่พบในเอกสารมากกว่านี้ถือเป็นวลีทั่วไป ไม่นำมาจับคู่
+PASSAGE_MAX_SOURCES = 20
+
+# Production Server (python serve.py: prefork workers ที่ใช้โมเดลร่วมกันแบบ copy-on-write)
+SERVER_HOST = '0.0.0.0'
+SERVER_PORT = 5000
+PREFORK_WORKERS = None  # None = จำนวน CPU
+WARMUP_CORPUS = None  # ไฟล์ .txt หรือโฟลเดอร์สำหรับ warm-up (None = ข้อความตัวอย่างในตัว)
+WARMUP_COMPONENTS = ['detector', 'categorizer']  # component ที่สร้างก่อน fork
+MEMORY_REPORT_INTERVAL = 300  # รายงานหน่วยความจำของ worker ทุกกี่วินาที (0 = ครั้งเดียว)
+
 # Cache Settings
 ENABLE_CACHE = True
 CACHE_FOLDER = 'cache'
+DICTIONARY_FOLDER = 'dictionary'  # dictionary ของ tokenizer ที่รวมคำสำคัญของหมวดหมู่ (None = dictionary เริ่มต้นของ PyThaiNLP)
+SEGMENT_MEMO_SIZE = 20000  # จำนวนช่วงข้อความ (ประโยค/วลี) ที่จำผลการแยกคำและติดแท็กไว้ (0 = ปิด)
 
 # Performance Settings
-ENABLE_PERFORMANCE_TRACKING = True
+ENABLE_PERFORMANCE_TRACKING = True  # บันทึก span ของแต่ละขั้นตอนลง histogram (/api/performance, /metrics)
+SYSTEM_METRICS_INTERVAL = 5  # วัด CPU/หน่วยความจำของระบบไม่เกินหนึ่งครั้งต่อกี่วินาที
 
 # Export Settings
 EXPORT_CSV_ENCODING = 'utf-8-sig'  # UTF-8 with BOM
@@ -1,32 +1,45 @@
 """
 Core modules for Parliament Duplicate Word Detector
 โมดูลหลักสำหรับระบบตรวจจับคำซ้ำรัฐสภา
+
+คลาสต่างๆ ถูกนำเข้าเมื่อเข้าถึงครั้งแรก (lazy) เพื่อให้ import core เร็ว
+และไม่โหลด PyThaiNLP / SQLAlchemy จนกว่าจะใช้งานจริง
 """
 
-from .duplicate_word_detector import ThaiDuplicateWordDetector
-from .word_categorizer import ParliamentWordCategorizer
-from .pdf_processor import PDFProcessor
-from .performance_utils import PerformanceTracker, CacheManager, ParallelProcessor, get_performance_summary
-from .database_manager import DatabaseManager, Database
-from .models import Base, AnalysisRecord, WordFrequency, Category, CategoryWord, Tag
-
-__all__ = [
-    'ThaiDuplicateWordDetector',
-    'ParliamentWordCategorizer',
-    'PDFProcessor',
-    'PerformanceTracker',
-    'CacheManager',
-    'ParallelProcessor',
-    'get_performance_summary',
-    'DatabaseManager',
-    'Database',
-    'Base',
-    'AnalysisRecord',
-    'WordFrequency',
-    'Category',
-    'CategoryWord',
-    'Tag'
-]
+import importlib
+
+# ชื่อที่ export -> โมดูลย่อยที่เก็บชื่อนั้น
+_EXPORTS = {
+    'ThaiDuplicateWordDetector': '.duplicate_word_detector',
+    'ParliamentWordCategorizer': '.word_categorizer',
+    'PDFProcessor': '.pdf_processor',
+    'PerformanceTracker': '.performance_utils',
+    'CacheManager': '.performance_utils',
+    'ParallelProcessor': '.performance_utils',
+    'get_performance_summary': '.performance_utils',
+    'DatabaseManager': '.database_manager',
+    'Database': '.database_manager',
+    'Base': '.models',
+    'AnalysisRecord': '.models',
+    'WordFrequency': '.models',
+    'Category': '.models',
+    'CategoryWord': '.models',
+    'Tag': '.models'
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = '4.1.0'
 
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # เก็บไว้ ครั้งต่อไปไม่ต้องผ่าน __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,184 @@
+"""
+Corpus aggregator
+รวมสถิติสะสมของทุกการวิเคราะห์ (ความถี่คำ, POS, จำนวนข้อความ/คำ) แบบ asynchronous
+request ส่ง Counter ของตัวเองเข้าคิวแล้วกลับทันที thread เบื้องหลังเป็นผู้รวมเข้ากับ shard
+ที่แบ่งตาม hash ของคำ ทำให้ request ที่ทำงานพร้อมกันไม่ต้องแย่ง lock เดียวกัน
+"""
+
+import heapq
+import queue
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .analysis_history import DEFAULT_HISTORY_SIZE, AnalysisHistory
+from .vocabulary import FrequencyTable
+
+DEFAULT_SHARDS = 8
+
+# ข้อความควบคุมในคิว (ไม่ใช่ข้อมูลการวิเคราะห์)
+_FLUSH = object()
+_STOP = object()
+
+
+class _Shard:
+    """ส่วนหนึ่งของความถี่คำ (คำหนึ่งคำอยู่ใน shard เดียวเสมอ)"""
+
+    __slots__ = ('words', 'lock')
+
+    def __init__(self):
+        self.words = FrequencyTable()
+        self.lock = threading.Lock()
+
+
+class CorpusAggregator:
+    """
+    ตัวรวมสถิติสะสมแบบ sharded
+    - submit() ไม่ถือ lock ใดๆ (ใส่คิว queue.SimpleQueue แล้วกลับทันที)
+    - thread เบื้องหลังแยกคำตาม shard แล้วรวมทีละ shard (ถือ lock เฉพาะ shard นั้น)
+    - เพราะแบ่งตามคำ most_common(n) จึงได้จากการรวม top-n ของแต่ละ shard โดยไม่ต้องรวมตารางทั้งหมด
+    """
+
+    def __init__(self, shards: int = DEFAULT_SHARDS, history_size: int = DEFAULT_HISTORY_SIZE):
+        """
+        Args:
+            shards: จำนวน shard ของความถี่คำ
+            history_size: จำนวนสรุปผลการวิเคราะห์ล่าสุดที่เก็บไว้
+        """
+        self.num_shards = max(1, shards)
+        self._shards = [_Shard() for _ in range(self.num_shards)]
+        self._pos_frequency = Counter()
+        self._totals_lock = threading.Lock()
+        self.history = AnalysisHistory(max_records=history_size)
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _ensure_thread(self):
+        # สร้าง thread เมื่อมีข้อมูลแรก (ไม่สร้างก่อน fork worker ของเว็บเซิร์ฟเวอร์)
+        # และสร้างใหม่ถ้า thread เดิมหยุดไปแล้ว เพื่อไม่ให้ข้อมูลค้างในคิวโดยไม่มีผู้รวม
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='corpus-aggregator', daemon=True)
+                self._thread.start()
+
+    def submit(self, word_frequency: Counter, pos_frequency: Counter = None, total_words: int = None):
+        """
+        ส่งผลการวิเคราะห์หนึ่งครั้งเข้าคิว (ไม่รอการรวม)
+
+        Args:
+            word_frequency: ความถี่คำของ request
+            pos_frequency: ความถี่ POS ของ request
+            total_words: จำนวนคำทั้งหมด (ค่าเริ่มต้น = ผลรวมของ word_frequency)
+        """
+        if total_words is None:
+            total_words = sum(word_frequency.values())
+        self._ensure_thread()
+        self._queue.put((word_frequency, pos_frequency, total_words))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, tuple) and item[0] is _FLUSH:
+                item[1].set()
+                continue
+            try:
+                self._merge(*item)
+            except Exception as e:
+                # ข้อมูลที่ผิดรูปแบบไม่ควรทำให้ thread หยุด (flush()/reset() จะรอตลอดไป)
+                print(f"corpus aggregator error: {e}")
+
+    def _merge(self, word_frequency: Counter, pos_frequency: Optional[Counter], total_words: int):
+        """รวมผลการวิเคราะห์หนึ่งครั้งเข้ากับ shard (ทำงานใน thread เบื้องหลัง)"""
+        partitions = [{} for _ in range(self.num_shards)]
+        for word, count in word_frequency.items():
+            partitions[hash(word) % self.num_shards][word] = count
+
+        for shard, partition in zip(self._shards, partitions):
+            if not partition:
+                continue
+            with shard.lock:
+                shard.words.add_counts(partition)
+
+        with self._totals_lock:
+            self.history.append(word_frequency, total_words)
+            if pos_frequency:
+                self._pos_frequency.update(pos_frequency)
+
+    def flush(self, timeout: float = None) -> bool:
+        """รอจนข้อมูลที่ส่งเข้าคิวก่อนหน้านี้ถูกรวมครบ (คืนค่า False ถ้าหมดเวลา)"""
+        if self._thread is None:
+            return True
+        self._ensure_thread()
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def most_common(self, n: int = 20) -> List[Tuple[str, int]]:
+        """คำที่มีความถี่สูงสุด n คำ จากทุก shard"""
+        candidates = []
+        for shard in self._shards:
+            with shard.lock:
+                candidates.extend(shard.words.most_common(n))
+        return heapq.nlargest(n, candidates, key=lambda item: item[1])
+
+    def get_word_count(self, word: str) -> int:
+        """ความถี่สะสมของคำ"""
+        shard = self._shards[hash(word) % self.num_shards]
+        with shard.lock:
+            return shard.words.count(word)
+
+    def unique_words(self) -> int:
+        """จำนวนคำไม่ซ้ำสะสม"""
+        return sum(len(shard.words) for shard in self._shards)
+
+    def get_pos_frequency(self) -> Dict[str, int]:
+        """ความถี่ POS สะสม"""
+        with self._totals_lock:
+            return dict(self._pos_frequency)
+
+    def most_frequent_word(self) -> Optional[Tuple[str, int]]:
+        """คำที่มีความถี่สูงสุด (อ่านจากดัชนี top-k ของแต่ละ shard ไม่ต้องวนทุกคำ)"""
+        top = self.most_common(1)
+        return top[0] if top else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติสะสมสำหรับ /api/stats (O(จำนวน shard) ไม่ขึ้นกับจำนวนการวิเคราะห์หรือจำนวนคำ)"""
+        with self._totals_lock:
+            history_stats = self.history.get_stats()
+        return {
+            'total_texts_analyzed': history_stats['total_texts'],
+            'total_words_processed': history_stats['total_words'],
+            'total_unique_words': self.unique_words(),
+            'most_frequent_word': self.most_frequent_word(),
+            'average_words_per_text': history_stats['average_words'],
+            'pending_updates': self._queue.qsize()
+        }
+
+    def recent(self, n: int = 20) -> List[Dict[str, Any]]:
+        """สรุปผลการวิเคราะห์ล่าสุด n รายการ (ใหม่สุดก่อน)"""
+        with self._totals_lock:
+            records = list(self.history)[-n:] if n > 0 else []
+        return [record.to_dict() for record in reversed(records)]
+
+    def reset(self):
+        """ล้างสถิติสะสม (รอให้ข้อมูลที่ค้างในคิวถูกรวมก่อน เพื่อไม่ให้ข้อมูลเก่ากลับมา)"""
+        self.flush()
+        for shard in self._shards:
+            with shard.lock:
+                shard.words.clear()
+        with self._totals_lock:
+            self._pos_frequency.clear()
+            self.history.clear()
+
+    def close(self):
+        """หยุด thread เบื้องหลังหลังรวมข้อมูลที่ค้างอยู่"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
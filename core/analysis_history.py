@@ -0,0 +1,104 @@
+"""
+Bounded analysis history
+เก็บสรุปผลการวิเคราะห์ล่าสุดแบบ ring buffer (จำนวนจำกัด) พร้อมผลรวมสะสมที่อัปเดตทุกครั้งที่เพิ่มข้อมูล
+ทำให้สถิติรวม (จำนวนข้อความ/คำ) อ่านได้ใน O(1) และหน่วยความจำไม่โตตามจำนวนการวิเคราะห์
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+# จำนวนสรุปผลการวิเคราะห์ล่าสุดที่เก็บไว้
+DEFAULT_HISTORY_SIZE = 1000
+
+
+class AnalysisSummary:
+    """สรุปผลการวิเคราะห์หนึ่งครั้ง (ไม่เก็บรายการคำและ Counter เต็ม)"""
+
+    __slots__ = ('total_words', 'unique_words', 'top_word', 'top_count',
+                 'analysis_time', 'original_text', 'cleaned_text')
+
+    def __init__(self, total_words: int, unique_words: int, top_word: Optional[str], top_count: int,
+                 analysis_time: float, original_text: str = None, cleaned_text: str = None):
+        self.total_words = total_words
+        self.unique_words = unique_words
+        self.top_word = top_word
+        self.top_count = top_count
+        self.analysis_time = analysis_time
+        self.original_text = original_text
+        self.cleaned_text = cleaned_text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class AnalysisHistory:
+    """
+    ring buffer ของ AnalysisSummary พร้อมผลรวมสะสม
+    ผลรวม (total_texts, total_words) นับรวมรายการที่ถูกลบออกจาก buffer แล้วด้วย
+    ไม่มี lock ในตัว: ผู้เรียกที่เพิ่มข้อมูลจากหลาย thread ต้องถือ lock เอง
+    """
+
+    def __init__(self, max_records: int = DEFAULT_HISTORY_SIZE, keep_texts: bool = False):
+        """
+        Args:
+            max_records: จำนวนสรุปผลล่าสุดที่เก็บไว้
+            keep_texts: เก็บข้อความต้นฉบับ/ข้อความที่ทำความสะอาดแล้วด้วยหรือไม่
+        """
+        self.max_records = max_records
+        self.keep_texts = keep_texts
+        self._records = deque(maxlen=max_records)
+        self.total_texts = 0
+        self.total_words = 0
+
+    def append(self, word_frequency: Mapping[str, int], total_words: int,
+               original_text: str = None, cleaned_text: str = None,
+               analysis_time: float = None) -> AnalysisSummary:
+        """
+        เพิ่มสรุปผลการวิเคราะห์หนึ่งครั้ง (ข้อความจะถูกเก็บเฉพาะเมื่อ keep_texts=True)
+
+        Returns:
+            AnalysisSummary: รายการที่เพิ่ม
+        """
+        top_word, top_count = None, 0
+        if word_frequency:
+            top_word, top_count = max(word_frequency.items(), key=lambda item: item[1])
+
+        record = AnalysisSummary(
+            total_words=total_words,
+            unique_words=len(word_frequency),
+            top_word=top_word,
+            top_count=top_count,
+            analysis_time=analysis_time if analysis_time is not None else time.time(),
+            original_text=original_text if self.keep_texts else None,
+            cleaned_text=cleaned_text if self.keep_texts else None
+        )
+        self._records.append(record)
+        self.total_texts += 1
+        self.total_words += total_words
+        return record
+
+    def clear(self):
+        """ล้างประวัติและผลรวมสะสม"""
+        self._records.clear()
+        self.total_texts = 0
+        self.total_words = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[AnalysisSummary]:
+        return iter(self._records)
+
+    def __getitem__(self, index: int) -> AnalysisSummary:
+        return self._records[index]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ผลรวมสะสม (O(1))"""
+        return {
+            'total_texts': self.total_texts,
+            'total_words': self.total_words,
+            'average_words': self.total_words / self.total_texts if self.total_texts else 0.0,
+            'records_kept': len(self._records),
+            'max_records': self.max_records
+        }
@@ -0,0 +1,392 @@
+"""
+Batch Processor
+ประมวลผลเอกสารจำนวนมาก (.txt/.pdf จากโฟลเดอร์หรือไฟล์ tar) ด้วย worker processes
+ดึงข้อความ แยกคำ จัดหมวดหมู่ และบันทึกลงฐานข้อมูลแบบ bulk โดยไม่สร้างกราฟ
+แล้วสรุปเป็นรายงานรวมฉบับเดียว
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from . import duplicate_word_detector
+from .duplicate_word_detector import (
+    DEFAULT_DICTIONARY_DIR, _init_analysis_worker, filter_pos_tags, iter_tagged_chunks, split_pair_counts
+)
+from .minhash import MinHashBuilder, MinHasher
+from .pdf_processor import PDFProcessor
+from .text_stream import DEFAULT_CHUNK_CHARS
+from .winnowing import Winnower
+from .word_categorizer import ParliamentWordCategorizer
+
+# นามสกุลไฟล์ที่รองรับ
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf')
+
+# นามสกุลไฟล์ tar ที่รองรับ
+TARBALL_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+# จำนวนตัวอักษรแรกของเอกสารที่เก็บเป็นตัวอย่าง (ตรงกับ text_content ในฐานข้อมูล)
+PREVIEW_CHARS = 1000
+
+
+def is_tarball(path: str) -> bool:
+    """ตรวจสอบว่าเป็นไฟล์ tar ที่รองรับหรือไม่"""
+    return path.lower().endswith(TARBALL_EXTENSIONS)
+
+
+def _is_supported(name: str) -> bool:
+    return name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def unique_path(target_dir: str, index: int, filename: str) -> str:
+    """
+    สร้าง path ในโฟลเดอร์ย่อยลำดับที่ index โดยคงชื่อไฟล์เดิม (ตัดส่วน directory ออก)
+    ใช้กับไฟล์จาก tar และไฟล์อัปโหลดที่อาจมีชื่อซ้ำกัน
+    """
+    directory = os.path.join(target_dir, f"{index:06d}")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, os.path.basename(filename.replace('\\', '/')) or 'document')
+
+
+def extract_tarball(tar_path: str, target_dir: str) -> List[str]:
+    """
+    แตกเฉพาะไฟล์ .txt/.pdf จาก tar ลงโฟลเดอร์ปลายทาง
+    ไม่ใช้ extractall เพื่อป้องกัน path traversal (ชื่อไฟล์ที่มี .. หรือ path แบบ absolute)
+    """
+    paths = []
+    with tarfile.open(tar_path, 'r:*') as tar:
+        for index, member in enumerate(tar):
+            if not member.isfile() or not _is_supported(member.name):
+                continue
+
+            source = tar.extractfile(member)
+            if source is None:
+                continue
+            # แต่ละไฟล์อยู่ในโฟลเดอร์ย่อยของตัวเองใต้โฟลเดอร์ปลายทาง (คงชื่อไฟล์เดิม ไม่ชนกัน)
+            path = unique_path(target_dir, index, member.name)
+            with source, open(path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            paths.append(path)
+    return paths
+
+
+@contextmanager
+def open_batch_source(source: str) -> Iterator[List[str]]:
+    """
+    รวบรวมรายการไฟล์ .txt/.pdf จากโฟลเดอร์ (รวมโฟลเดอร์ย่อย), ไฟล์ tar หรือไฟล์เดี่ยว
+    ไฟล์ที่แตกจาก tar จะถูกลบเมื่อออกจาก context
+
+    Yields:
+        List[str]: path ของไฟล์ที่ต้องประมวลผล (เรียงตามชื่อ)
+    """
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(source)
+            for name in names if _is_supported(name)
+        ]
+        yield sorted(paths)
+    elif is_tarball(source):
+        extract_dir = tempfile.mkdtemp(prefix='batch_')
+        try:
+            yield extract_tarball(source, extract_dir)
+        finally:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+    elif os.path.isfile(source) and _is_supported(source):
+        yield [source]
+    else:
+        raise ValueError(f'ไม่รองรับแหล่งข้อมูล: {source}')
+
+
+# ==================== Worker process ====================
+
+_worker_categorizer = None
+_worker_pdf_processor = None
+
+
+def _init_batch_worker(dictionary_dir: Optional[str] = None):
+    """
+    โหลด tokenizer, tagger, stopwords และ categorizer ครั้งเดียวตอน worker เริ่มทำงาน
+    (dictionary_dir: dictionary ของ tokenizer เดียวกับ detector ไม่พึ่งการสืบทอดจากการ fork)
+    """
+    global _worker_categorizer, _worker_pdf_processor
+    _init_analysis_worker(dictionary_dir)
+    _worker_categorizer = ParliamentWordCategorizer()
+    # ดึงหน้า PDF ใน worker เดียวกัน (ความขนานอยู่ที่ระดับเอกสารแล้ว)
+    _worker_pdf_processor = PDFProcessor(max_workers=1)
+
+
+def _read_text_file(path: str) -> tuple:
+    """อ่านไฟล์ text (UTF-8 แล้วจึงลอง TIS-620)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read(), "Text", "Direct Read"
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='cp874') as f:
+            return f.read(), "Text (TIS-620)", "Direct Read (TIS-620)"
+
+
+def _process_document(path: str, filter_pos: bool, target_pos: Optional[List[str]],
+                      chunk_chars: int, minhasher: Optional[MinHasher] = None,
+                      winnower: Optional[Winnower] = None) -> Dict:
+    """
+    ประมวลผลเอกสารหนึ่งไฟล์ใน worker process (ดึงข้อความ -> แยกคำ -> จัดหมวดหมู่)
+    minhasher / winnower: สร้างลายเซ็น MinHash และ winnowing fingerprint จากคำทั้งเอกสารระหว่าง streaming
+    (ฐานข้อมูลเก็บเพียงตัวอย่างข้อความ) โดย hash คำแต่ละช่วงครั้งเดียวใช้ร่วมกัน
+
+    Returns:
+        Dict: ผลการวิเคราะห์ของเอกสาร หรือ {'error': ...} ถ้าล้มเหลว
+    """
+    if _worker_categorizer is None:
+        _init_batch_worker()
+
+    start = time.perf_counter()
+    result = {'name': os.path.basename(path), 'path': path}
+
+    try:
+        preview = []
+        preview_chars = 0
+        methods = []
+
+        if path.lower().endswith('.pdf'):
+            result['source_type'] = 'pdf'
+            result['file_type'] = 'PDF'
+
+            def pieces():
+                for page in _worker_pdf_processor.iter_pages(path):
+                    if page['method'] and page['method'] not in methods:
+                        methods.append(page['method'])
+                    if page['text']:
+                        yield page['text'] + "\n"
+        else:
+            content, result['file_type'], method = _read_text_file(path)
+            result['source_type'] = 'file'
+            methods.append(method)
+
+            def pieces():
+                yield content
+
+        def with_preview(texts):
+            """เก็บตัวอย่างข้อความส่วนต้นระหว่าง streaming"""
+            nonlocal preview_chars
+            for text in texts:
+                if preview_chars < PREVIEW_CHARS:
+                    preview.append(text[:PREVIEW_CHARS - preview_chars])
+                    preview_chars += len(preview[-1])
+                yield text
+
+        word_pos_counts = Counter()
+        stopwords = duplicate_word_detector._worker_stopwords
+        signature = MinHashBuilder(minhasher) if minhasher is not None else None
+        token_hashes = []
+        for pos_tags in iter_tagged_chunks(with_preview(pieces()), chunk_chars):
+            if signature is not None or winnower is not None:
+                hashes = MinHasher.token_hashes(word for word, _ in pos_tags if not word.isspace())
+                if signature is not None:
+                    signature.add_hashes(hashes)
+                if winnower is not None:
+                    token_hashes.append(hashes)
+            if filter_pos:
+                pos_tags = filter_pos_tags(pos_tags, stopwords, target_pos)
+            word_pos_counts.update(pos_tags)
+
+        word_frequency, pos_frequency = split_pair_counts(word_pos_counts)
+
+        if not word_frequency and not ''.join(preview).strip():
+            raise ValueError('ไฟล์ว่างเปล่าหรือไม่มีข้อความ')
+
+        categorized = _worker_categorizer.categorize_words(word_frequency)
+        categorized_words = {category: dict(words) for category, words in categorized.items()}
+
+        result.update({
+            'extraction_method': " + ".join(methods),
+            'preview': ''.join(preview),
+            'total_words': sum(word_frequency.values()),
+            'unique_words': len(word_frequency),
+            'word_frequency': dict(word_frequency),
+            'minhash': signature.finish() if signature is not None else None,
+            'fingerprints': (winnower.fingerprints(np.concatenate(token_hashes)) if token_hashes
+                             else None),
+            'pos_frequency': dict(pos_frequency),
+            'categorized_words': categorized_words,
+            'category_summary': [
+                {'category': category, 'unique_words': unique, 'total_frequency': frequency}
+                for category, unique, frequency in _worker_categorizer.get_category_summary(categorized_words)
+            ]
+        })
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+# ==================== Batch runner ====================
+
+class BatchProcessor:
+    """ประมวลผลเอกสารหลายไฟล์แบบขนานและสรุปเป็นรายงานรวม"""
+
+    def __init__(self, max_workers: int = None, database=None,
+                 filter_pos: bool = True, target_pos: List[str] = None,
+                 chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                 dictionary_dir: Optional[str] = DEFAULT_DICTIONARY_DIR):
+        """
+        Args:
+            max_workers: จำนวน worker process (ค่าเริ่มต้น = จำนวน CPU)
+            database: DatabaseManager สำหรับบันทึกผล (None = ไม่บันทึก)
+            filter_pos: กรองคำตาม POS หรือไม่
+            target_pos: รายการ POS tags ที่ต้องการ
+            chunk_chars: ขนาดช่วงข้อความสำหรับการแยกคำแบบ streaming
+            dictionary_dir: โฟลเดอร์ของ dictionary ที่รวมคำสำคัญของหมวดหมู่ (None = dictionary เริ่มต้น)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.database = database
+        self.filter_pos = filter_pos
+        self.target_pos = target_pos
+        self.chunk_chars = chunk_chars
+        self.dictionary_dir = dictionary_dir
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """สร้าง process pool เมื่อใช้งานครั้งแรก (worker โหลดโมเดลครั้งเดียว)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_batch_worker,
+                initargs=(self.dictionary_dir,)
+            )
+        return self._executor
+
+    def _iter_results(self, paths: List[str]) -> Iterator[Dict]:
+        """ส่งเอกสารให้ worker โดยจำกัดงานค้างไว้ที่ 2 เท่าของจำนวน worker แล้วคืนผลตามลำดับที่เสร็จ"""
+        executor = self._get_executor()
+        path_iter = iter(paths)
+        pending = set()
+
+        def submit_next() -> bool:
+            path = next(path_iter, None)
+            if path is None:
+                return False
+            pending.add(executor.submit(
+                _process_document, path, self.filter_pos, self.target_pos, self.chunk_chars,
+                self.database.minhasher if self.database is not None else None,
+                self.database.winnower if self.database is not None else None
+            ))
+            return True
+
+        while len(pending) < self.max_workers * 2 and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                submit_next()
+                yield future.result()
+
+    def run(self, paths: List[str], save_to_db: bool = True, title_prefix: str = "",
+            top_n: int = 50,
+            progress_callback: Callable[[int, int, str], None] = None) -> Dict:
+        """
+        ประมวลผลรายการไฟล์และสรุปผล การบันทึกฐานข้อมูลทำใน process หลักขณะที่ worker
+        ประมวลผลเอกสารถัดไป (pipeline)
+
+        Args:
+            paths: รายการ path ของไฟล์ .txt/.pdf
+            save_to_db: บันทึกผลแต่ละเอกสารลงฐานข้อมูลหรือไม่
+            title_prefix: ข้อความนำหน้าชื่อการวิเคราะห์ที่บันทึก
+            top_n: จำนวนคำที่มีความถี่สูงสุดในรายงาน
+            progress_callback: ฟังก์ชัน (จำนวนที่เสร็จ, ทั้งหมด, ชื่อเอกสาร)
+
+        Returns:
+            Dict: รายงานรวม
+        """
+        start = time.perf_counter()
+        total = len(paths)
+
+        word_frequency = Counter()
+        pos_frequency = Counter()
+        category_words = defaultdict(Counter)
+        documents = []
+        errors = []
+
+        for done, doc in enumerate(self._iter_results(paths), 1):
+            analysis_id = None
+            if 'error' not in doc and save_to_db and self.database is not None:
+                try:
+                    analysis_id = self.database.save_analysis(
+                        title=f"{title_prefix}{doc['name']}",
+                        source_type=doc['source_type'],
+                        source_filename=doc['name'],
+                        text_content=doc['preview'],
+                        analysis_result=doc,
+                        bulk=True,
+                        features=(doc['minhash'], doc['fingerprints'])
+                    )
+                except Exception as e:
+                    # บันทึกไม่สำเร็จนับเป็นเอกสารที่ล้มเหลว (ไม่รวมในสถิติ) ให้ succeeded + failed ตรงกับ errors
+                    doc = {'name': doc['name'], 'error': f'บันทึกฐานข้อมูลไม่สำเร็จ: {e}'}
+
+            if 'error' in doc:
+                errors.append({'name': doc['name'], 'error': doc['error']})
+            else:
+                word_frequency.update(doc['word_frequency'])
+                pos_frequency.update(doc['pos_frequency'])
+                for category, words in doc['categorized_words'].items():
+                    category_words[category].update(words)
+
+                documents.append({
+                    'name': doc['name'],
+                    'file_type': doc['file_type'],
+                    'extraction_method': doc['extraction_method'],
+                    'total_words': doc['total_words'],
+                    'unique_words': doc['unique_words'],
+                    'seconds': round(doc['seconds'], 3),
+                    'analysis_id': analysis_id
+                })
+
+            if progress_callback:
+                progress_callback(done, total, doc['name'])
+
+        elapsed = time.perf_counter() - start
+        category_summary = sorted(
+            (
+                {'category': category, 'unique_words': len(words), 'total_frequency': sum(words.values())}
+                for category, words in category_words.items()
+            ),
+            key=lambda item: item['total_frequency'], reverse=True
+        )
+
+        return {
+            'documents': total,
+            'succeeded': len(documents),
+            'failed': total - len(documents),
+            'total_words': sum(word_frequency.values()),
+            'unique_words': len(word_frequency),
+            'top_words': word_frequency.most_common(top_n),
+            'pos_frequency': dict(pos_frequency.most_common()),
+            'category_summary': category_summary,
+            'per_document': sorted(documents, key=lambda item: item['name']),
+            'errors': errors,
+            'workers': self.max_workers,
+            'elapsed_seconds': round(elapsed, 3),
+            'docs_per_sec': round(total / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+    def run_source(self, source: str, **kwargs) -> Dict:
+        """ประมวลผลทุกไฟล์จากโฟลเดอร์ ไฟล์ tar หรือไฟล์เดี่ยว (kwargs ส่งต่อให้ run())"""
+        with open_batch_source(source) as paths:
+            return self.run(paths, **kwargs)
+
+    def cleanup(self):
+        """ปิด process pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,258 @@
+"""
+Chart service
+สร้างกราฟด้วย matplotlib แบบ object-oriented (Figure + FigureCanvasAgg) ไม่ใช้สถานะ global ของ pyplot
+จึงวาดพร้อมกันหลาย request ได้ และเก็บไฟล์ PNG/SVG ตาม hash ของข้อมูลกราฟ
+ข้อมูลเดียวกันจึงไม่ต้องวาดซ้ำ และชื่อไฟล์ไม่ชนกันระหว่าง request
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from io import BytesIO
+from typing import Any, Dict, List, Sequence, Tuple
+
+DEFAULT_DPI = 100
+DEFAULT_FIGSIZE = (14, 10)
+DEFAULT_FORMAT = 'png'
+DEFAULT_CACHE_MAX_FILES = 500
+SUPPORTED_FORMATS = ('png', 'svg')
+
+DEFAULT_COLORS = [
+    '#007BFF', '#FF5733', '#FFEB3B', '#4A90E2', '#FF8A65',
+    '#FFD54F', '#212121', '#FF7043', '#FFC107', '#FF9800'
+]
+DEFAULT_FONT_CANDIDATES = [
+    'Tahoma', 'Arial', 'Microsoft Sans Serif', 'Segoe UI',
+    'Calibri', 'Times New Roman', 'Courier New'
+]
+DEFAULT_FONT = 'DejaVu Sans'
+
+# prefix ของไฟล์กราฟในโฟลเดอร์ static (ใช้แยกไฟล์ที่ cache จัดการออกจากไฟล์อื่น)
+CHART_PREFIX = 'chart_'
+
+
+def chart_data(chart_type: str, data: Sequence[Tuple[str, int]]) -> Dict[str, Any]:
+    """ข้อมูลกราฟสำหรับให้ client วาดเอง (เช่น Chart.js) โดยไม่ต้องสร้างภาพที่ server"""
+    return {
+        'type': chart_type,
+        'labels': [word for word, _ in data],
+        'values': [count for _, count in data]
+    }
+
+
+class ChartService:
+    """
+    สร้างและ cache ภาพกราฟ
+    - ชื่อไฟล์ = chart_<sha1 ของ (ประเภท, ข้อมูล, ขนาด, DPI)>.<format> ข้อมูลเดิมจึงได้ไฟล์เดิม
+    - เขียนไฟล์ชั่วคราวแล้ว os.replace จึงไม่มี request ใดอ่านไฟล์ที่เขียนไม่เสร็จ
+    - matplotlib ถูก import เมื่อวาดกราฟครั้งแรก (หรือเมื่อเรียก warm_up)
+    """
+
+    def __init__(self, output_dir: str, dpi: int = DEFAULT_DPI, figsize: Tuple[float, float] = DEFAULT_FIGSIZE,
+                 default_format: str = DEFAULT_FORMAT, max_files: int = DEFAULT_CACHE_MAX_FILES,
+                 colors: List[str] = None, font_candidates: List[str] = None, default_font: str = DEFAULT_FONT):
+        """
+        Args:
+            output_dir: โฟลเดอร์ที่เก็บไฟล์กราฟ
+            dpi: ความละเอียดของ PNG
+            figsize: ขนาดภาพ (นิ้ว)
+            default_format: 'png' หรือ 'svg'
+            max_files: จำนวนไฟล์กราฟสูงสุดที่เก็บไว้ (ลบไฟล์ที่ใช้ล่าสุดนานที่สุดก่อน, 0 = ไม่จำกัด)
+            colors: สีของแท่งกราฟ
+            font_candidates: ฟอนต์ที่รองรับภาษาไทยตามลำดับความต้องการ
+            default_font: ฟอนต์ที่ใช้เมื่อไม่พบฟอนต์ใน font_candidates
+        """
+        if default_format not in SUPPORTED_FORMATS:
+            raise ValueError(f'ไม่รองรับรูปแบบกราฟ: {default_format}')
+        self.output_dir = output_dir
+        self.dpi = dpi
+        self.figsize = tuple(figsize)
+        self.default_format = default_format
+        self.max_files = max_files
+        self.colors = list(colors or DEFAULT_COLORS)
+        self.font_candidates = list(font_candidates or DEFAULT_FONT_CANDIDATES)
+        self.default_font = default_font
+        os.makedirs(output_dir, exist_ok=True)
+
+        self._font = None
+        self._import_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'renders': 0, 'evicted': 0}
+
+    # ---------- matplotlib ----------
+
+    def warm_up(self) -> str:
+        """นำเข้า matplotlib และเลือกฟอนต์ไทยล่วงหน้า (เช่น ก่อน fork worker)"""
+        return self._font_family()
+
+    def _font_family(self) -> str:
+        if self._font is not None:
+            return self._font
+        with self._import_lock:
+            if self._font is None:
+                import matplotlib
+                matplotlib.use('Agg')  # ใช้ backend ที่ไม่ต้องการ GUI
+                import matplotlib.font_manager as fm
+
+                # หาฟอนต์ที่มีในระบบ ลองหาฟอนต์ที่รองรับภาษาไทยก่อน
+                available_fonts = {f.name for f in fm.fontManager.ttflist}
+                selected_font = next((font for font in self.font_candidates if font in available_fonts),
+                                     self.default_font)
+                print(f"ใช้ฟอนต์: {selected_font}")
+                self._font = selected_font
+        return self._font
+
+    def _word_frequency_figure(self, data: Sequence[Tuple[str, int]]):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import MaxNLocator
+
+        font = self._font_family()
+        words = [word for word, _ in data]
+        frequencies = [count for _, count in data]
+
+        # Figure ของตัวเองต่อการวาดหนึ่งครั้ง ไม่ผ่าน pyplot (ไม่มีสถานะร่วมระหว่าง thread)
+        fig = Figure(figsize=self.figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+
+        # กราฟแบบ horizontal bar ด้วยสี Vibrant theme
+        ax.barh(range(len(words)), frequencies,
+                color=[self.colors[i % len(self.colors)] for i in range(len(words))])
+
+        # แกน Y: คำ (คำที่ความถี่สูงสุดอยู่บนสุด)
+        ax.set_yticks(range(len(words)))
+        ax.set_yticklabels(words, fontsize=10, fontfamily=font)
+        ax.invert_yaxis()
+
+        # แกน X: ความถี่ (จำนวนเต็ม)
+        ax.set_xlabel('ความถี่', fontsize=12, fontweight='bold', fontfamily=font)
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+        # ค่าความถี่บนแท่งกราฟ
+        for i, freq in enumerate(frequencies):
+            ax.text(freq + 0.1, i, str(freq), va='center', ha='left', fontsize=9, fontweight='bold')
+
+        ax.set_title(f'คำที่มีความถี่สูงสุด {len(words)} คำ',
+                     fontsize=14, fontweight='bold', pad=20, fontfamily=font)
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        fig.tight_layout()
+        return fig
+
+    def render(self, chart_type: str, data: Sequence[Tuple[str, int]], fmt: str = None) -> bytes:
+        """
+        วาดกราฟเป็น bytes (ไม่ใช้ cache)
+
+        Args:
+            chart_type: ประเภทกราฟ (ปัจจุบันรองรับ 'word_frequency')
+            data: รายการ (คำ, ความถี่)
+            fmt: 'png' หรือ 'svg' (None = default_format)
+
+        Returns:
+            bytes: เนื้อหาไฟล์ภาพ
+        """
+        fmt = fmt or self.default_format
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f'ไม่รองรับรูปแบบกราฟ: {fmt}')
+        if chart_type != 'word_frequency':
+            raise ValueError(f'ไม่รองรับประเภทกราฟ: {chart_type}')
+        if not data:
+            raise ValueError('ไม่มีข้อมูลสำหรับสร้างกราฟ')
+
+        fig = self._word_frequency_figure(data)
+        buffer = BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=self.dpi, bbox_inches='tight')
+        return buffer.getvalue()
+
+    # ---------- cache ----------
+
+    def cache_key(self, chart_type: str, data: Sequence[Tuple[str, int]], fmt: str = None) -> str:
+        """hash ของข้อมูลกราฟและการตั้งค่าที่มีผลต่อภาพ"""
+        fmt = fmt or self.default_format
+        payload = json.dumps([chart_type, [[word, count] for word, count in data],
+                              fmt, self.dpi, self.figsize], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get_chart(self, chart_type: str, data: Sequence[Tuple[str, int]], fmt: str = None) -> str:
+        """
+        ชื่อไฟล์กราฟใน output_dir (วาดใหม่เฉพาะเมื่อยังไม่มีไฟล์ของข้อมูลนี้)
+
+        Returns:
+            str: ชื่อไฟล์ (ไม่รวมโฟลเดอร์)
+        """
+        fmt = fmt or self.default_format
+        filename = f'{CHART_PREFIX}{self.cache_key(chart_type, data, fmt)}.{fmt}'
+        filepath = os.path.join(self.output_dir, filename)
+
+        if os.path.exists(filepath):
+            # อัปเดตเวลาใช้งาน เพื่อให้ไฟล์ที่ยังถูกใช้ไม่ถูกลบก่อน
+            try:
+                os.utime(filepath)
+            except OSError:
+                pass
+            with self._stats_lock:
+                self._stats['hits'] += 1
+            return filename
+
+        content = self.render(chart_type, data, fmt)
+        fd, temp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._stats_lock:
+            self._stats['renders'] += 1
+        self._evict()
+        return filename
+
+    def _chart_files(self) -> List[os.DirEntry]:
+        with os.scandir(self.output_dir) as entries:
+            return [entry for entry in entries
+                    if entry.name.startswith(CHART_PREFIX) and entry.is_file()]
+
+    def _evict(self):
+        """ลบไฟล์กราฟที่ใช้ล่าสุดนานที่สุดเมื่อจำนวนไฟล์เกิน max_files"""
+        if not self.max_files:
+            return
+        files = self._chart_files()
+        excess = len(files) - self.max_files
+        if excess <= 0:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        removed = 0
+        for entry in files[:excess]:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+        with self._stats_lock:
+            self._stats['evicted'] += removed
+
+    def clear(self) -> int:
+        """ลบไฟล์กราฟทั้งหมดที่ service สร้าง (คืนค่าจำนวนไฟล์ที่ลบ)"""
+        removed = 0
+        for entry in self._chart_files():
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติของ cache"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['renders']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['dpi'] = self.dpi
+        stats['format'] = self.default_format
+        return stats
@@ -4,33 +4,306 @@
 ปรับปรุงประสิทธิภาพด้วย caching และ parallel processing
 """
 
-import re
-import numpy as np
-import pandas as pd
 from collections import Counter, defaultdict
-from typing import List, Dict, Tuple, Optional, Any
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import time
+from typing import List, Dict, Tuple, Optional, Any, Iterable, Iterator, Union, TYPE_CHECKING
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import threading
 
 # PyThaiNLP imports
 import pythainlp
 from pythainlp.tokenize import word_tokenize
 from pythainlp.tag import pos_tag
-from pythainlp.corpus import thai_stopwords
-from pythainlp.util import normalize
+from pythainlp.corpus import thai_stopwords, thai_words
 
 # Import performance utilities
 from .performance_utils import (
-    PerformanceTracker, CacheManager, ParallelProcessor, 
-    timing_decorator, get_performance_summary
+    CacheManager, ParallelProcessor, 
+    timing_decorator, get_performance_summary, performance_tracker
 )
+from .text_stream import DEFAULT_CHUNK_CHARS, split_on_boundaries, tag_token_chunks
+from .text_normalizer import clean_text, is_english_word, normalize_whitespace, remove_special_chars
+from .analysis_history import DEFAULT_HISTORY_SIZE, AnalysisHistory
+from .segment_memo import DEFAULT_SEGMENT_MEMO_SIZE, SegmentTagMemo
+from .tokenizer_dictionary import PrefixTrie, dictionary_fingerprint, load_dictionary
+from .word_categorizer import PARLIAMENT_CATEGORIES
+
+# libraries สำหรับกราฟและการส่งออก (matplotlib, wordcloud, plotly, pandas) นำเข้าเมื่อใช้งานครั้งแรก
+# เพื่อให้ import core และการเริ่ม worker เร็วขึ้น
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import plotly.graph_objects as go
+
+# engine ที่ใช้แยกคำและติดแท็ก (เป็นส่วนหนึ่งของ cache key)
+TOKENIZE_ENGINE = 'newmm'
+POS_TAG_ENGINE = 'perceptron'
+
+# POS tags เริ่มต้นสำหรับการกรอง (คำนามและกริยา)
+DEFAULT_TARGET_POS = ['NOUN', 'VERB', 'NCMN', 'VACT', 'VSTA']
+
+# โฟลเดอร์ของ dictionary ที่รวมคำสำคัญของหมวดหมู่ (None = dictionary เริ่มต้นของ PyThaiNLP)
+DEFAULT_DICTIONARY_DIR = 'dictionary'
+
+# dictionary ที่ tokenizer ใช้ใน process นี้ (ตั้งค่าด้วย use_custom_dictionary)
+_tokenizer_dict: Optional[PrefixTrie] = None
+
+# คำที่มีช่องว่างของ dictionary ที่ใช้อยู่: (dictionary_id, คำ)
+_spaced_words: Optional[Tuple[str, frozenset]] = None
+
+
+def category_keywords(categories: Dict[str, List[str]] = PARLIAMENT_CATEGORIES) -> List[str]:
+    """
+    คำสำคัญภาษาไทยของทุกหมวดหมู่ในรูปที่ผ่าน clean_text
+    (คำภาษาอังกฤษแยกด้วยกฎของ newmm เอง และคำที่มีช่องว่างไม่ใช่คำเดียวหลังแบ่งช่วงข้อความ)
+    """
+    keywords = set()
+    for words in categories.values():
+        for word in words:
+            word = clean_text(word)
+            if len(word) > 1 and ' ' not in word and not word.isascii():
+                keywords.add(word)
+    return sorted(keywords)
+
+
+def use_custom_dictionary(directory: Optional[str] = DEFAULT_DICTIONARY_DIR) -> Optional[PrefixTrie]:
+    """
+    ให้ tokenizer ใช้ dictionary ของ PyThaiNLP + คำสำคัญของหมวดหมู่ (โหลดจาก directory หรือสร้างครั้งแรก)
+    
+    Args:
+        directory: โฟลเดอร์ที่เก็บ dictionary ที่ compile แล้ว (None = กลับไปใช้ dictionary เริ่มต้น)
+        
+    Returns:
+        Optional[PrefixTrie]: dictionary ที่ใช้อยู่
+    """
+    global _tokenizer_dict
+    if directory is None:
+        _tokenizer_dict = None
+        return None
+    
+    keywords = category_keywords()
+    if _tokenizer_dict is None or _tokenizer_dict.fingerprint != dictionary_fingerprint(keywords, pythainlp.__version__):
+        _tokenizer_dict = load_dictionary(directory, keywords, thai_words, pythainlp.__version__)
+    return _tokenizer_dict
+
+
+def dictionary_id() -> str:
+    """รหัสของ dictionary ที่ใช้อยู่ (ส่วนหนึ่งของ cache key ของผลการแยกคำ)"""
+    return _tokenizer_dict.fingerprint if _tokenizer_dict is not None else 'default'
+
+
+def spaced_words() -> frozenset:
+    """คำใน dictionary ที่ใช้อยู่ที่มีช่องว่าง (newmm ตัดเป็นคำเดียวข้ามช่องว่าง จึงห้ามแบ่งช่วงกลางคำ)"""
+    global _spaced_words
+    current = dictionary_id()
+    if _spaced_words is None or _spaced_words[0] != current:
+        words = _tokenizer_dict if _tokenizer_dict is not None else thai_words()
+        _spaced_words = (current, frozenset(word for word in words if ' ' in word))
+    return _spaced_words[1]
+
+
+def tag_tokens(tokens: List[str]) -> List[Tuple[str, str]]:
+    """ติดแท็ก POS ให้รายการ token"""
+    return pos_tag(tokens, engine=POS_TAG_ENGINE)
+
+
+def tag_text(text: str) -> List[Tuple[str, str]]:
+    """แยกคำและติดแท็ก POS (ไม่ใช้ cache) ใช้ร่วมกันระหว่าง detector และ worker process"""
+    # แยกคำ (รองรับทั้งไทยและอังกฤษ)
+    tokens = tokenize_text(text)
+    
+    # ติดแท็ก POS (รองรับทั้งไทยและอังกฤษ)
+    return retag_english(tag_tokens(tokens))
+
+
+def tokenize_text(text: str) -> List[str]:
+    """แยกคำด้วย engine และ dictionary ของ detector"""
+    return word_tokenize(text, engine=TOKENIZE_ENGINE, custom_dict=_tokenizer_dict)
+
+
+def document_tokens(text: str) -> List[str]:
+    """คำของเอกสารที่ทำความสะอาดแล้ว (ไม่รวมช่องว่าง) สำหรับ shingle ของ MinHash และ fingerprint"""
+    return [token for token in tokenize_text(clean_text(text)) if not token.isspace()]
+
+
+def word_offsets(tokens: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    ตัด token ช่องว่างออก (ข้อความที่คั่นด้วยช่องว่างต่างกันถือว่าเหมือนกัน) และเก็บตำแหน่งตัวอักษร
+
+    Returns:
+        Tuple[List[str], List[int]]: (คำ, ตำแหน่งตัวอักษรเริ่มต้นของแต่ละคำในข้อความที่แยกคำ)
+    """
+    words = []
+    offsets = []
+    position = 0
+    for token in tokens:
+        if not token.isspace():
+            words.append(token)
+            offsets.append(position)
+        position += len(token)
+    return words, offsets
+
+
+def create_segment_memo(max_segments: int = DEFAULT_SEGMENT_MEMO_SIZE) -> SegmentTagMemo:
+    """memo ของผลการแยกคำ/ติดแท็กต่อช่วงข้อความ (ไม่แบ่งช่วงกลางคำใน dictionary ที่มีช่องว่าง)"""
+    return SegmentTagMemo(tokenize_text, tag_tokens, max_segments=max_segments,
+                          protected_phrases=spaced_words())
+
+
+def retag_english(pos_tags: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """กำหนด POS tag ให้คำภาษาอังกฤษ (tagger ภาษาไทยติดแท็กคำอังกฤษได้ไม่ดี)"""
+    enhanced_pos_tags = []
+    for token, pos in pos_tags:
+        # ถ้าเป็นคำภาษาอังกฤษ ให้กำหนด POS tag
+        if is_english_word(token):
+            if len(token) > 3:
+                enhanced_pos_tags.append((token, 'NCMN'))  # คำนาม
+            else:
+                enhanced_pos_tags.append((token, 'VACT'))  # กริยา
+        else:
+            enhanced_pos_tags.append((token, pos))
+    
+    return enhanced_pos_tags
+
+
+class PosTagMatcher:
+    """
+    ผลการตรวจ POS tag กับ target_pos (tag ที่มี target ใดเป็น substring) คำนวณครั้งเดียวต่อ tag
+    tag ของ tagger มีไม่กี่สิบแบบ จึงไม่ต้องวน target_pos ทุก token
+    """
+    
+    def __init__(self, target_pos: Tuple[str, ...]):
+        self.target_pos = target_pos
+        self._accepted = {}
+    
+    def accepted_tags(self, tags: set) -> set:
+        """tag ที่ผ่านเงื่อนไขจาก tags ที่ระบุ"""
+        accepted = self._accepted
+        for pos in tags:
+            if pos not in accepted:
+                accepted[pos] = any(tag in pos for tag in self.target_pos)
+        return {pos for pos in tags if accepted[pos]}
+
+
+@lru_cache(maxsize=32)
+def get_pos_matcher(target_pos: Tuple[str, ...]) -> PosTagMatcher:
+    """PosTagMatcher ของ target_pos (ใช้ร่วมกันทุก request ที่ใช้ target_pos เดียวกัน)"""
+    return PosTagMatcher(target_pos)
+
+
+def filter_pos_tags(pos_tags: List[Tuple[str, str]], stopwords: set,
+                    target_pos: List[str] = None) -> List[Tuple[str, str]]:
+    """กรองคำหยุด คำสั้น และคำที่ POS ไม่อยู่ใน target_pos"""
+    if target_pos is None:
+        target_pos = DEFAULT_TARGET_POS
+    
+    # ตรวจ tag ทุกแบบที่พบครั้งเดียว แล้วกรองด้วยการค้นหาใน set (ไม่มี any() ต่อ token)
+    accepted = get_pos_matcher(tuple(target_pos)).accepted_tags({pos for _, pos in pos_tags})
+    return [(word, pos) for word, pos in pos_tags
+            if pos in accepted and word not in stopwords and len(word) > 1]
+
+
+def split_pair_counts(word_pos_counts: Counter) -> Tuple[Counter, Counter]:
+    """
+    แยกความถี่ของคู่ (คำ, POS) เป็นความถี่คำและความถี่ POS
+    ลำดับ key เหมือนนับจากรายการ token โดยตรง (ตามลำดับที่พบครั้งแรก)
+    """
+    word_counts = Counter()
+    pos_counts = Counter()
+    for (word, pos), count in word_pos_counts.items():
+        word_counts[word] += count
+        pos_counts[pos] += count
+    return word_counts, pos_counts
+
+
+def count_pos_tags(pos_tags: List[Tuple[str, str]]) -> Tuple[Counter, Counter, Counter]:
+    """
+    นับความถี่คำ, POS และคู่ (คำ, POS) พร้อมกัน
+    นับคู่ด้วย Counter (C) รอบเดียว แล้วรวมต่อคำ/POS จากคู่ที่ไม่ซ้ำ (น้อยกว่าจำนวน token มาก)
+    
+    Returns:
+        Tuple[Counter, Counter, Counter]: (ความถี่คำ, ความถี่ POS, ความถี่คู่ (คำ, POS))
+    """
+    word_pos_counts = Counter(pos_tags)
+    word_counts, pos_counts = split_pair_counts(word_pos_counts)
+    return word_counts, pos_counts, word_pos_counts
+
+
+def _iter_token_chunks(cleaned_chunks: Iterable[str]) -> Iterator[List[str]]:
+    """แยกคำทีละช่วง และใส่ token ช่องว่างระหว่างช่วง (แทนช่องว่างที่ขอบประโยค)"""
+    first = True
+    for chunk in cleaned_chunks:
+        if not chunk:
+            continue
+        tokens = tokenize_text(chunk)
+        if not first:
+            tokens = [' '] + tokens
+        first = False
+        yield tokens
+
+
+def iter_tagged_chunks(text: Union[str, Iterable[str]],
+                       chunk_chars: int = DEFAULT_CHUNK_CHARS) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Generator pipeline: ทำความสะอาด -> แบ่งช่วงที่ขอบประโยค -> แยกคำ -> ติดแท็ก ทีละช่วง
+    ต่อผลลัพธ์ทุกช่วงเข้าด้วยกันแล้วจะได้เหมือน tag_text(clean_text(text)) ทุกประการ
+    
+    Args:
+        text: ข้อความ หรือ iterable ของชิ้นข้อความ (เช่น ทีละหน้าจาก PDF)
+        chunk_chars: ขนาดช่วงโดยประมาณ (จำนวนตัวอักษร)
+        
+    Yields:
+        List[Tuple[str, str]]: (คำ, POS tag) ของแต่ละช่วง
+    """
+    if isinstance(text, str):
+        text = (text,)
+    
+    filtered = (remove_special_chars(piece) for piece in text)
+    chunks = split_on_boundaries(filtered, chunk_chars, protected_phrases=spaced_words(),
+                                 normalize=normalize_whitespace)
+    cleaned = (normalize_whitespace(chunk) for chunk in chunks)
+    for tagged in tag_token_chunks(_iter_token_chunks(cleaned), tag_tokens):
+        yield retag_english(tagged)
+
+
+# ==================== Worker process (process pool) ====================
+
+# stopwords และ memo ของช่วงข้อความที่โหลดไว้ใน worker process แต่ละตัว
+_worker_stopwords = None
+_worker_memo = None
+
+
+def _init_analysis_worker(dictionary_dir: Optional[str] = None):
+    """
+    โหลด stopwords, dictionary ของ newmm และ perceptron tagger ครั้งเดียวตอน worker เริ่มทำงาน
+    (dictionary_dir = None: ใช้ dictionary ที่ process นี้ตั้งค่าไว้แล้ว หรือที่สืบทอดมาจากการ fork)
+    """
+    global _worker_stopwords, _worker_memo
+    if dictionary_dir is not None:
+        use_custom_dictionary(dictionary_dir)
+    _worker_stopwords = frozenset(thai_stopwords())
+    _worker_memo = create_segment_memo()
+    tokens = tokenize_text('ประเทศไทย')
+    pos_tag(tokens, engine=POS_TAG_ENGINE)
+
+
+def _analyze_batch(texts: List[str], filter_pos: bool,
+                   target_pos: Optional[List[str]]) -> List[Counter]:
+    """
+    วิเคราะห์ batch ของข้อความใน worker process
+    
+    Returns:
+        List[Counter]: Counter ของ (คำ, POS tag) ต่อข้อความ (ส่งกลับแบบกระชับ)
+    """
+    if _worker_stopwords is None:
+        _init_analysis_worker()
+    
+    results = []
+    for text in texts:
+        pos_tags = retag_english(_worker_memo.tag(clean_text(text)))
+        if filter_pos:
+            pos_tags = filter_pos_tags(pos_tags, _worker_stopwords, target_pos)
+        results.append(Counter(pos_tags))
+    return results
 
 
 class ThaiDuplicateWordDetector:
@@ -40,17 +313,36 @@ class ThaiDuplicateWordDetector:
     ปรับปรุงประสิทธิภาพด้วย caching และ parallel processing
     """
     
-    def __init__(self):
-        """เริ่มต้นโมเดล"""
-        self.stopwords = set(thai_stopwords())
-        self.word_frequency = Counter()
-        self.pos_frequency = defaultdict(Counter)
-        self.processed_texts = []
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE, keep_texts: bool = False,
+                 segment_memo_size: int = DEFAULT_SEGMENT_MEMO_SIZE,
+                 dictionary_dir: Optional[str] = DEFAULT_DICTIONARY_DIR):
+        """
+        เริ่มต้นโมเดล
+        
+        Args:
+            history_size (int): จำนวนสรุปผลการวิเคราะห์ล่าสุดที่เก็บใน processed_texts
+            keep_texts (bool): เก็บข้อความต้นฉบับใน processed_texts ด้วยหรือไม่
+            segment_memo_size (int): จำนวนช่วงข้อความ (ประโยค/วลี) ที่จำผลการแยกคำและติดแท็กไว้ (0 = ปิด)
+            dictionary_dir (str): โฟลเดอร์ของ dictionary ที่รวมคำสำคัญของหมวดหมู่ (None = dictionary เริ่มต้น)
+        """
+        # นำเข้าที่นี่: worker process ที่ใช้แค่ฟังก์ชันระดับ module ไม่ต้องโหลด NumPy
+        from .vocabulary import FrequencyTable
         
-        # เพิ่มประสิทธิภาพ
-        self.performance_tracker = PerformanceTracker()
+        self.stopwords = set(thai_stopwords())
+        # dictionary ของ tokenizer (คำประสมในหมวดหมู่เป็น token เดียว) ต้องตั้งก่อนสร้าง segment memo
+        self.dictionary = use_custom_dictionary(dictionary_dir)
+        # ความถี่สะสมแบบ integer id + NumPy array และเมทริกซ์ word×POS แบบ sparse
+        self.frequencies = FrequencyTable()
+        # สรุปผลแบบ ring buffer พร้อมผลรวมสะสม (ไม่เก็บรายการคำและ Counter ของแต่ละข้อความ)
+        self.processed_texts = AnalysisHistory(max_records=history_size, keep_texts=keep_texts)
+        
+        # เพิ่มประสิทธิภาพ (ใช้ tracker ร่วมกับ timing_decorator เพื่อให้ span ซ้อนกันและส่งออกที่ /metrics ได้)
+        self.performance_tracker = performance_tracker
         self.cache_manager = CacheManager()
-        self.parallel_processor = ParallelProcessor()
+        # ข้อความที่ซ้ำบางส่วน (เช่น วลีตามระเบียบการประชุม) แยกคำ/ติดแท็กเฉพาะช่วงที่ยังไม่เคยเห็น
+        self.segment_memo = create_segment_memo(segment_memo_size) if segment_memo_size > 0 else None
+        self.parallel_processor = ParallelProcessor(process_initializer=_init_analysis_worker,
+                                                    process_initargs=(dictionary_dir,))
         self._lock = threading.Lock()
         
     @timing_decorator("preprocess_text")
@@ -64,27 +356,8 @@ class ThaiDuplicateWordDetector:
         Returns:
             str: ข้อความที่ทำความสะอาดแล้ว
         """
-        # ตรวจสอบ cache ก่อน
-        cache_key = f"preprocess_{hash(text)}"
-        cached_result = self.cache_manager.get(cache_key)
-        if cached_result is not None:
-            return cached_result
-        
-        # ลบตัวอักษรพิเศษและตัวเลขที่ไม่จำเป็น (รองรับทั้งไทยและอังกฤษ)
-        text = re.sub(r'[^\u0E00-\u0E7F\u0041-\u005A\u0061-\u007A\s]', '', text)
-        
-        # ลบช่องว่างที่เกิน
-        text = re.sub(r'\s+', ' ', text)
-        
-        # ปรับมาตรฐานข้อความ
-        text = normalize(text)
-        
-        result = text.strip()
-        
-        # เก็บใน cache
-        self.cache_manager.set(cache_key, result)
-        
-        return result
+        # ไม่ใช้ cache: clean_text (pattern ที่ compile แล้ว) เร็วกว่าการ hash ข้อความ + อ่าน/เขียน pickle
+        return clean_text(text)
     
     @timing_decorator("tokenize_and_tag")
     def tokenize_and_tag(self, text: str) -> List[Tuple[str, str]]:
@@ -98,28 +371,17 @@ class ThaiDuplicateWordDetector:
             List[Tuple[str, str]]: รายการของ (คำ, POS tag)
         """
         # ตรวจสอบ cache ก่อน
-        cache_key = f"tokenize_{hash(text)}"
+        cache_key = self.cache_manager.make_key(
+            'tokenize', text, TOKENIZE_ENGINE, POS_TAG_ENGINE, pythainlp.__version__, dictionary_id()
+        )
         cached_result = self.cache_manager.get(cache_key)
         if cached_result is not None:
             return cached_result
         
-        # แยกคำ (รองรับทั้งไทยและอังกฤษ)
-        tokens = word_tokenize(text, engine='newmm')
-        
-        # ติดแท็ก POS (รองรับทั้งไทยและอังกฤษ)
-        pos_tags = pos_tag(tokens, engine='perceptron')
-        
-        # เพิ่มการรองรับภาษาอังกฤษ
-        enhanced_pos_tags = []
-        for token, pos in pos_tags:
-            # ถ้าเป็นคำภาษาอังกฤษ ให้กำหนด POS tag
-            if re.match(r'^[a-zA-Z]+$', token):
-                if len(token) > 3:
-                    enhanced_pos_tags.append((token, 'NCMN'))  # คำนาม
-                else:
-                    enhanced_pos_tags.append((token, 'VACT'))  # กริยา
-            else:
-                enhanced_pos_tags.append((token, pos))
+        if self.segment_memo is not None:
+            enhanced_pos_tags = retag_english(self.segment_memo.tag(text))
+        else:
+            enhanced_pos_tags = tag_text(text)
         
         # เก็บใน cache
         self.cache_manager.set(cache_key, enhanced_pos_tags)
@@ -138,24 +400,13 @@ class ThaiDuplicateWordDetector:
         Returns:
             List[Tuple[str, str]]: คำที่กรองแล้ว
         """
-        if target_pos is None:
-            # กรองเฉพาะคำนามและกริยา
-            target_pos = ['NOUN', 'VERB', 'NCMN', 'VACT', 'VSTA']
-        
-        filtered = []
-        for word, pos in pos_tags:
-            # กรองคำหยุดและคำสั้น
-            if (word not in self.stopwords and 
-                len(word) > 1 and 
-                any(tag in pos for tag in target_pos)):
-                filtered.append((word, pos))
-        
-        return filtered
+        return filter_pos_tags(pos_tags, self.stopwords, target_pos)
     
     def analyze_text(self, text: str, 
                     filter_pos: bool = True,
                     target_pos: List[str] = None,
-                    track_time: bool = True) -> Dict:
+                    track_time: bool = True,
+                    record: bool = True) -> Dict:
         """
         วิเคราะห์ข้อความและนับความถี่ของคำ
         
@@ -164,63 +415,200 @@ class ThaiDuplicateWordDetector:
             filter_pos (bool): ต้องการกรองตาม POS หรือไม่
             target_pos (List[str]): รายการ POS tags ที่ต้องการ
             track_time (bool): ต้องการติดตามเวลาหรือไม่
+            record (bool): เก็บผลรวมเข้ากับสถิติสะสมของ detector
+                (False = ไม่แตะสถานะร่วม เรียกพร้อมกันหลาย request ได้โดยไม่ต้องรอ lock)
             
         Returns:
-            Dict: ผลการวิเคราะห์
+            Dict: ผลการวิเคราะห์ (object ใหม่ทุกครั้ง)
         """
-        if track_time:
-            self.performance_tracker.start_timing("analyze_text")
-        
-        # ทำความสะอาดข้อความ
-        cleaned_text = self.preprocess_text(text)
-        
-        # แยกคำและติดแท็ก POS
-        pos_tags = self.tokenize_and_tag(cleaned_text)
+        tracker = self.performance_tracker
+        with tracker.span("analyze_text", enabled=track_time) as span:
+            # ทำความสะอาดข้อความ
+            cleaned_text = self.preprocess_text(text)
+            
+            # แยกคำและติดแท็ก POS
+            pos_tags = self.tokenize_and_tag(cleaned_text)
+            
+            # กรองตาม POS ถ้าต้องการ
+            if filter_pos:
+                with tracker.span("filter_by_pos"):
+                    pos_tags = self.filter_by_pos(pos_tags, target_pos)
+            
+            # นับความถี่ของคำ, POS และคู่ (คำ, POS) พร้อมกัน
+            with tracker.span("count"):
+                word_counts, pos_counts, word_pos_counts = count_pos_tags(pos_tags)
+            
+            # บันทึกข้อมูล (ใช้ lock เพื่อความปลอดภัย)
+            if record:
+                with tracker.span("record"), self._lock:
+                    self.frequencies.add_pairs(word_pos_counts)
+                    
+                    self.processed_texts.append(word_counts, len(pos_tags),
+                                                original_text=text, cleaned_text=cleaned_text)
         
-        # กรองตาม POS ถ้าต้องการ
-        if filter_pos:
-            pos_tags = self.filter_by_pos(pos_tags, target_pos)
+        result = {
+            'word_frequency': word_counts,
+            'pos_frequency': pos_counts,
+            'total_words': len(pos_tags),
+            'unique_words': len(word_counts),
+            'filtered_words': pos_tags
+        }
         
-        # นับความถี่ของคำ
-        word_counts = Counter([word for word, pos in pos_tags])
+        if track_time:
+            result['processing_time'] = span.duration
         
-        # นับความถี่ของ POS
-        pos_counts = Counter([pos for word, pos in pos_tags])
+        return result
+    
+    def analyze_text_stream(self, text: Union[str, Iterable[str]],
+                            filter_pos: bool = True,
+                            target_pos: List[str] = None,
+                            chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                            track_time: bool = True,
+                            record: bool = True) -> Dict:
+        """
+        วิเคราะห์เอกสารขนาดใหญ่แบบ streaming ทีละช่วง
+        ใช้หน่วยความจำคงที่ตามขนาดช่วง ไม่ขึ้นกับความยาวเอกสาร
+        และให้ผลรวมเหมือน analyze_text() ทุกประการ
         
-        # บันทึกข้อมูล (ใช้ lock เพื่อความปลอดภัย)
-        with self._lock:
-            self.word_frequency.update(word_counts)
-            for word, pos in pos_tags:
-                self.pos_frequency[word][pos] += 1
+        Args:
+            text: ข้อความ หรือ iterable ของชิ้นข้อความ (เช่น ทีละหน้าจาก PDF)
+            filter_pos (bool): ต้องการกรองตาม POS หรือไม่
+            target_pos (List[str]): รายการ POS tags ที่ต้องการ
+            chunk_chars (int): ขนาดช่วงโดยประมาณ (จำนวนตัวอักษร)
+            track_time (bool): ต้องการติดตามเวลาหรือไม่
+            record (bool): เก็บผลรวมเข้ากับสถิติสะสมของ detector (ดู analyze_text)
+            
+        Returns:
+            Dict: ผลการวิเคราะห์ (ไม่มี 'filtered_words' เพื่อประหยัดหน่วยความจำ)
+        """
+        with self.performance_tracker.span("analyze_text_stream", enabled=track_time) as span:
+            word_pos_counts = Counter()
+            total_words = 0
+            chunk_count = 0
+            
+            for pos_tags in iter_tagged_chunks(text, chunk_chars):
+                if filter_pos:
+                    pos_tags = self.filter_by_pos(pos_tags, target_pos)
+                
+                word_pos_counts.update(pos_tags)
+                total_words += len(pos_tags)
+                chunk_count += 1
             
-            self.processed_texts.append({
-                'original_text': text,
-                'cleaned_text': cleaned_text,
-                'word_count': len(word_counts),
-                'total_words': len(pos_tags),
-                'word_frequency': word_counts,
-                'pos_frequency': pos_counts,
-                'filtered_words': pos_tags,
-                'analysis_time': time.time()
-            })
+            word_counts, pos_counts = split_pair_counts(word_pos_counts)
+            
+            # บันทึกข้อมูล (ไม่เก็บข้อความเต็มและรายการคำ เพื่อจำกัดหน่วยความจำ)
+            if record:
+                with self._lock:
+                    self.frequencies.add_pairs(word_pos_counts)
+                    
+                    self.processed_texts.append(word_counts, total_words)
         
         result = {
             'word_frequency': word_counts,
             'pos_frequency': pos_counts,
-            'total_words': len(pos_tags),
+            'total_words': total_words,
             'unique_words': len(word_counts),
-            'filtered_words': pos_tags
+            'chunks': chunk_count
         }
         
         if track_time:
-            duration = self.performance_tracker.end_timing("analyze_text")
-            result['processing_time'] = duration
+            result['processing_time'] = span.duration
         
         return result
+
+    def document_tokens(self, text: str) -> List[str]:
+        """คำของเอกสาร (ไม่รวมช่องว่าง) ด้วย tokenizer และ dictionary ของ detector"""
+        return document_tokens(text)
+
+    def document_words(self, text: str) -> Tuple[str, List[str], List[int]]:
+        """
+        ข้อความที่ทำความสะอาดแล้ว คำ (ไม่รวมช่องว่าง แยกคำแบบเดียวกับ document_tokens) และตำแหน่งตัวอักษรของแต่ละคำ
+        """
+        cleaned_text = self.preprocess_text(text)
+        words, offsets = word_offsets(tokenize_text(cleaned_text))
+        return cleaned_text, words, offsets
+
+    def analyze_phrases(self, text: str,
+                        min_length: int = 3,
+                        min_count: int = 2,
+                        mode: str = 'maximal',
+                        limit: Optional[int] = 100,
+                        skip_stopwords: bool = True,
+                        track_time: bool = True) -> Dict:
+        """
+        หาวลี (ลำดับคำ) ที่ซ้ำในข้อความ เช่น ประเด็นหรือวลีที่ผู้อภิปรายพูดซ้ำ
+        ใช้ suffix array บน token id (ไม่นับช่องว่าง) ไม่บันทึกผลลงสถิติสะสม
+
+        Args:
+            text (str): ข้อความที่ต้องการวิเคราะห์
+            min_length (int): จำนวนคำขั้นต่ำของวลี (โหมด 'ngram' = จำนวนคำของ n-gram)
+            min_count (int): จำนวนครั้งขั้นต่ำ
+            mode (str): 'maximal' = วลีซ้ำที่ยาวที่สุด (maximal repeats), 'ngram' = n-gram ยาว min_length คำ
+            limit (int): จำนวนวลีสูงสุด (None = ทั้งหมด)
+            skip_stopwords (bool): ไม่นับวลีที่มีแต่ stopwords
+            track_time (bool): ต้องการติดตามเวลาหรือไม่
+
+        Returns:
+            Dict: วลีที่ซ้ำ เรียงตามจำนวนครั้งแล้วความยาว ('spans' = ช่วงตัวอักษรใน 'cleaned_text')
+        """
+        from .phrases import find_repeated_phrases, summarize_phrases
+        from .vocabulary import Vocabulary
+
+        tracker = self.performance_tracker
+        with tracker.span("analyze_phrases", enabled=track_time) as span:
+            cleaned_text = self.preprocess_text(text)
+
+            with tracker.span("tokenize"):
+                tokens = tokenize_text(cleaned_text)
+
+            words, offsets = word_offsets(tokens)
+
+            with tracker.span("suffix_array"):
+                ids = Vocabulary().encode(words)
+                repeats = find_repeated_phrases(ids, min_length, min_count, mode,
+                                                limit=None if skip_stopwords else limit)
+
+            if skip_stopwords:
+                stopwords = self.stopwords
+                repeats = [repeat for repeat in repeats
+                           if not all(word in stopwords
+                                      for word in words[repeat[2][0]:repeat[2][0] + repeat[0]])]
+                if limit is not None:
+                    repeats = repeats[:limit]
+
+            phrases = summarize_phrases(words, offsets, cleaned_text, repeats)
+
+        result = {
+            'phrases': phrases,
+            'total_tokens': len(words),
+            'mode': mode,
+            'cleaned_text': cleaned_text
+        }
+
+        if track_time:
+            result['processing_time'] = span.duration
+
+        return result
+
+    @property
+    def word_frequency(self) -> Counter:
+        """ความถี่คำสะสมในรูปแบบ Counter (สร้างใหม่จาก frequencies ทุกครั้งที่เรียก)"""
+        with self._lock:
+            return self.frequencies.to_counter()
+    
+    @property
+    def pos_frequency(self) -> Dict[str, Counter]:
+        """ความถี่ POS ของแต่ละคำในรูปแบบ {คำ: Counter} (สร้างใหม่จาก frequencies ทุกครั้งที่เรียก)"""
+        distribution = defaultdict(Counter)
+        with self._lock:
+            for word, pos, count in self.frequencies.word_pos_items():
+                distribution[word][pos] = count
+        return distribution
     
     def get_most_frequent_words(self, n: int = 20) -> List[Tuple[str, int]]:
         """
         ดึงคำที่มีความถี่สูงสุด
+        (n ไม่เกินขนาดดัชนี top-k ของ frequencies จะตอบจากดัชนีโดยไม่สแกนทั้ง vocabulary)
         
         Args:
             n (int): จำนวนคำที่ต้องการ
@@ -228,7 +616,8 @@ class ThaiDuplicateWordDetector:
         Returns:
             List[Tuple[str, int]]: รายการคำและความถี่
         """
-        return self.word_frequency.most_common(n)
+        with self._lock:
+            return self.frequencies.most_common(n)
     
     def get_word_pos_distribution(self, word: str) -> Dict[str, int]:
         """
@@ -240,10 +629,11 @@ class ThaiDuplicateWordDetector:
         Returns:
             Dict[str, int]: การกระจายของ POS tags
         """
-        return dict(self.pos_frequency[word])
+        with self._lock:
+            return self.frequencies.pos_distribution(word)
     
     def create_word_frequency_chart(self, n: int = 20, 
-                                  figsize: Tuple[int, int] = (12, 8)) -> plt.Figure:
+                                  figsize: Tuple[int, int] = (12, 8)) -> 'plt.Figure':
         """
         สร้างกราฟแสดงความถี่ของคำ
         
@@ -260,6 +650,8 @@ class ThaiDuplicateWordDetector:
             print("ไม่มีข้อมูลคำที่พบ")
             return None
         
+        import matplotlib.pyplot as plt
+        
         words, frequencies = zip(*top_words)
         
         plt.figure(figsize=figsize)
@@ -277,7 +669,7 @@ class ThaiDuplicateWordDetector:
         return plt.gcf()
     
     def create_wordcloud(self, max_words: int = 100, 
-                        figsize: Tuple[int, int] = (12, 8)) -> plt.Figure:
+                        figsize: Tuple[int, int] = (12, 8)) -> 'plt.Figure':
         """
         สร้าง Word Cloud
         
@@ -288,11 +680,15 @@ class ThaiDuplicateWordDetector:
         Returns:
             plt.Figure: Word Cloud ที่สร้างแล้ว
         """
-        if not self.word_frequency:
+        if not self.frequencies:
             print("ไม่มีข้อมูลคำที่พบ")
             return None
         
+        import matplotlib.pyplot as plt
+        
         try:
+            from wordcloud import WordCloud
+            
             # สร้าง Word Cloud โดยไม่ใช้ฟอนต์เฉพาะ
             wordcloud = WordCloud(
                 width=figsize[0]*100,
@@ -332,7 +728,7 @@ class ThaiDuplicateWordDetector:
         
         return plt.gcf()
     
-    def create_interactive_chart(self, n: int = 20) -> go.Figure:
+    def create_interactive_chart(self, n: int = 20) -> 'go.Figure':
         """
         สร้างกราฟแบบ Interactive ด้วย Plotly
         
@@ -348,6 +744,8 @@ class ThaiDuplicateWordDetector:
             print("ไม่มีข้อมูลคำที่พบ")
             return None
         
+        import plotly.graph_objects as go
+        
         words, frequencies = zip(*top_words)
         
         fig = go.Figure(data=[
@@ -379,17 +777,19 @@ class ThaiDuplicateWordDetector:
             filename (str): ชื่อไฟล์ที่ต้องการบันทึก
             language (str): ภาษาสำหรับการส่งออก ('mixed' = ทั้งไทยและอังกฤษ)
         """
+        import pandas as pd
+        
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
             # แผ่นข้อมูลความถี่ของคำ (ภาษาไทย)
             word_freq_df_thai = pd.DataFrame(
-                self.word_frequency.most_common(),
+                self.frequencies.most_common(),
                 columns=['คำ', 'ความถี่']
             )
             word_freq_df_thai.to_excel(writer, sheet_name='ความถี่คำ', index=False)
             
             # แผ่นข้อมูลความถี่ของคำ (ภาษาอังกฤษ)
             word_freq_df_eng = pd.DataFrame(
-                self.word_frequency.most_common(),
+                self.frequencies.most_common(),
                 columns=['Word', 'Frequency']
             )
             word_freq_df_eng.to_excel(writer, sheet_name='Word Frequency', index=False)
@@ -399,10 +799,10 @@ class ThaiDuplicateWordDetector:
             for i, text_data in enumerate(self.processed_texts):
                 summary_data_thai.append({
                     'ข้อความที่': i+1,
-                    'จำนวนคำทั้งหมด': text_data['total_words'],
-                    'จำนวนคำเฉพาะ': text_data['word_count'],
-                    'คำที่ซ้ำมากที่สุด': text_data['word_frequency'].most_common(1)[0][0] if text_data['word_frequency'] else 'ไม่มี',
-                    'ความถี่สูงสุด': text_data['word_frequency'].most_common(1)[0][1] if text_data['word_frequency'] else 0
+                    'จำนวนคำทั้งหมด': text_data.total_words,
+                    'จำนวนคำเฉพาะ': text_data.unique_words,
+                    'คำที่ซ้ำมากที่สุด': text_data.top_word or 'ไม่มี',
+                    'ความถี่สูงสุด': text_data.top_count
                 })
             
             summary_df_thai = pd.DataFrame(summary_data_thai)
@@ -413,10 +813,10 @@ class ThaiDuplicateWordDetector:
             for i, text_data in enumerate(self.processed_texts):
                 summary_data_eng.append({
                     'Text #': i+1,
-                    'Total Words': text_data['total_words'],
-                    'Unique Words': text_data['word_count'],
-                    'Most Frequent Word': text_data['word_frequency'].most_common(1)[0][0] if text_data['word_frequency'] else 'None',
-                    'Max Frequency': text_data['word_frequency'].most_common(1)[0][1] if text_data['word_frequency'] else 0
+                    'Total Words': text_data.total_words,
+                    'Unique Words': text_data.unique_words,
+                    'Most Frequent Word': text_data.top_word or 'None',
+                    'Max Frequency': text_data.top_count
                 })
             
             summary_df_eng = pd.DataFrame(summary_data_eng)
@@ -425,7 +825,8 @@ class ThaiDuplicateWordDetector:
     def analyze_multiple_texts(self, texts: List[str], 
                               filter_pos: bool = True,
                               target_pos: List[str] = None,
-                              parallel: bool = True) -> List[Dict]:
+                              parallel: bool = True,
+                              backend: str = 'process') -> List[Dict]:
         """
         วิเคราะห์ข้อความหลายข้อความแบบขนาน
         
@@ -434,12 +835,18 @@ class ThaiDuplicateWordDetector:
             filter_pos (bool): ต้องการกรองตาม POS หรือไม่
             target_pos (List[str]): รายการ POS tags ที่ต้องการ
             parallel (bool): ใช้การประมวลผลแบบขนานหรือไม่
+            backend (str): 'process' = process pool (แนะนำ, ไม่ติด GIL),
+                'thread' = thread pool
             
         Returns:
             List[Dict]: รายการผลการวิเคราะห์
+            (backend 'process' จะไม่มี 'filtered_words' เพราะ worker ส่งกลับเฉพาะ Counter)
         """
+        if parallel and len(texts) > 1 and backend == 'process':
+            return self._analyze_multiple_texts_in_processes(texts, filter_pos, target_pos)
+        
         if parallel and len(texts) > 1:
-            # ใช้การประมวลผลแบบขนาน
+            # ใช้การประมวลผลแบบขนานด้วย thread pool
             def analyze_single_text(text):
                 return self.analyze_text(text, filter_pos, target_pos, track_time=False)
             
@@ -453,32 +860,73 @@ class ThaiDuplicateWordDetector:
         
         return results
     
+    def _analyze_multiple_texts_in_processes(self, texts: List[str],
+                                             filter_pos: bool,
+                                             target_pos: List[str]) -> List[Dict]:
+        """
+        ส่งข้อความเป็น batch ไปยัง process pool แล้วรวม Counter ที่ได้
+        เข้ากับ word_frequency / pos_frequency ของ detector
+        """
+        batches = self.parallel_processor.chunk(texts)
+        batch_results = self.parallel_processor.process_batches(
+            batches, _analyze_batch, filter_pos, target_pos
+        )
+        
+        results = []
+        text_index = 0
+        for batch_result in batch_results:
+            for word_pos_counts in batch_result:
+                text = texts[text_index]
+                text_index += 1
+                
+                word_counts, pos_counts = split_pair_counts(word_pos_counts)
+                total_words = sum(word_pos_counts.values())
+                
+                with self._lock:
+                    self.frequencies.add_pairs(word_pos_counts)
+                    
+                    self.processed_texts.append(word_counts, total_words, original_text=text)
+                
+                results.append({
+                    'word_frequency': word_counts,
+                    'pos_frequency': pos_counts,
+                    'total_words': total_words,
+                    'unique_words': len(word_counts)
+                })
+        
+        return results
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """ดึงสถิติประสิทธิภาพ"""
         return {
             'performance_tracker': self.performance_tracker.get_stats(),
             'cache_stats': self.cache_manager.get_stats(),
-            'total_texts_processed': len(self.processed_texts),
-            'total_words_processed': sum(text_data['total_words'] for text_data in self.processed_texts),
+            'segment_memo': self.segment_memo.get_stats() if self.segment_memo is not None else None,
+            'total_texts_processed': self.processed_texts.total_texts,
+            'total_words_processed': self.processed_texts.total_words,
+            'history': self.processed_texts.get_stats(),
             'average_processing_time': self.performance_tracker.get_average_timing("analyze_text")
         }
     
     def clear_cache(self):
         """ล้าง cache"""
         self.cache_manager.clear()
+        if self.segment_memo is not None:
+            self.segment_memo.clear()
     
     def reset(self):
         """รีเซ็ตข้อมูลทั้งหมด"""
         with self._lock:
-            self.word_frequency.clear()
-            self.pos_frequency.clear()
+            self.frequencies.clear()
             self.processed_texts.clear()
-            self.performance_tracker = PerformanceTracker()
+            self.performance_tracker.reset()
             self.cache_manager.clear()
 
 
 def main():
     """ฟังก์ชันหลักสำหรับการทดสอบ"""
+    import matplotlib.pyplot as plt
+    
     # สร้างโมเดล
     detector = ThaiDuplicateWordDetector()
     
@@ -0,0 +1,426 @@
+"""
+Low-overhead instrumentation
+วัดเวลาแต่ละขั้นตอนด้วย span (time.perf_counter_ns) ที่ซ้อนกันได้และแยกตาม thread/context
+เก็บเวลาใน histogram ขนาดคงที่ (p50/p95/p99 โดยไม่ต้องเก็บทุกค่า) และสุ่มวัดเมตริกซ์ระบบตามช่วงเวลา
+ส่งออกเป็น dict (/api/performance) และ Prometheus text format (/metrics)
+"""
+
+import bisect
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+# ขอบบนของ bucket (nanoseconds): 1µs ถึง ~100 วินาที เพิ่มทีละ 1.5 เท่า (46 bucket + overflow)
+LATENCY_BUCKET_FACTOR = 1.5
+LATENCY_BUCKETS_NS = []
+_bound = 1000.0
+while _bound < 100e9:
+    LATENCY_BUCKETS_NS.append(int(_bound))
+    _bound *= LATENCY_BUCKET_FACTOR
+del _bound
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+# ช่วงเวลาขั้นต่ำระหว่างการวัดเมตริกซ์ระบบ และจำนวนค่าที่เก็บไว้
+DEFAULT_SAMPLE_INTERVAL = 5.0
+DEFAULT_SAMPLE_HISTORY = 60
+
+# prefix ของชื่อเมตริกซ์ใน Prometheus
+METRICS_PREFIX = 'dwd'
+
+NS_PER_SECOND = 1e9
+
+
+class LatencyHistogram:
+    """
+    histogram ของเวลา (ns) แบบ bucket คงที่ หน่วยความจำไม่โตตามจำนวนครั้งที่วัด
+    percentile ประมาณจาก bucket (interpolate ภายใน bucket และไม่เกินค่า min/max จริง)
+    """
+
+    __slots__ = ('bounds', 'buckets', 'count', 'sum_ns', 'min_ns', 'max_ns', '_lock')
+
+    def __init__(self, bounds: List[int] = None):
+        self.bounds = bounds or LATENCY_BUCKETS_NS
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.buckets = [0] * (len(self.bounds) + 1)  # ช่องสุดท้าย = เกิน bucket บนสุด
+            self.count = 0
+            self.sum_ns = 0
+            self.min_ns = None
+            self.max_ns = None
+
+    def observe(self, duration_ns: int):
+        """บันทึกเวลาหนึ่งครั้ง (ns)"""
+        index = bisect.bisect_left(self.bounds, duration_ns)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.sum_ns += duration_ns
+            if self.min_ns is None or duration_ns < self.min_ns:
+                self.min_ns = duration_ns
+            if self.max_ns is None or duration_ns > self.max_ns:
+                self.max_ns = duration_ns
+
+    def percentile(self, percent: float) -> float:
+        """ค่าประมาณของ percentile (ns)"""
+        with self._lock:
+            return self._percentile(percent)
+
+    def _percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max_ns
+                lower = max(lower, self.min_ns)
+                upper = min(upper, self.max_ns)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return float(self.max_ns)
+
+    def snapshot(self, percentiles=DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """สถิติในหน่วยวินาที (ชื่อ key เดียวกับ PerformanceTracker เดิม + pXX)"""
+        with self._lock:
+            if not self.count:
+                return {'count': 0}
+            stats = {
+                'count': self.count,
+                'total_time': self.sum_ns / NS_PER_SECOND,
+                'average_time': self.sum_ns / self.count / NS_PER_SECOND,
+                'min_time': self.min_ns / NS_PER_SECOND,
+                'max_time': self.max_ns / NS_PER_SECOND
+            }
+            for percent in percentiles:
+                stats[f'p{percent}'] = self._percentile(percent) / NS_PER_SECOND
+            return stats
+
+    def cumulative_buckets(self):
+        """(ขอบบน ns หรือ None = +Inf, จำนวนสะสม), ผลรวม ns, จำนวน สำหรับ Prometheus"""
+        with self._lock:
+            buckets = list(self.buckets)
+            total_ns, count = self.sum_ns, self.count
+        cumulative = 0
+        result = []
+        for bound, bucket_count in zip(self.bounds + [None], buckets):
+            cumulative += bucket_count
+            result.append((bound, cumulative))
+        return result, total_ns, count
+
+
+class Span:
+    """ช่วงเวลาของขั้นตอนหนึ่ง (path = ชื่อของ span แม่/ชื่อของตัวเอง)"""
+
+    __slots__ = ('name', 'path', 'parent', 'start_ns', 'duration_ns')
+
+    def __init__(self, name: str, parent: Optional['Span'] = None):
+        self.name = name
+        self.parent = parent
+        self.path = f'{parent.path}/{name}' if parent is not None else name
+        self.start_ns = 0
+        self.duration_ns = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """เวลาที่ใช้ (วินาที) หลัง span จบ"""
+        return self.duration_ns / NS_PER_SECOND if self.duration_ns is not None else None
+
+
+# span ที่กำลังทำงานของ thread/context ปัจจุบัน (ContextVar แยกค่าตาม thread และ asyncio task)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+def current_span() -> Optional[Span]:
+    """span ที่กำลังทำงานอยู่ใน context ปัจจุบัน"""
+    return _current_span.get()
+
+
+class _SpanContext:
+    """context manager ของ span (class แทน generator เพื่อลด overhead)"""
+
+    __slots__ = ('tracker', 'span', 'token')
+
+    def __init__(self, tracker: 'PerformanceTracker', name: str):
+        self.tracker = tracker
+        self.span = Span(name, _current_span.get())
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        self.span.start_ns = time.perf_counter_ns()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.duration_ns = time.perf_counter_ns() - span.start_ns
+        _current_span.reset(self.token)
+        self.tracker.observe(span.path, span.duration_ns, root=span.parent is None)
+        return False
+
+
+class _DisabledSpan:
+    """span ที่ไม่บันทึก (เมื่อปิดการวัด) แต่ยังวัดเวลาให้ผู้เรียกใช้ได้"""
+
+    __slots__ = ('span',)
+
+    def __init__(self, name: str):
+        self.span = Span(name)
+
+    def __enter__(self) -> Span:
+        self.span.start_ns = time.perf_counter_ns()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.duration_ns = time.perf_counter_ns() - self.span.start_ns
+        return False
+
+
+class SystemMetricsSampler:
+    """
+    วัดเมตริกซ์ระบบแบบสุ่มตามช่วงเวลา (ไม่เกินหนึ่งครั้งต่อ interval วินาที)
+    ไม่มี thread เบื้องหลัง จึงปลอดภัยกับการ fork และไม่เสียเวลาเมื่อไม่มีงาน
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, history: int = DEFAULT_SAMPLE_HISTORY):
+        """
+        Args:
+            interval: ช่วงเวลาขั้นต่ำระหว่างการวัด (วินาที)
+            history: จำนวนค่าที่เก็บไว้สำหรับค่าเฉลี่ย/สูงสุด
+        """
+        self.interval = interval
+        self.samples = deque(maxlen=history)
+        self.total_samples = 0
+        self._next_sample = 0.0
+        self._lock = threading.Lock()
+        self._process = None
+        self._pid = None
+
+    def maybe_sample(self):
+        """วัดถ้าครบช่วงเวลาแล้ว (เรียกได้บ่อย: ส่วนใหญ่เป็นแค่การเทียบเวลา)"""
+        if time.monotonic() >= self._next_sample:
+            self.sample()
+
+    def sample(self) -> Dict[str, float]:
+        """วัดเมตริกซ์ระบบทันที"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # process ใหม่หลัง fork: ใช้ psutil.Process ของตัวเอง
+                self._pid = os.getpid()
+                self._process = psutil.Process(self._pid)
+                self._process.cpu_percent(None)
+            memory = psutil.virtual_memory()
+            process_memory = self._process.memory_info()
+            sample = {
+                'timestamp': time.time(),
+                'cpu_percent': psutil.cpu_percent(None),  # เทียบกับการวัดครั้งก่อน ไม่ต้องรอ
+                'memory_percent': memory.percent,
+                'memory_available': memory.available,
+                'process_cpu_percent': self._process.cpu_percent(None),
+                'process_rss': process_memory.rss,
+                'process_threads': self._process.num_threads()
+            }
+            self.samples.append(sample)
+            self.total_samples += 1
+            self._next_sample = time.monotonic() + self.interval
+            return sample
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ค่าล่าสุด ค่าเฉลี่ย และค่าสูงสุดของช่วงที่เก็บไว้"""
+        self.maybe_sample()
+        with self._lock:
+            samples = list(self.samples)
+        latest = samples[-1]
+        return {
+            'latest': latest,
+            'average_cpu_percent': sum(s['cpu_percent'] for s in samples) / len(samples),
+            'max_cpu_percent': max(s['cpu_percent'] for s in samples),
+            'average_memory_percent': sum(s['memory_percent'] for s in samples) / len(samples),
+            'max_process_rss': max(s['process_rss'] for s in samples),
+            'samples': len(samples),
+            'total_samples': self.total_samples,
+            'interval': self.interval
+        }
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self._next_sample = 0.0
+
+
+class PerformanceTracker:
+    """
+    ตัวติดตามประสิทธิภาพ
+    - span(name): วัดเวลาขั้นตอนด้วย perf_counter_ns ซ้อนกันได้ (key = path เช่น analyze_text/preprocess_text)
+    - record_timing(name, seconds): บันทึกเวลาที่วัดเอง
+    - histogram ต่อขั้นตอน (p50/p95/p99) และเมตริกซ์ระบบที่สุ่มวัดเมื่อ span ระดับบนสุดจบ
+    ทุกเมธอดเรียกพร้อมกันหลาย thread ได้ (ไม่มีเวลาเริ่มต้นร่วมกัน)
+    """
+
+    def __init__(self, enabled: bool = True, sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            enabled: False = span ไม่บันทึกอะไร (ยังวัดเวลาให้ผู้เรียก)
+            sample_interval: ช่วงเวลาขั้นต่ำระหว่างการวัดเมตริกซ์ระบบ (วินาที)
+        """
+        self.enabled = enabled
+        self.system = SystemMetricsSampler(interval=sample_interval)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._starts = threading.local()
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def observe(self, name: str, duration_ns: int, root: bool = True):
+        """บันทึกเวลา (ns) ของขั้นตอน"""
+        self._histogram(name).observe(duration_ns)
+        if root:
+            self.system.maybe_sample()
+
+    def span(self, name: str, enabled: bool = True):
+        """
+        context manager วัดเวลาขั้นตอน
+
+        Example:
+            with tracker.span('analyze_text') as span:
+                ...
+            span.duration  # วินาที
+        """
+        if not (enabled and self.enabled):
+            return _DisabledSpan(name)
+        return _SpanContext(self, name)
+
+    def timed(self, name: str = None) -> Callable:
+        """decorator วัดเวลาของฟังก์ชันด้วย span"""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_timing(self, operation_name: str, duration: float):
+        """บันทึกเวลาที่วัดเอง (วินาที)"""
+        if self.enabled:
+            self.observe(operation_name, int(duration * NS_PER_SECOND))
+
+    def start_timing(self, operation_name: str):
+        """เริ่มต้นการวัดเวลา (แยกตาม thread และชื่อการดำเนินการ)"""
+        starts = getattr(self._starts, 'values', None)
+        if starts is None:
+            starts = self._starts.values = {}
+        starts[operation_name] = time.perf_counter_ns()
+
+    def end_timing(self, operation_name: str) -> Optional[float]:
+        """สิ้นสุดการวัดเวลาที่เริ่มด้วย start_timing ใน thread เดียวกัน"""
+        start_ns = getattr(self._starts, 'values', {}).pop(operation_name, None)
+        if start_ns is None:
+            return None
+        duration_ns = time.perf_counter_ns() - start_ns
+        if self.enabled:
+            self.observe(operation_name, duration_ns)
+        return duration_ns / NS_PER_SECOND
+
+    def get_average_timing(self, operation_name: str) -> float:
+        """ดึงเวลาเฉลี่ยของการดำเนินการ"""
+        histogram = self._histograms.get(operation_name)
+        if histogram is None or not histogram.count:
+            return 0.0
+        return histogram.sum_ns / histogram.count / NS_PER_SECOND
+
+    def get_total_timing(self, operation_name: str) -> float:
+        """ดึงเวลารวมของการดำเนินการ"""
+        histogram = self._histograms.get(operation_name)
+        return histogram.sum_ns / NS_PER_SECOND if histogram is not None else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ดึงสถิติประสิทธิภาพ (รวม p50/p95/p99 ต่อขั้นตอน)"""
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {
+            'total_operations': len(histograms),
+            'operation_stats': {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
+        }
+
+    def get_system_metrics(self) -> Dict[str, Any]:
+        """เมตริกซ์ระบบล่าสุด (วัดใหม่ถ้าค่าเก่ากว่า interval)"""
+        return self.system.snapshot()
+
+    def reset(self):
+        """ล้าง histogram และเมตริกซ์ระบบ"""
+        with self._lock:
+            self._histograms.clear()
+        self.system.reset()
+
+    def prometheus_text(self, extra_gauges: Dict[str, float] = None) -> str:
+        """
+        เมตริกซ์ทั้งหมดใน Prometheus text exposition format (version 0.0.4)
+
+        Args:
+            extra_gauges: gauge เพิ่มเติม {ชื่อ (ไม่มี prefix): ค่า}
+        """
+        name = f'{METRICS_PREFIX}_stage_duration_seconds'
+        lines = [
+            f'# HELP {name} Duration of instrumented stages (span path).',
+            f'# TYPE {name} histogram'
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        quantile_lines = []
+        for stage, histogram in histograms:
+            label = f'stage="{_escape_label(stage)}"'
+            buckets, total_ns, count = histogram.cumulative_buckets()
+            for bound, cumulative in buckets:
+                le = '+Inf' if bound is None else repr(bound / NS_PER_SECOND)
+                lines.append(f'{name}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}}} {total_ns / NS_PER_SECOND!r}')
+            lines.append(f'{name}_count{{{label}}} {count}')
+            for percent in DEFAULT_PERCENTILES:
+                value = histogram.percentile(percent) / NS_PER_SECOND
+                quantile_lines.append(f'{METRICS_PREFIX}_stage_duration_quantile_seconds'
+                                      f'{{{label},quantile="{percent / 100}"}} {value!r}')
+
+        quantile_name = f'{METRICS_PREFIX}_stage_duration_quantile_seconds'
+        lines.append(f'# HELP {quantile_name} Estimated latency quantiles from the stage histogram.')
+        lines.append(f'# TYPE {quantile_name} gauge')
+        lines.extend(quantile_lines)
+
+        latest = self.system.snapshot()['latest']
+        gauges = {
+            'system_cpu_percent': latest['cpu_percent'],
+            'system_memory_percent': latest['memory_percent'],
+            'system_memory_available_bytes': latest['memory_available'],
+            'process_cpu_percent': latest['process_cpu_percent'],
+            'process_resident_memory_bytes': latest['process_rss'],
+            'process_threads': latest['process_threads']
+        }
+        gauges.update(extra_gauges or {})
+        for gauge, value in gauges.items():
+            lines.append(f'# TYPE {METRICS_PREFIX}_{gauge} gauge')
+            lines.append(f'{METRICS_PREFIX}_{gauge} {value!r}')
+        lines.append(f'# TYPE {METRICS_PREFIX}_system_samples_total counter')
+        lines.append(f'{METRICS_PREFIX}_system_samples_total {self.system.total_samples}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
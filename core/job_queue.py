@@ -0,0 +1,221 @@
+"""
+Background job queue
+คิวงานเบื้องหลังภายใน process สำหรับงานที่ใช้เวลานาน (เช่น อัปโหลด PDF และ OCR)
+ผู้เรียกได้ job id ทันที แล้วติดตามความคืบหน้าทีละขั้นตอนด้วยการ poll หรือ SSE
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .performance_utils import ProgressTracker
+
+# สถานะของงาน
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+# จำนวนงานที่เสร็จแล้วที่เก็บผลไว้ให้ดึงได้
+DEFAULT_MAX_FINISHED_JOBS = 100
+
+
+class Job:
+    """งานหนึ่งชิ้นพร้อมสถานะและความคืบหน้าทีละขั้นตอน"""
+    
+    def __init__(self, stages: List[str], description: str = "Job"):
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.stages = list(stages)
+        self.status = JOB_QUEUED
+        self.current_stage = None
+        self.stage_times: Dict[str, float] = {}
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.version = 0  # เพิ่มขึ้นทุกครั้งที่สถานะเปลี่ยน (ใช้กับ SSE)
+        self.progress = {'progress_percent': 0.0, 'elapsed_time': 0.0, 'remaining_time': 0.0}
+        self._tracker = ProgressTracker(len(self.stages), description, verbose=False)
+        self._stage_started = None
+        self._changed = threading.Condition()
+    
+    def _notify(self):
+        """แจ้งผู้ที่รอการเปลี่ยนแปลง (ต้องเรียกขณะถือ self._changed)"""
+        self.version += 1
+        self._changed.notify_all()
+    
+    def start_stage(self, stage: str, message: str = ""):
+        """เริ่มขั้นตอนใหม่ (ปิดขั้นตอนก่อนหน้าโดยอัตโนมัติ)"""
+        with self._changed:
+            self._close_stage()
+            self.status = JOB_RUNNING
+            self.current_stage = stage
+            self.message = message
+            self._stage_started = time.time()
+            self._notify()
+    
+    def set_message(self, message: str):
+        """อัปเดตข้อความความคืบหน้าภายในขั้นตอนปัจจุบัน (เช่น "12/40 ไฟล์")"""
+        with self._changed:
+            self.message = message
+            self._notify()
+    
+    def _close_stage(self):
+        """บันทึกเวลาของขั้นตอนปัจจุบันและอัปเดตความคืบหน้า"""
+        if self.current_stage is None or self.current_stage in self.stage_times:
+            return
+        self.stage_times[self.current_stage] = time.time() - self._stage_started
+        info = self._tracker.update(1, self.current_stage)
+        self.progress = {
+            'progress_percent': round(info['progress_percent'], 1),
+            'elapsed_time': round(info['elapsed_time'], 3),
+            'remaining_time': round(info['remaining_time'], 3)
+        }
+    
+    def finish(self, result: Any):
+        """บันทึกผลลัพธ์เมื่องานสำเร็จ"""
+        with self._changed:
+            self._close_stage()
+            self.status = JOB_DONE
+            self.result = result
+            self.current_stage = None
+            self.finished_at = time.time()
+            self.progress['progress_percent'] = 100.0
+            self.progress['remaining_time'] = 0.0
+            self._notify()
+    
+    def fail(self, error: str):
+        """บันทึกข้อผิดพลาดเมื่องานล้มเหลว"""
+        with self._changed:
+            self.status = JOB_FAILED
+            self.error = error
+            self.finished_at = time.time()
+            self._notify()
+    
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+    
+    def wait_for_change(self, version: int, timeout: float = None) -> int:
+        """รอจนกว่า version จะเปลี่ยนจากค่าที่ระบุ (หรือหมดเวลา) คืนค่า version ล่าสุด"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version or self.is_finished, timeout)
+            return self.version
+    
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """แปลงเป็น dict สำหรับส่งผ่าน API"""
+        with self._changed:
+            data = {
+                'job_id': self.id,
+                'status': self.status,
+                'stage': self.current_stage,
+                'stages': self.stages,
+                'completed_stages': list(self.stage_times),
+                'stage_times': {k: round(v, 3) for k, v in self.stage_times.items()},
+                'message': self.message,
+                'progress': dict(self.progress),
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+                'version': self.version
+            }
+            if self.status == JOB_FAILED:
+                data['error'] = self.error
+            if include_result and self.status == JOB_DONE:
+                data['result'] = self.result
+            return data
+
+
+class JobQueue:
+    """
+    คิวงานแบบ in-process ใช้ thread pool ขนาดจำกัด
+    เก็บผลของงานที่เสร็จแล้วไว้จำนวนจำกัด (งานเก่าสุดจะถูกลบก่อน)
+    """
+    
+    def __init__(self, max_workers: int = 2, max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS):
+        """
+        Args:
+            max_workers: จำนวนงานที่ทำพร้อมกันได้
+            max_finished_jobs: จำนวนงานที่เสร็จแล้วที่เก็บผลไว้
+        """
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def submit(self, func: Callable, *args, stages: List[str], description: str = "Job", **kwargs) -> Job:
+        """
+        ส่งงานเข้าคิว func จะถูกเรียกเป็น func(job, *args, **kwargs)
+        และควรเรียก job.start_stage() เมื่อเริ่มแต่ละขั้นตอน ค่าที่ return จะเป็นผลลัพธ์ของงาน
+        
+        Returns:
+            Job: งานที่สร้างขึ้น (ใช้ job.id อ้างอิงภายหลัง)
+        """
+        job = Job(stages, description)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+    
+    def run_inline(self, func: Callable, *args, stages: List[str], description: str = "Job", **kwargs) -> Job:
+        """ทำงานใน thread ปัจจุบัน (สำหรับผู้เรียกที่ต้องการผลลัพธ์ทันที)"""
+        job = Job(stages, description)
+        self._run(job, func, args, kwargs)
+        return job
+    
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict):
+        """รันงานและบันทึกผลลัพธ์หรือข้อผิดพลาด"""
+        try:
+            job.finish(func(job, *args, **kwargs))
+        except Exception as e:
+            job.fail(str(e))
+    
+    def _prune(self):
+        """ลบงานที่เสร็จแล้วที่เก่าที่สุดเมื่อเกินจำนวนที่กำหนด (ต้องถือ self._lock)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """ดึงงานตาม id (คืนค่า None ถ้าไม่พบหรือถูกลบแล้ว)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def iter_updates(self, job: Job, heartbeat: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        สร้างลำดับสถานะของงานทุกครั้งที่เปลี่ยน จนกว่างานจะเสร็จ (สำหรับ SSE)
+        คืนค่า None เมื่อไม่มีการเปลี่ยนแปลงภายใน heartbeat วินาที
+        """
+        version = -1
+        while True:
+            latest = job.wait_for_change(version, timeout=heartbeat)
+            if latest == version and not job.is_finished:
+                yield None
+                continue
+            version = latest
+            yield job.to_dict()
+            if job.is_finished:
+                return
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติของคิว"""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'max_workers': self.max_workers,
+            'jobs': len(statuses),
+            'queued': statuses.count(JOB_QUEUED),
+            'running': statuses.count(JOB_RUNNING),
+            'done': statuses.count(JOB_DONE),
+            'failed': statuses.count(JOB_FAILED)
+        }
+    
+    def shutdown(self, wait: bool = True):
+        """ปิด thread pool"""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,129 @@
+"""
+Keyword Automaton for multi-pattern matching
+โครงสร้างข้อมูลสำหรับค้นหาคำสำคัญหลายคำพร้อมกัน (Aho-Corasick + reverse substring index)
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class AhoCorasickAutomaton:
+    """
+    Automaton แบบ Aho-Corasick สำหรับค้นหาว่ามีคำสำคัญใดบ้างอยู่ในข้อความ
+    สร้างครั้งเดียว แล้วค้นหาได้ในเวลา O(ความยาวข้อความ + จำนวนที่พบ)
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        # state 0 คือ root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        self._compiled = False
+
+        for pattern in patterns:
+            self.add(pattern)
+        self.compile()
+
+    def add(self, pattern: str):
+        """เพิ่มคำสำคัญลงใน trie (ต้องเรียก compile() ใหม่หลังเพิ่ม)"""
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+
+        if pattern not in self._output[state]:
+            self._output[state] = self._output[state] + (pattern,)
+        self._compiled = False
+
+    def compile(self):
+        """สร้าง failure links และรวม output ตามแนวกว้าง (BFS)"""
+        queue = deque()
+        for next_state in self._goto[0].values():
+            self._fail[next_state] = 0
+            queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                inherited = self._output[self._fail[next_state]]
+                if inherited:
+                    self._output[next_state] = self._output[next_state] + inherited
+
+        self._compiled = True
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        ค้นหาคำสำคัญทั้งหมดที่ปรากฏใน text
+
+        Args:
+            text: ข้อความที่ต้องการค้นหา
+
+        Returns:
+            เซตของคำสำคัญที่พบ (ไม่ซ้ำ)
+        """
+        if not self._compiled:
+            self.compile()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+    def __len__(self) -> int:
+        """จำนวน state ทั้งหมดใน automaton"""
+        return len(self._goto)
+
+
+class SubstringIndex:
+    """
+    ดัชนีย้อนกลับสำหรับกรณี "คำที่ตรวจสอบอยู่ในคำสำคัญ"
+    เก็บทุก substring (ความยาวตั้งแต่ min_length) ของคำสำคัญ -> คำสำคัญที่มี substring นั้น
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), min_length: int = 3):
+        self.min_length = min_length
+        self._index: Dict[str, Set[str]] = {}
+
+        for keyword in keywords:
+            self.add(keyword)
+
+    def add(self, keyword: str):
+        """เพิ่มคำสำคัญลงในดัชนี"""
+        length = len(keyword)
+        for start in range(length):
+            for end in range(start + self.min_length, length + 1):
+                self._index.setdefault(keyword[start:end], set()).add(keyword)
+
+    def containing(self, word: str) -> Set[str]:
+        """ดึงคำสำคัญทั้งหมดที่มี word เป็นส่วนหนึ่ง"""
+        return self._index.get(word, set())
+
+    def __len__(self) -> int:
+        return len(self._index)
@@ -0,0 +1,62 @@
+"""
+Lazy component registry
+สร้าง component ที่ใช้เวลาโหลดนาน (โมเดล NLP, ฐานข้อมูล, PDF processor) เมื่อเข้าถึงครั้งแรก
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+
+class LazyComponents(dict):
+    """
+    dict ที่สร้างค่าจาก factory เมื่อเข้าถึงครั้งแรก (thread-safe)
+    ใช้แทน dict ธรรมดาได้ทันที: components['detector'] จะสร้าง detector ถ้ายังไม่มี
+    การกำหนดค่าใหม่ (components['detector'] = ...) จะแทนที่ค่าเดิมตามปกติ
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]] = None, **values):
+        """
+        Args:
+            factories: ชื่อ component -> ฟังก์ชันที่สร้าง component (ไม่มี argument)
+            values: ค่าที่กำหนดไว้ล่วงหน้า (ไม่ต้องสร้าง)
+        """
+        super().__init__(**values)
+        self._factories = dict(factories or {})
+        self._lock = threading.RLock()  # RLock: factory อาจเข้าถึง component อื่น
+
+    def __missing__(self, key):
+        factory = self._factories.get(key)
+        if factory is None:
+            raise KeyError(key)
+        with self._lock:
+            if not dict.__contains__(self, key):
+                dict.__setitem__(self, key, factory())
+            return dict.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or key in self._factories
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def is_built(self, key) -> bool:
+        """ตรวจสอบว่า component ถูกสร้างแล้วหรือยัง"""
+        return dict.__contains__(self, key)
+
+    def build_all(self, names: Iterable[str] = None) -> Dict[str, float]:
+        """
+        สร้าง component ทั้งหมด (หรือเฉพาะที่ระบุ) ทันที
+
+        Returns:
+            Dict[str, float]: เวลาที่ใช้สร้างแต่ละ component (วินาที, 0 ถ้าสร้างไว้แล้ว)
+        """
+        timings = {}
+        for name in (names if names is not None else list(self._factories)):
+            start = time.perf_counter()
+            self[name]
+            timings[name] = time.perf_counter() - start
+        return timings
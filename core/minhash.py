@@ -0,0 +1,168 @@
+"""
+MinHash signatures and LSH band buckets
+ลายเซ็น MinHash จาก shingle ของ token (ลำดับคำติดกัน k คำ) สำหรับหาเอกสารที่เกือบซ้ำกัน
+เช่น คำอภิปรายเดียวกันที่อัปโหลดจาก PDF คนละรุ่น
+LSH แบ่งลายเซ็นเป็น band แล้ว hash แต่ละ band เป็น bucket เอกสารที่มี bucket ร่วมกันอย่างน้อยหนึ่งตัว
+คือผู้สมัครที่ต้องตรวจ จึงไม่ต้องเทียบกับเอกสารทุกฉบับ
+"""
+
+import hashlib
+import zlib
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+# 32 band × 4 แถว: เอกสารที่คล้ายกันราว 0.42 ขึ้นไปมีโอกาสเป็นผู้สมัครอย่างน้อยครึ่งหนึ่ง (ดู lsh_threshold)
+DEFAULT_BANDS = 32
+
+# hash ของ permutation: (a * x + b) mod p บน Mersenne prime (x, a, b < 2^32 จึงไม่ล้น uint64)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# ตัวคูณของ polynomial hash ที่รวม hash ของ token ใน shingle (FNV-1a 64-bit prime)
+_SHINGLE_MULTIPLIER = np.uint64(0x100000001B3)
+
+# จำนวน shingle ที่คำนวณ permutation พร้อมกัน (จำกัดหน่วยความจำชั่วคราว shingle × num_perm)
+_BLOCK_SIZE = 4096
+
+
+class MinHasher:
+    """สร้างลายเซ็น MinHash (uint32 × num_perm) จากรายการ token ค่าคงที่ข้าม process (ไม่ใช้ hash() ของ Python)"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 seed: int = 1):
+        """
+        Args:
+            num_perm: จำนวน hash function (ความยาวลายเซ็น)
+            shingle_size: จำนวน token ต่อ shingle
+            seed: seed ของพารามิเตอร์ hash (ลายเซ็นเทียบกันได้เฉพาะเมื่อใช้ค่าเดียวกัน)
+        """
+        if num_perm < 1 or shingle_size < 1:
+            raise ValueError('num_perm และ shingle_size ต้องมากกว่า 0')
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    @staticmethod
+    def token_hashes(tokens: Iterable[str]) -> np.ndarray:
+        """hash 32-bit ของแต่ละ token (CRC32 ของ UTF-8)"""
+        crc32 = zlib.crc32
+        return np.fromiter((crc32(token.encode('utf-8', 'surrogatepass')) for token in tokens), dtype=np.uint64)
+
+    def shingle_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        hash 32-bit ของ shingle ทุกตำแหน่ง (ไม่ซ้ำกัน) จาก hash ของ token
+        เอกสารที่สั้นกว่าหนึ่ง shingle ใช้ token ทั้งหมดเป็น shingle เดียว
+        """
+        count = len(hashes) - self.shingle_size + 1
+        if count <= 0:
+            if not len(hashes):
+                return np.zeros(0, dtype=np.uint64)
+            count = 1
+            hashes = np.concatenate((hashes, np.zeros(self.shingle_size - len(hashes), dtype=np.uint64)))
+        combined = np.zeros(count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for offset in range(self.shingle_size):
+                combined = combined * _SHINGLE_MULTIPLIER + hashes[offset:offset + count]
+        return np.unique((combined ^ (combined >> np.uint64(32))) & _MAX_HASH)
+
+    def empty_signature(self) -> np.ndarray:
+        """ลายเซ็นเริ่มต้น (ค่าสูงสุด) สำหรับรวมทีละส่วนด้วย update()"""
+        return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+
+    def update(self, signature: np.ndarray, shingles: np.ndarray) -> np.ndarray:
+        """รวม shingle เข้ากับลายเซ็น (ค่าต่ำสุดของแต่ละ permutation) แก้ไข signature โดยตรง"""
+        for start in range(0, len(shingles), _BLOCK_SIZE):
+            block = shingles[start:start + _BLOCK_SIZE, np.newaxis]
+            values = (block * self._a + self._b) % _MERSENNE_PRIME & _MAX_HASH
+            np.minimum(signature, values.min(axis=0), out=signature)
+        return signature
+
+    def signature(self, tokens: Iterable[str]) -> Optional[np.ndarray]:
+        """
+        ลายเซ็นของเอกสาร
+
+        Returns:
+            Optional[np.ndarray]: uint32 × num_perm (None ถ้าไม่มี token)
+        """
+        return self.signature_from_hashes(self.token_hashes(tokens))
+
+    def signature_from_hashes(self, token_hashes: np.ndarray) -> Optional[np.ndarray]:
+        """ลายเซ็นจาก hash ของ token (ใช้ hash ร่วมกับ winnowing fingerprint ได้โดยไม่ต้อง hash ซ้ำ)"""
+        builder = MinHashBuilder(self)
+        builder.add_hashes(token_hashes)
+        return builder.finish()
+
+
+class MinHashBuilder:
+    """สร้างลายเซ็นจาก token ที่มาทีละช่วง (streaming) โดย shingle ต่อเนื่องข้ามรอยต่อของช่วง"""
+
+    def __init__(self, hasher: MinHasher):
+        self.hasher = hasher
+        self._signature = hasher.empty_signature()
+        self._tail = np.zeros(0, dtype=np.uint64)
+        self._shingles = 0
+
+    def add(self, tokens: Iterable[str]):
+        """เพิ่ม token ช่วงถัดไป"""
+        self.add_hashes(self.hasher.token_hashes(tokens))
+
+    def add_hashes(self, token_hashes: np.ndarray):
+        """เพิ่ม hash ของ token ช่วงถัดไป (จาก MinHasher.token_hashes)"""
+        hasher = self.hasher
+        hashes = np.concatenate((self._tail, token_hashes))
+        if len(hashes) >= hasher.shingle_size:
+            shingles = hasher.shingle_hashes(hashes)
+            hasher.update(self._signature, shingles)
+            self._shingles += len(shingles)
+            hashes = hashes[len(hashes) - hasher.shingle_size + 1:]
+        self._tail = hashes
+
+    def finish(self) -> Optional[np.ndarray]:
+        """ลายเซ็น uint32 (None ถ้าไม่มี token)"""
+        if not self._shingles:
+            if not len(self._tail):
+                return None
+            self.hasher.update(self._signature, self.hasher.shingle_hashes(self._tail))
+        return self._signature.astype(np.uint32)
+
+
+def estimate_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """ค่าประมาณ Jaccard similarity ของ shingle = สัดส่วนตำแหน่งของลายเซ็นที่เท่ากัน"""
+    if len(first) != len(second) or not len(first):
+        return 0.0
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+def lsh_buckets(signature: np.ndarray, bands: int = DEFAULT_BANDS) -> List[int]:
+    """
+    bucket ของแต่ละ band (signed 64-bit สำหรับคอลัมน์ BIGINT)
+    รวมหมายเลข band และความยาวลายเซ็นใน hash: band ต่างกันหรือพารามิเตอร์ต่างกันไม่ชนกัน
+
+    Args:
+        signature: ลายเซ็น uint32
+        bands: จำนวน band (ต้องหารความยาวลายเซ็นลงตัว)
+
+    Returns:
+        List[int]: bucket หนึ่งตัวต่อ band
+    """
+    rows, remainder = divmod(len(signature), bands)
+    if rows < 1 or remainder:
+        raise ValueError(f'ความยาวลายเซ็น {len(signature)} ต้องหารด้วยจำนวน band {bands} ลงตัว')
+    data = np.ascontiguousarray(signature, dtype=np.uint32).tobytes()
+    width = rows * 4
+    buckets = []
+    for band in range(bands):
+        digest = hashlib.blake2b(data[band * width:(band + 1) * width], digest_size=8,
+                                 person=f'{len(signature)}:{band}'.encode('ascii')).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def lsh_threshold(num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS) -> float:
+    """similarity ที่โอกาสเป็นผู้สมัครประมาณ 50%: (1 / bands) ^ (1 / rows)"""
+    return (1.0 / bands) ** (bands / num_perm)
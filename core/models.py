@@ -4,7 +4,7 @@ Database Models using SQLAlchemy ORM
 """
 
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, DateTime, ForeignKey, Table
+from sqlalchemy import create_engine, Column, Integer, BigInteger, String, Text, Float, DateTime, ForeignKey, LargeBinary, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -32,12 +32,17 @@ class AnalysisRecord(Base):
     text_content = Column(Text)  # เก็บ 1000 ตัวอักษรแรก
     total_words = Column(Integer, default=0)
     unique_words = Column(Integer, default=0)
+    minhash = Column(LargeBinary)  # ลายเซ็น MinHash (uint32 × num_perm) สำหรับหาเอกสารที่เกือบซ้ำกัน
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
     # Relationships
     word_frequencies = relationship('WordFrequency', back_populates='analysis', cascade='all, delete-orphan')
     categories = relationship('Category', back_populates='analysis', cascade='all, delete-orphan')
+    minhash_bands = relationship('MinHashBand', back_populates='analysis', cascade='all, delete-orphan')
+    # fingerprint มีหลายหมื่นแถวต่อเอกสาร: DatabaseManager.delete_analysis ลบด้วย DELETE เดียวก่อน (ไม่โหลดทีละแถว)
+    passage_fingerprints = relationship('PassageFingerprint', back_populates='analysis',
+                                        cascade='all, delete-orphan', passive_deletes=True)
     tags = relationship('Tag', secondary=analysis_tags_table, back_populates='analyses')
     
     def to_dict(self):
@@ -123,6 +128,31 @@ class CategoryWord(Base):
         }
 
 
+class MinHashBand(Base):
+    """bucket ของ LSH band (ดัชนีสำหรับหาเอกสารที่เกือบซ้ำกันโดยไม่ต้องเทียบทุกเอกสาร)"""
+    __tablename__ = 'minhash_bands'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    analysis_id = Column(Integer, ForeignKey('analysis_records.id', ondelete='CASCADE'), nullable=False)
+    bucket = Column(BigInteger, nullable=False, index=True)
+    
+    # Relationships
+    analysis = relationship('AnalysisRecord', back_populates='minhash_bands')
+
+
+class PassageFingerprint(Base):
+    """winnowing fingerprint ของเอกสาร (posting ตาม hash สำหรับหาช่วงข้อความที่ถูกนำมาใช้ซ้ำ)"""
+    __tablename__ = 'passage_fingerprints'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hash = Column(BigInteger, nullable=False, index=True)
+    analysis_id = Column(Integer, ForeignKey('analysis_records.id', ondelete='CASCADE'), nullable=False)
+    position = Column(Integer, nullable=False)  # ตำแหน่งคำเริ่มต้นของ k-gram ในเอกสาร
+    
+    # Relationships
+    analysis = relationship('AnalysisRecord', back_populates='passage_fingerprints')
+
+
 class Tag(Base):
     """Tags สำหรับจัดกลุ่ม"""
     __tablename__ = 'tags'
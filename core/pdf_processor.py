@@ -4,8 +4,11 @@ PDF Processor with OCR Support
 """
 
 import os
-from typing import Tuple, Optional
-import io
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Optional
 
 # PDF Processing Libraries
 try:
@@ -22,7 +25,7 @@ except ImportError:
 
 # OCR Libraries (for image-based PDFs)
 try:
-    from pdf2image import convert_from_path, convert_from_bytes
+    from pdf2image import convert_from_path, pdfinfo_from_path
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
@@ -35,11 +38,213 @@ except ImportError:
     PYTESSERACT_AVAILABLE = False
 
 
+# จำนวนหน้าต่องานหนึ่งชิ้นที่ส่งให้ worker process
+DEFAULT_PAGES_PER_TASK = 8
+
+# หน้าที่มี text layer น้อยกว่านี้ (ตัวอักษร) ถือว่าเป็นหน้าภาพ ต้องใช้ OCR
+MIN_TEXT_LAYER_CHARS = 20
+
+METHOD_PDFPLUMBER = "pdfplumber"
+METHOD_PYPDF2 = "PyPDF2"
+METHOD_OCR = "OCR (Tesseract)"
+
+# ค่าเริ่มต้นของ OCR (ปรับได้ผ่าน OCR_DPI / OCR_LANGUAGE ใน config)
+DEFAULT_OCR_DPI = 200
+DEFAULT_OCR_LANGUAGE = 'tha+eng'
+
+
+def _get_page_count(pdf_path: str) -> int:
+    """นับจำนวนหน้าของ PDF (คืนค่า 0 ถ้าไม่สามารถอ่านได้)"""
+    if PDFPLUMBER_AVAILABLE:
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                return len(pdf.pages)
+        except Exception as e:
+            print(f"pdfplumber error: {e}")
+    
+    if PYPDF2_AVAILABLE:
+        try:
+            with open(pdf_path, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+        except Exception as e:
+            print(f"PyPDF2 error: {e}")
+    
+    if PDF2IMAGE_AVAILABLE:
+        try:
+            return int(pdfinfo_from_path(pdf_path).get('Pages', 0))
+        except Exception as e:
+            print(f"pdfinfo error: {e}")
+    
+    return 0
+
+
+def _extract_text_layer(pdf_path: str, first_page: int, last_page: int,
+                        min_text_chars: int = 0) -> Tuple[List[str], List[float], List[str]]:
+    """
+    ดึง text layer ของหน้า first_page..last_page (เริ่มที่ 1) โดยเปิดไฟล์ครั้งเดียวต่อไลบรารี
+    หน้าที่ pdfplumber ได้ข้อความสั้นกว่า min_text_chars จะลองใหม่ด้วย PyPDF2 ก่อนส่งไป OCR
+    
+    Returns:
+        Tuple of (รายการข้อความต่อหน้า, เวลาต่อหน้า (วินาที), method ที่ใช้ต่อหน้า)
+    """
+    page_total = last_page - first_page + 1
+    texts, timings, methods = [""] * page_total, [0.0] * page_total, [""] * page_total
+    
+    if PDFPLUMBER_AVAILABLE:
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                for offset, page in enumerate(pdf.pages[first_page - 1:last_page]):
+                    start = time.perf_counter()
+                    texts[offset] = page.extract_text() or ""
+                    page.flush_cache()  # คืนหน่วยความจำของหน้าที่ประมวลผลแล้ว
+                    timings[offset] = time.perf_counter() - start
+                    methods[offset] = METHOD_PDFPLUMBER
+        except Exception as e:
+            print(f"pdfplumber error: {e}")
+    
+    retry = [
+        offset for offset, text in enumerate(texts)
+        if not methods[offset] or len(text.strip()) < max(min_text_chars, 1)
+    ]
+    if PYPDF2_AVAILABLE and retry:
+        try:
+            with open(pdf_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                for offset in retry:
+                    start = time.perf_counter()
+                    text = pdf_reader.pages[first_page - 1 + offset].extract_text() or ""
+                    timings[offset] += time.perf_counter() - start
+                    if len(text.strip()) > len(texts[offset].strip()):
+                        texts[offset], methods[offset] = text, METHOD_PYPDF2
+                    elif not methods[offset]:
+                        methods[offset] = METHOD_PYPDF2
+        except Exception as e:
+            print(f"PyPDF2 error: {e}")
+    
+    return texts, timings, methods
+
+
+def _ocr_page_run(pdf_path: str, first_page: int, last_page: int,
+                  dpi: int, language: str) -> List[Tuple[int, str, float]]:
+    """
+    OCR หน้าที่ต่อเนื่องกัน first_page..last_page
+    แปลงเป็นภาพ PNG ลงไฟล์ชั่วคราว (paths_only) ไม่เก็บภาพทั้งหมดไว้ในหน่วยความจำ
+    แล้วส่งไฟล์ให้ Tesseract ทีละหน้า ลบไฟล์ทันทีหลัง OCR
+    
+    Returns:
+        รายการ (เลขหน้า, ข้อความ, เวลา (วินาที) รวมส่วนแบ่งของเวลาแปลงภาพ)
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix='pdf_ocr_') as tmp_dir:
+        start = time.perf_counter()
+        image_paths = convert_from_path(
+            pdf_path, dpi=dpi, first_page=first_page, last_page=last_page,
+            output_folder=tmp_dir, fmt='png', paths_only=True
+        )
+        raster_share = (time.perf_counter() - start) / max(len(image_paths), 1)
+        
+        for offset, image_path in enumerate(image_paths):
+            start = time.perf_counter()
+            text = pytesseract.image_to_string(image_path, lang=language)
+            os.remove(image_path)
+            results.append((first_page + offset, text, raster_share + time.perf_counter() - start))
+    
+    return results
+
+
+def _consecutive_runs(page_numbers: List[int]) -> List[Tuple[int, int]]:
+    """รวมเลขหน้าที่ต่อเนื่องกันเป็นช่วง เช่น [1, 2, 3, 7, 8] -> [(1, 3), (7, 8)]"""
+    runs = []
+    for page_number in page_numbers:
+        if runs and runs[-1][1] == page_number - 1:
+            runs[-1] = (runs[-1][0], page_number)
+        else:
+            runs.append((page_number, page_number))
+    return runs
+
+
+def _init_pdf_worker():
+    """
+    ตั้งค่า worker process: จำกัด Tesseract ให้ใช้ 1 thread ต่อ process
+    เพราะความขนานมาจากจำนวน worker แล้ว (ป้องกัน oversubscription)
+    """
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+
+def _extract_page_range(pdf_path: str, first_page: int, last_page: int,
+                        settings: Dict) -> List[Dict]:
+    """
+    ดึงข้อความของช่วงหน้า (ทำงานใน worker process)
+    ตัดสินใจทีละหน้าว่าใช้ text layer ได้หรือต้อง OCR
+    
+    Args:
+        settings: {'use_ocr', 'force_ocr', 'min_text_chars', 'ocr_dpi', 'ocr_language'}
+    
+    Returns:
+        รายการ {'page': เลขหน้า, 'text': ข้อความ, 'method': วิธีที่ใช้, 'seconds': เวลาที่ใช้}
+    """
+    if settings['force_ocr']:
+        page_total = last_page - first_page + 1
+        texts, timings, methods = [""] * page_total, [0.0] * page_total, [""] * page_total
+    else:
+        texts, timings, methods = _extract_text_layer(
+            pdf_path, first_page, last_page, settings['min_text_chars']
+        )
+    
+    results = [
+        {'page': first_page + offset, 'text': text, 'method': method, 'seconds': seconds}
+        for offset, (text, method, seconds) in enumerate(zip(texts, methods, timings))
+    ]
+    
+    if not settings['use_ocr']:
+        return results
+    
+    # หน้าที่ text layer ใช้ไม่ได้ -> OCR เป็นช่วงต่อเนื่อง
+    ocr_pages = [
+        page['page'] for page in results
+        if len(page['text'].strip()) < settings['min_text_chars']
+    ]
+    for run_first, run_last in _consecutive_runs(ocr_pages):
+        try:
+            ocr_results = _ocr_page_run(
+                pdf_path, run_first, run_last, settings['ocr_dpi'], settings['ocr_language']
+            )
+        except Exception as e:
+            print(f"OCR error (หน้า {run_first}-{run_last}): {e}")
+            continue
+        
+        for page_number, ocr_text, seconds in ocr_results:
+            page = results[page_number - first_page]
+            page['seconds'] += seconds
+            if ocr_text.strip():
+                page['text'], page['method'] = ocr_text, METHOD_OCR
+    
+    return results
+
+
 class PDFProcessor:
     """ประมวลผลไฟล์ PDF และแปลงเป็น text"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = None,
+                 pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+                 min_text_chars: int = MIN_TEXT_LAYER_CHARS,
+                 ocr_dpi: int = DEFAULT_OCR_DPI,
+                 ocr_language: str = DEFAULT_OCR_LANGUAGE):
+        """
+        Args:
+            max_workers: จำนวน worker process สำหรับดึงข้อความและ OCR (ค่าเริ่มต้น = จำนวน CPU)
+            pages_per_task: จำนวนหน้าต่องานที่ส่งให้ worker หนึ่งครั้ง
+            min_text_chars: จำนวนตัวอักษรขั้นต่ำที่ถือว่า text layer ของหน้าใช้ได้
+            ocr_dpi: ความละเอียดในการแปลงหน้าเป็นภาพสำหรับ OCR
+            ocr_language: ภาษาของ Tesseract
+        """
         self.supported_methods = self._check_available_libraries()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.min_text_chars = min_text_chars
+        self.ocr_dpi = ocr_dpi
+        self.ocr_language = ocr_language
+        self._executor = None
     
     def _check_available_libraries(self) -> dict:
         """ตรวจสอบ libraries ที่สามารถใช้งานได้"""
@@ -49,12 +254,80 @@ class PDFProcessor:
             'ocr': PDF2IMAGE_AVAILABLE and PYTESSERACT_AVAILABLE
         }
     
-    def extract_text_from_pdf(self, pdf_path: str) -> Tuple[bool, str, str]:
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """สร้าง process pool เมื่อใช้งานครั้งแรก"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_pdf_worker
+            )
+        return self._executor
+    
+    def iter_pages(self, pdf_path: str, force_ocr: bool = False) -> Iterator[Dict]:
+        """
+        ดึงข้อความทีละหน้าตามลำดับ (generator) โดยแบ่งช่วงหน้าให้ process pool
+        แต่ละหน้าตัดสินใจเองว่าใช้ text layer หรือ OCR จึงรองรับ PDF ที่มีทั้งหน้าสแกนและหน้าดิจิทัล
+        หน้าที่ต้อง OCR จะถูกแปลงเป็นภาพทีละช่วงลงไฟล์ชั่วคราว จำนวน Tesseract ที่ทำงานพร้อมกัน
+        จึงถูกจำกัดด้วย max_workers
+        
+        Args:
+            pdf_path: path ของไฟล์ PDF
+            force_ocr: OCR ทุกหน้าโดยไม่ใช้ text layer
+            
+        Yields:
+            {'page': เลขหน้า, 'text': ข้อความ, 'method': วิธีที่ใช้, 'seconds': เวลาที่ใช้}
+        """
+        page_count = _get_page_count(pdf_path)
+        settings = {
+            'use_ocr': self.supported_methods['ocr'],
+            'force_ocr': force_ocr and self.supported_methods['ocr'],
+            'min_text_chars': self.min_text_chars,
+            'ocr_dpi': self.ocr_dpi,
+            'ocr_language': self.ocr_language
+        }
+        ranges = [
+            (first, min(first + self.pages_per_task - 1, page_count))
+            for first in range(1, page_count + 1, self.pages_per_task)
+        ]
+        
+        # ไฟล์เล็ก: ทำใน process ปัจจุบัน ไม่ต้องส่งงานข้าม process
+        if len(ranges) <= 1 or self.max_workers <= 1:
+            for first, last in ranges:
+                yield from _extract_page_range(pdf_path, first, last, settings)
+            return
+        
+        # ส่งงานล่วงหน้าไม่เกิน 2 เท่าของจำนวน worker เพื่อจำกัดหน่วยความจำ
+        executor = self._get_executor()
+        pending = deque()
+        range_iter = iter(ranges)
+        
+        for first, last in range_iter:
+            pending.append(executor.submit(_extract_page_range, pdf_path, first, last, settings))
+            if len(pending) >= self.max_workers * 2:
+                break
+        
+        while pending:
+            pages = pending.popleft().result()
+            next_range = next(range_iter, None)
+            if next_range is not None:
+                pending.append(executor.submit(
+                    _extract_page_range, pdf_path, next_range[0], next_range[1], settings
+                ))
+            yield from pages
+    
+    def iter_page_texts(self, pdf_path: str) -> Iterator[str]:
+        """ดึงเฉพาะข้อความทีละหน้า (เหมาะสำหรับส่งต่อให้ analyze_text_stream)"""
+        for page in self.iter_pages(pdf_path):
+            if page['text']:
+                yield page['text'] + "\n"
+    
+    def extract_text_from_pdf(self, pdf_path: str,
+                              page_stats: Optional[List[Dict]] = None) -> Tuple[bool, str, str]:
         """
-        แปลง PDF เป็น text โดยลองใช้หลายวิธี
+        แปลง PDF เป็น text โดยอ่านไฟล์รอบเดียว ตัดสินใจทีละหน้าว่าใช้ text layer หรือ OCR
         
         Args:
             pdf_path: path ของไฟล์ PDF
+            page_stats: ถ้าระบุ จะเพิ่ม {'page', 'method', 'seconds'} ของแต่ละหน้าลงในรายการนี้
             
         Returns:
             Tuple of (success, text, method_used)
@@ -63,74 +336,30 @@ class PDFProcessor:
         if not os.path.exists(pdf_path):
             return False, "", "ไม่พบไฟล์"
         
-        # ลองใช้ pdfplumber ก่อน (แม่นยำที่สุด)
-        if self.supported_methods['pdfplumber']:
-            success, text = self._extract_with_pdfplumber(pdf_path)
-            if success and text.strip():
-                return True, text, "pdfplumber"
-        
-        # ลองใช้ PyPDF2
-        if self.supported_methods['pypdf2']:
-            success, text = self._extract_with_pypdf2(pdf_path)
-            if success and text.strip():
-                return True, text, "PyPDF2"
+        page_texts = []
+        methods = []
+        try:
+            for page in self.iter_pages(pdf_path):
+                if page_stats is not None:
+                    page_stats.append({
+                        'page': page['page'],
+                        'method': page['method'],
+                        'seconds': round(page['seconds'], 4)
+                    })
+                if page['text']:
+                    page_texts.append(page['text'])
+                    if page['method'] and page['method'] not in methods:
+                        methods.append(page['method'])
+        except Exception as e:
+            print(f"PDF extraction error: {e}")
+            return False, "", f"เกิดข้อผิดพลาด: {str(e)}"
         
-        # ถ้าไม่สามารถดึง text ได้ ให้ลอง OCR
-        if self.supported_methods['ocr']:
-            success, text = self._extract_with_ocr(pdf_path)
-            if success and text.strip():
-                return True, text, "OCR (Tesseract)"
+        text = "".join(page_text + "\n" for page_text in page_texts)
+        if text.strip():
+            return True, text, " + ".join(methods)
         
         return False, "", "ไม่สามารถแปลง PDF ได้ กรุณาติดตั้ง libraries ที่จำเป็น"
     
-    def _extract_with_pdfplumber(self, pdf_path: str) -> Tuple[bool, str]:
-        """แปลง PDF ด้วย pdfplumber"""
-        try:
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return True, text
-        except Exception as e:
-            print(f"pdfplumber error: {e}")
-            return False, ""
-    
-    def _extract_with_pypdf2(self, pdf_path: str) -> Tuple[bool, str]:
-        """แปลง PDF ด้วย PyPDF2"""
-        try:
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return True, text
-        except Exception as e:
-            print(f"PyPDF2 error: {e}")
-            return False, ""
-    
-    def _extract_with_ocr(self, pdf_path: str) -> Tuple[bool, str]:
-        """แปลง PDF ด้วย OCR (สำหรับ PDF ที่เป็นภาพ)"""
-        try:
-            # แปลง PDF เป็นรูปภาพ
-            images = convert_from_path(pdf_path)
-            
-            text = ""
-            # ใช้ OCR กับแต่ละหน้า
-            for i, image in enumerate(images):
-                # ใช้ Tesseract OCR (รองรับภาษาไทย)
-                page_text = pytesseract.image_to_string(image, lang='tha+eng')
-                text += page_text + "\n"
-                print(f"OCR หน้า {i+1}/{len(images)} เสร็จสิ้น")
-            
-            return True, text
-        except Exception as e:
-            print(f"OCR error: {e}")
-            return False, ""
-    
     def extract_text_from_bytes(self, pdf_bytes: bytes) -> Tuple[bool, str, str]:
         """
         แปลง PDF จาก bytes เป็น text
@@ -141,52 +370,23 @@ class PDFProcessor:
         Returns:
             Tuple of (success, text, method_used)
         """
+        tmp_path = None
         try:
-            # ลอง pdfplumber ก่อน
-            if self.supported_methods['pdfplumber']:
-                try:
-                    text = ""
-                    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                        for page in pdf.pages:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n"
-                    if text.strip():
-                        return True, text, "pdfplumber"
-                except:
-                    pass
-            
-            # ลอง PyPDF2
-            if self.supported_methods['pypdf2']:
-                try:
-                    text = ""
-                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                    if text.strip():
-                        return True, text, "PyPDF2"
-                except:
-                    pass
+            # worker process ต้องเปิดไฟล์เองได้ จึงเขียนลงไฟล์ชั่วคราวก่อน
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+                tmp.write(pdf_bytes)
+                tmp_path = tmp.name
             
-            # ลอง OCR (สำหรับ PDF ที่เป็นภาพ)
-            if self.supported_methods['ocr']:
-                try:
-                    images = convert_from_bytes(pdf_bytes)
-                    text = ""
-                    for i, image in enumerate(images):
-                        page_text = pytesseract.image_to_string(image, lang='tha+eng')
-                        text += page_text + "\n"
-                    if text.strip():
-                        return True, text, "OCR (Tesseract)"
-                except:
-                    pass
-            
-            return False, "", "ไม่สามารถแปลง PDF ได้"
+            success, text, method = self.extract_text_from_pdf(tmp_path)
+            if not success:
+                return False, "", "ไม่สามารถแปลง PDF ได้"
+            return True, text, method
             
         except Exception as e:
             return False, "", f"เกิดข้อผิดพลาด: {str(e)}"
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
     def get_installation_instructions(self) -> dict:
         """คำแนะนำการติดตั้ง libraries"""
@@ -241,4 +441,9 @@ class PDFProcessor:
             return 'unknown'
         except:
             return 'unknown'
-
+    
+    def cleanup(self):
+        """ปิด process pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
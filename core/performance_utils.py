@@ -12,108 +12,469 @@ import hashlib
 import json
 import pickle
 import os
-from collections import defaultdict
+import sys
+import shutil
+import struct
+import tempfile
+import zlib
+from array import array
+from collections import defaultdict, OrderedDict
 import psutil
 import gc
 
+from .instrumentation import PerformanceTracker
 
-class PerformanceTracker:
-    """คลาสสำหรับติดตามประสิทธิภาพการประมวลผล"""
+
+# ค่าเริ่มต้นของ memory cache (จำกัดจำนวนรายการและขนาดโดยประมาณ)
+DEFAULT_MEMORY_CACHE_MAX_ENTRIES = 1024
+DEFAULT_MEMORY_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# ค่าเริ่มต้นของ disk cache
+DEFAULT_DISK_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1GB
+DISK_CACHE_GC_TARGET_RATIO = 0.9  # GC จะลบไฟล์จนเหลือ 90% ของงบประมาณ
+
+# เวอร์ชันของรูปแบบ cache (เปลี่ยนเมื่อรูปแบบข้อมูลหรือ key เปลี่ยน)
+CACHE_FORMAT_VERSION = 2
+
+
+def timing_decorator(operation_name: str = None):
+    """
+    Decorator สำหรับวัดเวลาการทำงานของฟังก์ชัน
+    บันทึกเป็น span ของ performance_tracker (histogram ต่อขั้นตอน) ไม่ print ทุกครั้งที่เรียก
+    """
+    def decorator(func):
+        name = operation_name or func.__name__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with performance_tracker.span(name):
+                return func(*args, **kwargs)
+        
+        return wrapper
+    return decorator
+
+
+def estimate_size(data: Any) -> int:
+    """
+    ประมาณขนาดหน่วยความจำของข้อมูล (bytes)
+    รองรับ str, list/tuple/set และ dict ที่ซ้อนกัน (เช่น รายการ (คำ, POS tag))
+    """
+    size = sys.getsizeof(data)
+    if isinstance(data, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in data)
+    elif isinstance(data, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in data.items())
+    return size
+
+
+class LRUMemoryCache:
+    """
+    Memory cache แบบ LRU ที่จำกัดทั้งจำนวนรายการและขนาดโดยประมาณ
+    รองรับ TTL แยกตาม key (หมดอายุแล้วจะถูกลบเมื่อมีการเข้าถึง)
+    """
     
-    def __init__(self):
-        self.timings = defaultdict(list)
-        self.memory_usage = defaultdict(list)
-        self.cpu_usage = defaultdict(list)
-        self.start_time = None
-        self.end_time = None
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_CACHE_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MEMORY_CACHE_MAX_BYTES,
+                 default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        
+        # key -> (data, size, expires_at)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.stats = defaultdict(int)
     
-    def start_timing(self, operation_name: str):
-        """เริ่มต้นการวัดเวลา"""
-        self.start_time = time.time()
-        self._record_system_metrics(operation_name, 'start')
+    def get(self, key: str) -> Optional[Any]:
+        """ดึงข้อมูล (และย้ายไปเป็นรายการที่ใช้ล่าสุด)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            data, _, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats['expirations'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            return data
     
-    def end_timing(self, operation_name: str):
-        """สิ้นสุดการวัดเวลา"""
-        if self.start_time is None:
-            return None
+    def set(self, key: str, data: Any, ttl: Optional[float] = None) -> bool:
+        """
+        เก็บข้อมูลใน memory cache
         
-        duration = time.time() - self.start_time
-        self.timings[operation_name].append(duration)
-        self._record_system_metrics(operation_name, 'end')
+        Args:
+            key: cache key
+            data: ข้อมูลที่ต้องการเก็บ
+            ttl: อายุของรายการ (วินาที) ถ้าไม่ระบุจะใช้ default_ttl
+            
+        Returns:
+            bool: True ถ้าเก็บสำเร็จ, False ถ้าข้อมูลใหญ่เกิน max_bytes
+        """
+        size = estimate_size(data)
+        if size > self.max_bytes:
+            self.stats['rejected'] += 1
+            return False
         
-        return duration
-    
-    def _record_system_metrics(self, operation_name: str, phase: str):
-        """บันทึกเมตริกซ์ระบบ"""
-        memory_percent = psutil.virtual_memory().percent
-        cpu_percent = psutil.cpu_percent()
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
         
-        self.memory_usage[f"{operation_name}_{phase}"].append(memory_percent)
-        self.cpu_usage[f"{operation_name}_{phase}"].append(cpu_percent)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = (data, size, expires_at)
+            self.current_bytes += size
+            self._evict()
+        
+        return True
+    
+    def _remove(self, key: str):
+        """ลบรายการและปรับขนาดที่ใช้"""
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
     
-    def get_average_timing(self, operation_name: str) -> float:
-        """ดึงเวลาเฉลี่ยของการดำเนินการ"""
-        if operation_name not in self.timings:
-            return 0.0
-        return sum(self.timings[operation_name]) / len(self.timings[operation_name])
+    def _evict(self):
+        """ลบรายการที่ใช้นานที่สุดจนกว่าจะอยู่ในขีดจำกัด"""
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 self.current_bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats['evictions'] += 1
     
-    def get_total_timing(self, operation_name: str) -> float:
-        """ดึงเวลารวมของการดำเนินการ"""
-        if operation_name not in self.timings:
-            return 0.0
-        return sum(self.timings[operation_name])
+    def clear(self):
+        """ล้างข้อมูลทั้งหมด"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
     
     def get_stats(self) -> Dict[str, Any]:
-        """ดึงสถิติประสิทธิภาพ"""
-        stats = {
-            'total_operations': len(self.timings),
-            'operation_stats': {}
+        """ดึงสถิติการใช้หน่วยความจำและการ evict"""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes_used': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.stats['evictions'],
+            'expirations': self.stats['expirations'],
+            'rejected': self.stats['rejected']
         }
+
+
+def make_cache_key(namespace: str, text: str, *parts: Any) -> str:
+    """
+    สร้าง cache key ที่คงที่ข้ามการรีสตาร์ท (ไม่ใช้ hash() ของ Python ที่มีการสุ่ม salt)
+    
+    Args:
+        namespace: ชื่อกลุ่มของ cache เช่น 'preprocess', 'tokenize'
+        text: ข้อความที่ใช้เป็นเนื้อหาของ key
+        *parts: ข้อมูลประกอบอื่นๆ เช่น engine, เวอร์ชันของ library
         
-        for operation, times in self.timings.items():
-            stats['operation_stats'][operation] = {
-                'count': len(times),
-                'total_time': sum(times),
-                'average_time': sum(times) / len(times),
-                'min_time': min(times),
-                'max_time': max(times)
-            }
+    Returns:
+        str: key ในรูปแบบ '<namespace>_<blake2b hex>'
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(f"v{CACHE_FORMAT_VERSION}".encode('utf-8'))
+    for part in parts:
+        hasher.update(b'\x1f')
+        hasher.update(str(part).encode('utf-8'))
+    hasher.update(b'\x1e')
+    hasher.update(text.encode('utf-8', 'surrogatepass'))
+    return f"{namespace}_{hasher.hexdigest()}"
+
+
+# รูปแบบการ serialize ข้อมูลใน disk cache (byte แรกของไฟล์)
+_FORMAT_PICKLE = b'P'
+_FORMAT_STR = b'S'
+_FORMAT_TAGGED_TOKENS = b'T'
+
+
+def _is_tagged_tokens(data: Any) -> bool:
+    """ตรวจสอบว่าเป็นรายการ (คำ, POS tag) ที่ serialize แบบกระชับได้หรือไม่"""
+    if not isinstance(data, list) or not data:
+        return False
+    for item in data:
+        if not (isinstance(item, tuple) and len(item) == 2 and
+                isinstance(item[0], str) and isinstance(item[1], str) and
+                '\x00' not in item[0]):
+            return False
+    return True
+
+
+def encode_cache_value(data: Any) -> bytes:
+    """
+    แปลงข้อมูลเป็น bytes แบบกระชับสำหรับ disk cache
+    
+    - str: UTF-8 + zlib
+    - รายการ (คำ, POS tag): ตาราง tag + ลำดับ tag id (uint16) + คำคั่นด้วย NUL, บีบอัดด้วย zlib
+    - อื่นๆ: pickle
+    """
+    if isinstance(data, str):
+        return _FORMAT_STR + zlib.compress(data.encode('utf-8', 'surrogatepass'), 1)
+    
+    if _is_tagged_tokens(data):
+        tag_table = {}
+        tag_ids = array('H')
+        for _, tag in data:
+            tag_ids.append(tag_table.setdefault(tag, len(tag_table)))
         
-        return stats
+        if len(tag_table) <= 0xFFFF:
+            header = json.dumps(list(tag_table), ensure_ascii=False).encode('utf-8')
+            tokens = '\x00'.join(token for token, _ in data).encode('utf-8', 'surrogatepass')
+            if sys.byteorder != 'little':
+                tag_ids.byteswap()
+            payload = (struct.pack('<III', len(header), len(tokens), len(data)) +
+                       header + tokens + tag_ids.tobytes())
+            return _FORMAT_TAGGED_TOKENS + zlib.compress(payload, 1)
+    
+    return _FORMAT_PICKLE + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
 
 
-def timing_decorator(operation_name: str = None):
-    """Decorator สำหรับวัดเวลาการทำงานของฟังก์ชัน"""
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            name = operation_name or func.__name__
-            start_time = time.time()
+def decode_cache_value(raw: bytes) -> Any:
+    """แปลง bytes จาก encode_cache_value() กลับเป็นข้อมูล"""
+    kind, body = raw[:1], raw[1:]
+    
+    if kind == _FORMAT_STR:
+        return zlib.decompress(body).decode('utf-8', 'surrogatepass')
+    
+    if kind == _FORMAT_TAGGED_TOKENS:
+        payload = zlib.decompress(body)
+        header_len, tokens_len, count = struct.unpack_from('<III', payload)
+        offset = struct.calcsize('<III')
+        tag_table = json.loads(payload[offset:offset + header_len].decode('utf-8'))
+        offset += header_len
+        tokens = payload[offset:offset + tokens_len].decode('utf-8', 'surrogatepass').split('\x00')
+        offset += tokens_len
+        tag_ids = array('H')
+        tag_ids.frombytes(payload[offset:offset + count * tag_ids.itemsize])
+        if sys.byteorder != 'little':
+            tag_ids.byteswap()
+        return [(token, tag_table[tag_id]) for token, tag_id in zip(tokens, tag_ids)]
+    
+    if kind == _FORMAT_PICKLE:
+        return pickle.loads(body)
+    
+    raise ValueError(f"Unknown cache format: {kind!r}")
+
+
+class DiskCache:
+    """
+    Disk cache แบบ content-addressed แบ่งไฟล์เป็น shard ตาม prefix ของ hash
+    เขียนไฟล์แบบ atomic และจำกัดขนาดรวมด้วย GC เบื้องหลัง (ลบไฟล์ที่ใช้นานที่สุดก่อน)
+    """
+    
+    FILE_EXTENSION = '.bin'
+    
+    def __init__(self, cache_dir: str = "cache",
+                 max_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.stats = defaultdict(int)
+        
+        self._lock = threading.Lock()
+        self._gc_running = False
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        # คำนวณขนาดที่ใช้อยู่ในเบื้องหลัง (ไม่บล็อกการเริ่มต้น)
+        self._start_background(self._scan_usage)
+    
+    def _get_path(self, key: str) -> str:
+        """path ของไฟล์ cache: <cache_dir>/<2 ตัวอักษรแรกของ hash>/<key>.bin"""
+        digest = key.rsplit('_', 1)[-1]
+        if len(digest) < 2:
+            digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{key}{self.FILE_EXTENSION}")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """อ่านข้อมูลจากไฟล์ (คืนค่า None ถ้าไม่พบหรือไฟล์เสีย)"""
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+        
+        try:
+            data = decode_cache_value(raw)
+        except Exception:
+            self.stats['corrupt'] += 1
+            self._remove_file(path)
+            return None
+        
+        # อัปเดตเวลาเข้าถึง เพื่อให้ GC ลบไฟล์ที่ไม่ได้ใช้ก่อน
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        
+        return data
+    
+    def set(self, key: str, data: Any) -> bool:
+        """เขียนข้อมูลลงไฟล์แบบ atomic (เขียนไฟล์ชั่วคราวแล้ว rename)"""
+        path = self._get_path(key)
+        shard_dir = os.path.dirname(path)
+        
+        try:
+            raw = encode_cache_value(data)
+            os.makedirs(shard_dir, exist_ok=True)
+            
+            try:
+                previous_size = os.path.getsize(path)
+            except OSError:
+                previous_size = 0
             
+            fd, tmp_path = tempfile.mkstemp(dir=shard_dir, suffix='.tmp')
             try:
-                result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                print(f"⏱️ {name}: {duration:.3f} วินาที")
-                return result
-            except Exception as e:
-                duration = time.time() - start_time
-                print(f"❌ {name}: {duration:.3f} วินาที (เกิดข้อผิดพลาด)")
-                raise e
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(raw)
+                os.replace(tmp_path, path)
+            except Exception:
+                self._remove_file(tmp_path)
+                raise
+        except Exception:
+            self.stats['write_errors'] += 1
+            return False
         
-        return wrapper
-    return decorator
+        with self._lock:
+            self.current_bytes += len(raw) - previous_size
+            self.stats['writes'] += 1
+            over_budget = self.current_bytes > self.max_bytes
+        
+        if over_budget:
+            self._schedule_gc()
+        
+        return True
+    
+    def _remove_file(self, path: str) -> int:
+        """ลบไฟล์และคืนค่าขนาดที่ลบ"""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except OSError:
+            return 0
+    
+    def _iter_files(self):
+        """วนทุกไฟล์ cache: (path, size, mtime)"""
+        for root, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+    
+    def _scan_usage(self):
+        """คำนวณขนาดรวมของไฟล์ cache ทั้งหมด"""
+        total = sum(size for _, size, _ in self._iter_files())
+        with self._lock:
+            self.current_bytes = total
+            over_budget = total > self.max_bytes
+        if over_budget:
+            self._schedule_gc()
+    
+    def _start_background(self, target: Callable):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+    
+    def _schedule_gc(self):
+        """เริ่ม GC เบื้องหลัง (ทำงานได้ครั้งละหนึ่ง thread)"""
+        with self._lock:
+            if self._gc_running:
+                return
+            self._gc_running = True
+        self._start_background(self.collect_garbage)
+    
+    def collect_garbage(self) -> int:
+        """
+        ลบไฟล์ที่ใช้นานที่สุดจนขนาดรวมเหลือไม่เกิน DISK_CACHE_GC_TARGET_RATIO ของงบประมาณ
+        
+        Returns:
+            int: จำนวนไฟล์ที่ลบ
+        """
+        removed = 0
+        try:
+            files = sorted(self._iter_files(), key=lambda item: item[2])
+            total = sum(size for _, size, _ in files)
+            target = int(self.max_bytes * DISK_CACHE_GC_TARGET_RATIO)
+            
+            for path, size, _ in files:
+                if total <= target:
+                    break
+                if self._remove_file(path):
+                    total -= size
+                    removed += 1
+            
+            with self._lock:
+                self.current_bytes = total
+                self.stats['gc_runs'] += 1
+                self.stats['gc_removed'] += removed
+        finally:
+            with self._lock:
+                self._gc_running = False
+        
+        return removed
+    
+    def clear(self):
+        """
+        ล้าง disk cache ทั้งหมด
+        ย้ายโฟลเดอร์ออกไปแบบ atomic แล้วลบในเบื้องหลัง แทนการลบทีละไฟล์
+        """
+        trash_dir = f"{self.cache_dir.rstrip(os.sep)}.trash-{os.getpid()}-{time.time_ns()}"
+        try:
+            os.replace(self.cache_dir, trash_dir)
+        except OSError:
+            trash_dir = None
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock:
+            self.current_bytes = 0
+        
+        if trash_dir:
+            self._start_background(lambda: shutil.rmtree(trash_dir, ignore_errors=True))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """ดึงสถิติการใช้พื้นที่ดิสก์และ GC"""
+        return {
+            'bytes_used': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'writes': self.stats['writes'],
+            'write_errors': self.stats['write_errors'],
+            'corrupt': self.stats['corrupt'],
+            'gc_runs': self.stats['gc_runs'],
+            'gc_removed': self.stats['gc_removed']
+        }
 
 
 class CacheManager:
     """คลาสสำหรับจัดการ cache เพื่อเพิ่มประสิทธิภาพ"""
     
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(self, cache_dir: str = "cache",
+                 max_memory_entries: int = DEFAULT_MEMORY_CACHE_MAX_ENTRIES,
+                 max_memory_bytes: int = DEFAULT_MEMORY_CACHE_MAX_BYTES,
+                 default_ttl: Optional[float] = None,
+                 max_disk_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES):
         self.cache_dir = cache_dir
-        self.memory_cache = {}
+        self.memory_cache = LRUMemoryCache(
+            max_entries=max_memory_entries,
+            max_bytes=max_memory_bytes,
+            default_ttl=default_ttl
+        )
+        self.disk_cache = DiskCache(cache_dir, max_bytes=max_disk_bytes)
         self.cache_stats = defaultdict(int)
-        
-        # สร้างโฟลเดอร์ cache
-        os.makedirs(cache_dir, exist_ok=True)
     
     def _get_cache_key(self, data: Any) -> str:
         """สร้าง cache key จากข้อมูล"""
@@ -122,52 +483,51 @@ class CacheManager:
         else:
             return hashlib.md5(str(data).encode('utf-8')).hexdigest()
     
+    def make_key(self, namespace: str, text: str, *parts: Any) -> str:
+        """สร้าง cache key ที่คงที่ข้ามการรีสตาร์ท (ดู make_cache_key)"""
+        return make_cache_key(namespace, text, *parts)
+    
     def get(self, key: str) -> Optional[Any]:
         """ดึงข้อมูลจาก cache"""
         # ลองดึงจาก memory cache ก่อน
-        if key in self.memory_cache:
+        data = self.memory_cache.get(key)
+        if data is not None:
             self.cache_stats['memory_hits'] += 1
-            return self.memory_cache[key]
+            return data
         
         # ลองดึงจาก file cache
-        cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'rb') as f:
-                    data = pickle.load(f)
-                self.memory_cache[key] = data  # เก็บใน memory cache ด้วย
-                self.cache_stats['file_hits'] += 1
-                return data
-            except Exception:
-                pass
+        data = self.disk_cache.get(key)
+        if data is not None:
+            self.memory_cache.set(key, data)  # เก็บใน memory cache ด้วย
+            self.cache_stats['file_hits'] += 1
+            return data
         
         self.cache_stats['misses'] += 1
         return None
     
-    def set(self, key: str, data: Any, use_file_cache: bool = True):
-        """เก็บข้อมูลใน cache"""
+    def set(self, key: str, data: Any, use_file_cache: bool = True, ttl: Optional[float] = None):
+        """
+        เก็บข้อมูลใน cache
+        
+        Args:
+            key: cache key
+            data: ข้อมูลที่ต้องการเก็บ
+            use_file_cache: เก็บลง file cache ด้วยหรือไม่
+            ttl: อายุของรายการใน memory cache (วินาที)
+        """
         # เก็บใน memory cache
-        self.memory_cache[key] = data
+        self.memory_cache.set(key, data, ttl=ttl)
         
         # เก็บใน file cache ถ้าต้องการ
         if use_file_cache:
-            cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
-            try:
-                with open(cache_file, 'wb') as f:
-                    pickle.dump(data, f)
-            except Exception:
-                pass
+            self.disk_cache.set(key, data)
     
     def clear(self):
         """ล้าง cache ทั้งหมด"""
         self.memory_cache.clear()
-        
-        # ลบไฟล์ cache
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.pkl'):
-                os.remove(os.path.join(self.cache_dir, filename))
+        self.disk_cache.clear()
     
-    def get_stats(self) -> Dict[str, int]:
+    def get_stats(self) -> Dict[str, Any]:
         """ดึงสถิติ cache"""
         total_requests = sum(self.cache_stats.values())
         hit_rate = (self.cache_stats['memory_hits'] + self.cache_stats['file_hits']) / total_requests if total_requests > 0 else 0
@@ -177,45 +537,105 @@ class CacheManager:
             'file_hits': self.cache_stats['file_hits'],
             'misses': self.cache_stats['misses'],
             'total_requests': total_requests,
-            'hit_rate': hit_rate
+            'hit_rate': hit_rate,
+            'memory': self.memory_cache.get_stats(),
+            'disk': self.disk_cache.get_stats()
         }
 
 
 class ParallelProcessor:
     """คลาสสำหรับการประมวลผลแบบขนาน"""
     
-    def __init__(self, max_workers: int = None):
+    def __init__(self, max_workers: int = None,
+                 process_initializer: Callable = None,
+                 process_initargs: Tuple = ()):
+        """
+        Args:
+            max_workers: จำนวน worker สูงสุด (ค่าเริ่มต้น = จำนวน CPU)
+            process_initializer: ฟังก์ชันที่ worker process เรียกครั้งเดียวตอนเริ่มต้น
+                (เช่น โหลด dictionary/model ไว้ล่วงหน้า)
+            process_initargs: arguments สำหรับ process_initializer
+        """
         self.max_workers = max_workers or multiprocessing.cpu_count()
         self.thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
-        self.process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._process_initializer = process_initializer
+        self._process_initargs = process_initargs
+        self._process_pool = None
+        self._pool_lock = threading.Lock()
+    
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        """
+        process pool (สร้างเมื่อใช้งานครั้งแรก)
+        ProcessPoolExecutor สร้าง pipe/queue ตั้งแต่ตอนสร้าง ถ้าสร้างก่อน fork worker ของเว็บเซิร์ฟเวอร์
+        ทุก worker จะใช้ queue ชุดเดียวกัน จึงต้องสร้างใน process ที่ใช้งานจริงเท่านั้น
+        """
+        with self._pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=self._process_initializer,
+                    initargs=self._process_initargs
+                )
+            return self._process_pool
     
     def process_texts_parallel(self, texts: List[str], process_func: Callable) -> List[Any]:
-        """ประมวลผลข้อความหลายข้อความแบบขนาน"""
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(process_func, text) for text in texts]
-            results = [future.result() for future in futures]
-        return results
+        """ประมวลผลข้อความหลายข้อความแบบขนาน (thread pool)"""
+        futures = [self.thread_pool.submit(process_func, text) for text in texts]
+        return [future.result() for future in futures]
     
     def process_files_parallel(self, file_paths: List[str], process_func: Callable) -> List[Any]:
-        """ประมวลผลไฟล์หลายไฟล์แบบขนาน"""
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(process_func, file_path) for file_path in file_paths]
-            results = [future.result() for future in futures]
-        return results
+        """ประมวลผลไฟล์หลายไฟล์แบบขนาน (thread pool)"""
+        futures = [self.thread_pool.submit(process_func, file_path) for file_path in file_paths]
+        return [future.result() for future in futures]
+    
+    def chunk(self, items: List[Any], chunks_per_worker: int = 4) -> List[List[Any]]:
+        """
+        แบ่งรายการเป็น batch สำหรับส่งให้ worker process
+        (หลาย batch ต่อ worker เพื่อกระจายงานที่มีขนาดไม่เท่ากัน)
+        """
+        if not items:
+            return []
+        batch_size = max(1, -(-len(items) // (self.max_workers * chunks_per_worker)))
+        return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    
+    def process_batches(self, batches: List[List[Any]], batch_func: Callable, *args) -> List[Any]:
+        """
+        ประมวลผลแต่ละ batch ใน process pool
+        
+        Args:
+            batches: รายการ batch จาก chunk()
+            batch_func: ฟังก์ชันระดับ module (ต้อง pickle ได้) ที่รับ (batch, *args)
+            *args: arguments เพิ่มเติมที่ส่งให้ batch_func
+            
+        Returns:
+            List[Any]: ผลลัพธ์ของแต่ละ batch ตามลำดับเดิม
+        """
+        futures = [self.process_pool.submit(batch_func, batch, *args) for batch in batches]
+        return [future.result() for future in futures]
     
     def cleanup(self):
         """ทำความสะอาด resources"""
         self.thread_pool.shutdown(wait=True)
-        self.process_pool.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
 
 
 class ProgressTracker:
     """คลาสสำหรับติดตามความคืบหน้า"""
     
-    def __init__(self, total_steps: int, description: str = "Processing"):
+    def __init__(self, total_steps: int, description: str = "Processing", verbose: bool = True):
+        """
+        Args:
+            total_steps: จำนวนขั้นตอนทั้งหมด
+            description: คำอธิบายที่แสดงหน้าแถบความคืบหน้า
+            verbose: แสดงแถบความคืบหน้าทาง console (False เมื่อใช้ผ่าน API)
+        """
         self.total_steps = total_steps
         self.current_step = 0
         self.description = description
+        self.verbose = verbose
         self.start_time = time.time()
         self.step_times = []
     
@@ -251,7 +671,8 @@ class ProgressTracker:
         }
         
         # แสดงความคืบหน้า
-        self._display_progress(progress_info)
+        if self.verbose:
+            self._display_progress(progress_info)
         
         return progress_info
     
@@ -270,7 +691,8 @@ class ProgressTracker:
     def finish(self, message: str = "Completed"):
         """สิ้นสุดการติดตาม"""
         total_time = time.time() - self.start_time
-        print(f"\n✅ {message} in {total_time:.2f} seconds")
+        if self.verbose:
+            print(f"\n✅ {message} in {total_time:.2f} seconds")
         
         return {
             'total_time': total_time,
@@ -286,11 +708,12 @@ def optimize_memory():
 
 def get_system_info() -> Dict[str, Any]:
     """ดึงข้อมูลระบบ"""
+    memory = psutil.virtual_memory()
     return {
         'cpu_count': multiprocessing.cpu_count(),
-        'memory_total': psutil.virtual_memory().total,
-        'memory_available': psutil.virtual_memory().available,
-        'memory_percent': psutil.virtual_memory().percent,
+        'memory_total': memory.total,
+        'memory_available': memory.available,
+        'memory_percent': memory.percent,
         'cpu_percent': psutil.cpu_percent(),
         'disk_usage': psutil.disk_usage('/').percent if os.name != 'nt' else psutil.disk_usage('C:').percent
     }
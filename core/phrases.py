@@ -0,0 +1,212 @@
+"""
+Repeated phrase detection
+หาวลี (ลำดับ token) ที่ซ้ำกันในเอกสาร เช่น วลีหาเสียงหรือประเด็นที่ผู้อภิปรายพูดซ้ำ
+ใช้ suffix array + LCP array บน integer token id (สร้างด้วย prefix doubling แบบ vectorized ของ NumPy)
+จึงใช้เวลาเกือบเชิงเส้นตามความยาวเอกสาร ไม่ต้องแจกแจง n-gram ทุกตัวลง dict
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ความยาววลีขั้นต่ำ (จำนวน token) และจำนวนครั้งขั้นต่ำเริ่มต้น
+DEFAULT_MIN_LENGTH = 3
+DEFAULT_MIN_COUNT = 2
+
+# จำนวนตำแหน่งที่พบสูงสุดที่คืนค่าต่อวลี
+DEFAULT_MAX_POSITIONS = 50
+
+PHRASE_MODES = ('maximal', 'ngram')
+
+
+class SuffixArray:
+    """
+    suffix array และ LCP array ของลำดับ integer id
+    - suffix array: prefix doubling (จัดเรียงคู่ rank ทีละรอบ รอบละ O(n log n) ใน NumPy)
+      หยุดเมื่อ rank ไม่ซ้ำกันแล้ว จำนวนรอบจึงเท่ากับ log ของความยาววลีที่ซ้ำยาวที่สุด
+    - LCP: binary lifting บน rank ของแต่ละรอบ (เทียบคู่ suffix ที่ติดกันทุกคู่พร้อมกัน)
+    """
+
+    def __init__(self, ids: Sequence[int]):
+        """
+        Args:
+            ids: ลำดับ token id (จำนวนเต็มไม่ติดลบ)
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        n = len(self.ids)
+        rank_dtype = np.int32 if n < (1 << 31) else np.int64
+
+        # rank ของ substring ยาว 2^level ที่เริ่มแต่ละตำแหน่ง (substring ที่เกินท้ายเอกสารสั้นกว่าและไม่เท่ากับตัวอื่น)
+        _, rank = np.unique(self.ids, return_inverse=True)
+        rank = rank.astype(rank_dtype).reshape(-1)
+        self._levels = [rank]
+        order = np.argsort(rank, kind='stable')
+
+        step = 1
+        while n and step < n and int(rank.max()) < n - 1:
+            # key = (rank ของครึ่งแรก, rank ของครึ่งหลัง + 1) โดย 0 = เกินท้ายเอกสาร
+            second = np.zeros(n, dtype=np.int64)
+            second[:n - step] = rank[step:].astype(np.int64) + 1
+            keys = rank.astype(np.int64) * (n + 1) + second
+            order = np.argsort(keys)
+            sorted_keys = keys[order]
+            changed = np.empty(n, dtype=bool)
+            changed[0] = False
+            np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=changed[1:])
+            rank = np.empty(n, dtype=rank_dtype)
+            rank[order] = np.cumsum(changed)
+            self._levels.append(rank)
+            step *= 2
+
+        self.sa = order.astype(np.int64)
+        self.rank = rank
+        self.lcp = self._compute_lcp()
+
+    def _compute_lcp(self) -> np.ndarray:
+        """lcp[i] = ความยาว prefix ร่วมของ suffix sa[i] กับ sa[i + 1]"""
+        n = len(self.sa)
+        if n < 2:
+            return np.zeros(0, dtype=np.int64)
+        left = self.sa[:-1]
+        right = self.sa[1:]
+        lcp = np.zeros(n - 1, dtype=np.int64)
+        # rank ของ level สูงสุดไม่ซ้ำกัน (lcp < 2^level) จึงเริ่มจาก level ก่อนหน้า
+        for level in range(len(self._levels) - 2, -1, -1):
+            rank = self._levels[level]
+            a = left + lcp
+            b = right + lcp
+            valid = np.flatnonzero((a < n) & (b < n))
+            equal = valid[rank[a[valid]] == rank[b[valid]]]
+            lcp[equal] += 1 << level
+        return lcp
+
+    def intervals(self, min_length: int = 1, min_count: int = 2) -> Iterator[Tuple[int, int, int]]:
+        """
+        lcp-interval ทุกช่วง: suffix sa[start:end] มี prefix ร่วมยาว length token พอดี
+        (แต่ละช่วง = substring ที่ซ้ำ end - start ครั้ง และต่อด้านขวาไม่ได้โดยไม่ลดจำนวนครั้ง)
+
+        Yields:
+            Tuple[int, int, int]: (length, start, end)
+        """
+        lcp = self.lcp.tolist()
+        lcp.append(0)
+        stack = [(0, 0)]
+        for index, height in enumerate(lcp, start=1):
+            left = index - 1
+            while stack[-1][0] > height:
+                length, left = stack.pop()
+                if length >= min_length and index - left >= min_count:
+                    yield length, left, index
+            if stack[-1][0] < height:
+                stack.append((height, left))
+
+    def maximal_repeats(self, min_length: int = DEFAULT_MIN_LENGTH,
+                        min_count: int = DEFAULT_MIN_COUNT) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        maximal repeats: วลีที่ซ้ำและต่อไปทางซ้ายหรือขวาแล้วจำนวนครั้งลดลง (ไม่ใช่ส่วนหนึ่งของวลีที่ยาวกว่าเสมอ)
+
+        Yields:
+            Tuple[int, np.ndarray]: (ความยาว, ตำแหน่งเริ่มต้นที่พบทั้งหมด)
+        """
+        # token ก่อนหน้าของแต่ละ suffix ตามลำดับใน suffix array (-1 = ต้นเอกสาร)
+        previous = np.full(len(self.sa), -1, dtype=np.int64)
+        has_previous = self.sa > 0
+        previous[has_previous] = self.ids[self.sa[has_previous] - 1]
+        # differs[i] = จำนวนคู่ที่ติดกันใน sa[:i + 1] ที่ token ก่อนหน้าต่างกัน (ตรวจทั้งช่วงได้ใน O(1))
+        differs = np.concatenate(([0], np.cumsum(previous[1:] != previous[:-1]))).tolist()
+        for length, start, end in self.intervals(min_length, min_count):
+            # ต่อด้านซ้ายได้ถ้าทุกตำแหน่งมี token ก่อนหน้าเหมือนกัน
+            if differs[end - 1] == differs[start]:
+                continue
+            yield length, self.sa[start:end]
+
+    def ngrams(self, length: int, min_count: int = DEFAULT_MIN_COUNT) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        n-gram ยาว length token พอดีที่พบอย่างน้อย min_count ครั้ง
+
+        Yields:
+            Tuple[int, np.ndarray]: (ความยาว, ตำแหน่งเริ่มต้นที่พบทั้งหมด)
+        """
+        n = len(self.sa)
+        if length <= 0 or n < length:
+            return
+        # suffix ที่ติดกันและ lcp >= length อยู่ในกลุ่มเดียวกัน (กลุ่มที่มีมากกว่าหนึ่ง suffix ยาวพอเสมอ)
+        breaks = np.flatnonzero(self.lcp < length) + 1
+        bounds = np.concatenate(([0], breaks, [n]))
+        sizes = np.diff(bounds)
+        for group in np.flatnonzero(sizes >= min_count):
+            yield length, self.sa[bounds[group]:bounds[group + 1]]
+
+
+def find_repeated_phrases(ids: Sequence[int], min_length: int = DEFAULT_MIN_LENGTH,
+                          min_count: int = DEFAULT_MIN_COUNT, mode: str = 'maximal',
+                          limit: Optional[int] = None) -> List[Tuple[int, int, List[int]]]:
+    """
+    หาวลีที่ซ้ำในลำดับ token id
+
+    Args:
+        ids: ลำดับ token id
+        min_length: ความยาวขั้นต่ำ (โหมด 'ngram' = ความยาวของ n-gram)
+        min_count: จำนวนครั้งขั้นต่ำ
+        mode: 'maximal' = maximal repeats, 'ngram' = n-gram ยาว min_length token
+        limit: จำนวนวลีสูงสุด (None = ทั้งหมด)
+
+    Returns:
+        List[Tuple[int, int, List[int]]]: (ความยาว, จำนวนครั้ง, ตำแหน่งเริ่มต้นเรียงจากน้อยไปมาก)
+        เรียงตามจำนวนครั้งแล้วความยาวจากมากไปน้อย
+    """
+    if mode not in PHRASE_MODES:
+        raise ValueError(f"mode ต้องเป็นหนึ่งใน {', '.join(PHRASE_MODES)}")
+    if min_length < 1 or min_count < 2:
+        raise ValueError('min_length ต้องไม่น้อยกว่า 1 และ min_count ต้องไม่น้อยกว่า 2')
+
+    index = SuffixArray(ids)
+    if mode == 'maximal':
+        repeats = index.maximal_repeats(min_length, min_count)
+    else:
+        repeats = index.ngrams(min_length, min_count)
+
+    found = [(length, len(positions), positions) for length, positions in repeats]
+    found.sort(key=lambda item: (-item[1], -item[0], int(item[2].min())))
+    if limit is not None:
+        found = found[:limit]
+    return [(length, count, np.sort(positions).tolist()) for length, count, positions in found]
+
+
+def phrase_spans(tokens: Sequence[str], positions: Sequence[int], length: int,
+                 offsets: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    ช่วงตัวอักษร (start, end) ของวลีในข้อความที่แยกคำแล้ว
+
+    Args:
+        tokens: token ที่ใช้หาวลี
+        positions: ตำแหน่งเริ่มต้นของวลี (index ใน tokens)
+        length: ความยาววลี (จำนวน token)
+        offsets: ตำแหน่งตัวอักษรเริ่มต้นของแต่ละ token ในข้อความ
+
+    Returns:
+        List[Tuple[int, int]]: ช่วงตัวอักษรของแต่ละตำแหน่ง
+    """
+    spans = []
+    for position in positions:
+        last = position + length - 1
+        spans.append((int(offsets[position]), int(offsets[last]) + len(tokens[last])))
+    return spans
+
+
+def summarize_phrases(tokens: Sequence[str], offsets: Sequence[int], text: str,
+                      repeats: List[Tuple[int, int, List[int]]],
+                      max_positions: int = DEFAULT_MAX_POSITIONS) -> List[Dict]:
+    """แปลงผลของ find_repeated_phrases เป็น dict (ข้อความของวลี token และช่วงตัวอักษรที่พบ)"""
+    phrases = []
+    for length, count, positions in repeats:
+        spans = phrase_spans(tokens, positions[:max_positions], length, offsets)
+        first = positions[0]
+        phrases.append({
+            'phrase': text[spans[0][0]:spans[0][1]],
+            'tokens': list(tokens[first:first + length]),
+            'length': length,
+            'count': count,
+            'spans': spans
+        })
+    return phrases
@@ -0,0 +1,301 @@
+"""
+Prefork server สำหรับใช้งานจริง (production)
+โหลดโมเดล PyThaiNLP (newmm dictionary, perceptron tagger, stopwords) และ automaton ของ categorizer
+ใน process แม่ครั้งเดียว รัน warm-up corpus แล้วจึง fork worker หลายตัว
+worker ทุกตัวใช้หน่วยความจำของโมเดลร่วมกันแบบ copy-on-write และ request แรกไม่ต้องรอโหลดโมเดล
+(ใช้ได้เฉพาะระบบที่มี os.fork เช่น Linux/macOS)
+"""
+
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+# component ที่สร้างก่อน fork (ไม่รวม database: connection pool ใช้ร่วมกันข้าม process ไม่ได้)
+DEFAULT_WARMUP_COMPONENTS = ['detector', 'categorizer']
+
+# ข้อความตัวอย่างสำหรับ warm-up เมื่อไม่ได้กำหนด corpus
+DEFAULT_WARMUP_TEXTS = [
+    'ท่านประธานที่เคารพ กระผมขอหารือเรื่องงบประมาณของกระทรวงศึกษาธิการในปีงบประมาณนี้',
+    'รัฐบาลต้องเร่งแก้ไขปัญหาเศรษฐกิจ ค่าครองชีพ และหนี้สินของประชาชนอย่างเร่งด่วน',
+    'คณะกรรมาธิการได้พิจารณาร่างพระราชบัญญัติดังกล่าวแล้ว และเสนอให้สภาลงมติรับหลักการ',
+    'ขอให้กระทรวงสาธารณสุขจัดสรรบุคลากรทางการแพทย์ให้โรงพยาบาลชุมชนอย่างเพียงพอ',
+    'The committee reviewed the budget report and the infrastructure policy.'
+]
+
+BYTES_PER_MB = 1024 * 1024
+
+
+def load_warmup_corpus(path: Optional[str]) -> List[str]:
+    """
+    อ่าน warm-up corpus จากไฟล์ .txt (แบ่งย่อหน้าด้วยบรรทัดว่าง) หรือโฟลเดอร์ของไฟล์ .txt
+
+    Args:
+        path: path ของไฟล์หรือโฟลเดอร์ (None = ใช้ DEFAULT_WARMUP_TEXTS)
+
+    Returns:
+        List[str]: รายการข้อความสำหรับ warm-up
+    """
+    if not path:
+        return list(DEFAULT_WARMUP_TEXTS)
+
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith('.txt')
+        )
+    else:
+        files = [path]
+
+    texts = []
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            paragraphs = f.read().split('\n\n')
+        texts.extend(paragraph.strip() for paragraph in paragraphs if paragraph.strip())
+    return texts
+
+
+def warm_up_models(components, names: List[str] = None, texts: List[str] = None) -> Dict[str, Any]:
+    """
+    สร้าง component และรันข้อความตัวอย่างผ่าน tokenizer, tagger และ categorizer
+    เพื่อให้โมเดลทั้งหมดถูกโหลดก่อน fork (ไม่แตะสถานะสะสมของ detector)
+
+    Args:
+        components: LazyComponents ของแอป
+        names: ชื่อ component ที่ต้องสร้าง (ค่าเริ่มต้น DEFAULT_WARMUP_COMPONENTS)
+        texts: ข้อความสำหรับ warm-up (ค่าเริ่มต้น DEFAULT_WARMUP_TEXTS)
+
+    Returns:
+        Dict[str, Any]: เวลาที่ใช้สร้างแต่ละ component, เวลา warm-up และจำนวนข้อความ/คำ
+    """
+    from .duplicate_word_detector import _init_analysis_worker, clean_text, filter_pos_tags, tag_text
+
+    names = DEFAULT_WARMUP_COMPONENTS if names is None else names
+    texts = DEFAULT_WARMUP_TEXTS if texts is None else texts
+
+    build_seconds = components.build_all(names)
+
+    start = time.perf_counter()
+    # stopwords/newmm/perceptron ระดับ module (ใช้โดย process pool ที่ fork จาก worker)
+    _init_analysis_worker()
+
+    detector = components.get('detector')
+    stopwords = detector.stopwords if detector is not None else set()
+    word_frequency = Counter()
+    for text in texts:
+        pos_tags = filter_pos_tags(tag_text(clean_text(text)), stopwords)
+        word_frequency.update(word for word, _ in pos_tags)
+
+    categorizer = components.get('categorizer')
+    if categorizer is not None:
+        categorizer.categorize_words(dict(word_frequency))
+
+    return {
+        'build_seconds': build_seconds,
+        'warmup_seconds': time.perf_counter() - start,
+        'texts': len(texts),
+        'unique_words': len(word_frequency)
+    }
+
+
+def get_memory_usage(pid: int = None) -> Dict[str, float]:
+    """
+    หน่วยความจำของ process (MB)
+    rss รวมหน้าที่ใช้ร่วมกับ process อื่น ส่วน uss คือหน่วยความจำเฉพาะของ process นั้น
+    และ pss แบ่งหน้าที่ใช้ร่วมกันตามจำนวน process (uss/pss มีเฉพาะบน Linux)
+    """
+    process = psutil.Process(pid)
+    try:
+        info = process.memory_full_info()
+    except (psutil.AccessDenied, AttributeError):
+        info = process.memory_info()
+
+    usage = {'pid': process.pid}
+    for field in ('rss', 'uss', 'pss', 'shared'):
+        value = getattr(info, field, None)
+        if value is not None:
+            usage[f'{field}_mb'] = round(value / BYTES_PER_MB, 1)
+    return usage
+
+
+def prepare_for_fork(thread_timeout: float = 5.0):
+    """
+    เตรียม process แม่ก่อน fork
+    - รอ thread เบื้องหลัง (เช่น การสแกนขนาด disk cache) ให้เสร็จ เพื่อไม่ให้ lock ค้างใน worker
+    - gc.freeze() ย้าย object ที่มีอยู่ไป permanent generation เพื่อไม่ให้ GC ของ worker
+      เขียนทับหน้าหน่วยความจำของโมเดล (ซึ่งจะทำให้ copy-on-write คัดลอกหน้าเหล่านั้น)
+    """
+    deadline = time.monotonic() + thread_timeout
+    for thread in threading.enumerate():
+        if thread is not threading.main_thread():
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+class PreforkServer:
+    """
+    เซิร์ฟเวอร์ WSGI แบบ prefork: process แม่เปิด socket, warm-up โมเดล แล้ว fork worker
+    worker ทุกตัวรับ connection จาก socket เดียวกัน (werkzeug แบบ threaded)
+    process แม่คอยดูแล worker (สร้างใหม่เมื่อ worker ตาย) และรายงานหน่วยความจำของแต่ละ worker
+    """
+
+    def __init__(self, app, host: str = '0.0.0.0', port: int = 5000, workers: int = None,
+                 warm_up: Callable[[], Dict[str, Any]] = None, report_interval: float = 300,
+                 backlog: int = 128):
+        """
+        Args:
+            app: WSGI application
+            host: address ที่รับ connection
+            port: port ที่รับ connection
+            workers: จำนวน worker process (ค่าเริ่มต้น = จำนวน CPU)
+            warm_up: ฟังก์ชันที่เรียกใน process แม่ก่อน fork (คืนค่าสรุปการ warm-up)
+            report_interval: รายงานหน่วยความจำทุกกี่วินาที (0 = รายงานครั้งเดียวหลังเริ่ม)
+            backlog: ขนาดคิว connection ของ socket
+        """
+        if not hasattr(os, 'fork'):
+            raise RuntimeError('PreforkServer ต้องการ os.fork (ใช้ python app.py บน Windows)')
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.warm_up = warm_up
+        self.report_interval = report_interval
+        self.backlog = backlog
+
+        self.worker_pids = {}  # pid -> slot
+        self.warmup_summary = None
+        self._socket = None
+        self._running = False
+
+    def _bind(self):
+        """เปิด listening socket ใน process แม่ (worker ได้รับ socket นี้ตอน fork)"""
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        self._socket = socket.create_server((self.host, self.port), family=family, backlog=self.backlog)
+        self._socket.set_inheritable(True)
+
+    def _spawn_worker(self, slot: int):
+        pid = os.fork()
+        if pid:
+            self.worker_pids[pid] = slot
+            return
+
+        # ---- worker process ----
+        exit_code = 0
+        try:
+            self._serve_worker()
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 0
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _serve_worker(self):
+        from werkzeug.serving import make_server
+
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C ส่งถึงทุก process; ให้แม่เป็นผู้สั่งหยุด
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+        server = make_server(self.host, self.port, self.app, threaded=True, fd=self._socket.fileno())
+        server.serve_forever()
+
+    def _stop(self, signum, frame):
+        self._running = False
+
+    def _reap_workers(self):
+        """เก็บ worker ที่ตายแล้วและสร้างใหม่แทน"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self.worker_pids.pop(pid, None)
+            if slot is not None and self._running:
+                print(f"⚠️ worker {pid} หยุดทำงาน (status {status}) กำลังสร้างใหม่")
+                self._spawn_worker(slot)
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """หน่วยความจำของ process แม่และ worker แต่ละตัว"""
+        report = [dict(get_memory_usage(os.getpid()), role='master')]
+        for pid, slot in sorted(self.worker_pids.items(), key=lambda item: item[1]):
+            try:
+                report.append(dict(get_memory_usage(pid), role=f'worker-{slot}'))
+            except psutil.Error:
+                continue
+        return report
+
+    def print_memory_report(self):
+        print(f"{'process':<10} {'pid':>7} {'rss (MB)':>9} {'uss (MB)':>9} {'pss (MB)':>9}")
+        for usage in self.memory_report():
+            print(f"{usage['role']:<10} {usage['pid']:>7} {usage.get('rss_mb', 0):>9.1f} "
+                  f"{usage.get('uss_mb', 0):>9.1f} {usage.get('pss_mb', 0):>9.1f}")
+
+    def _shutdown_workers(self, timeout: float = 10.0):
+        for pid in list(self.worker_pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.worker_pids.pop(pid, None)
+
+        deadline = time.monotonic() + timeout
+        while self.worker_pids and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.worker_pids.pop(pid, None)
+            else:
+                time.sleep(0.1)
+
+        for pid in list(self.worker_pids):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.worker_pids.clear()
+
+    def serve_forever(self):
+        """เปิด socket, warm-up, fork worker และดูแล worker จนกว่าจะได้รับ SIGINT/SIGTERM"""
+        self._bind()
+
+        if self.warm_up is not None:
+            self.warmup_summary = self.warm_up()
+        prepare_for_fork()
+
+        self._running = True
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        for slot in range(self.workers):
+            self._spawn_worker(slot)
+        print(f"🚀 รับ connection ที่ http://{self.host}:{self.port} ด้วย {self.workers} workers")
+
+        # รายงานครั้งแรกหลัง worker เริ่มทำงาน
+        next_report = time.monotonic() + 2.0
+        try:
+            while self._running:
+                self._reap_workers()
+                if next_report is not None and time.monotonic() >= next_report:
+                    self.print_memory_report()
+                    next_report = time.monotonic() + self.report_interval if self.report_interval else None
+                time.sleep(0.5)
+        finally:
+            self._shutdown_workers()
+            self._socket.close()
+            print("🛑 หยุดเซิร์ฟเวอร์แล้ว")
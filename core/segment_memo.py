@@ -0,0 +1,228 @@
+"""
+Segment-level tokenization memo
+จำผลการแยกคำและติดแท็ก POS ทีละช่วงข้อความ (ประโยค/วลีที่คั่นด้วยช่องว่าง) ตาม hash ของเนื้อหา
+รายงานการประชุมสภามีข้อความซ้ำข้ามสมัยประชุมจำนวนมาก (วลีตามระเบียบ หัวข้อผู้อภิปราย วาระ)
+จึงส่งเฉพาะช่วงที่ยังไม่เคยเห็นไปยัง tokenizer/tagger โดยผลลัพธ์เหมือนการประมวลผลทั้งข้อความครั้งเดียว
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .text_stream import _THAI_COMBINING, SpacedPhrases
+
+# จำนวนช่วงที่จำไว้ (แยกกันระหว่างผลการแยกคำและผลการติดแท็ก)
+DEFAULT_SEGMENT_MEMO_SIZE = 20000
+
+# perceptron tagger ใช้คำรอบข้าง ±2 คำ และแท็กของ 2 คำก่อนหน้า
+TAG_WINDOW = 2
+
+# จำนวน token บริบทด้านซ้ายเริ่มต้นเมื่อติดแท็กช่วงที่ยังไม่เคยเห็น
+DEFAULT_TAG_CONTEXT = 3
+
+# จุดแบ่งช่วง: ช่องว่างเดี่ยว (newmm ให้ token ' ' เสมอ) ที่ตามด้วยอักขระฐาน
+_SEGMENT_SPACE = re.compile(rf'(?<!\s) (?=[^\s{_THAI_COMBINING}])')
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class SegmentTagMemo:
+    """
+    memo ของ (token, tag) ต่อช่วงข้อความ สำหรับข้อความที่ทำความสะอาดแล้ว (ช่องว่างเดี่ยวระหว่างช่วง)
+    - ผลการแยกคำ: key = hash ของช่วง (newmm ไม่ตัดคำข้ามช่องว่าง ยกเว้นคำใน dictionary ที่มีช่องว่าง
+      ซึ่งจะไม่แบ่งช่วงตรงนั้น)
+    - ผลการติดแท็ก: key = hash ของ (คำ/แท็ก 2 ตัวก่อนหน้า, ช่วง, คำ 2 ตัวถัดไป) ซึ่งเป็นข้อมูลทั้งหมด
+      ที่ perceptron tagger ใช้ ช่วงที่ยังไม่เคยเห็นจะติดแท็กต่อจากบริบทแล้วตรวจว่าแท็กของบริบทตรงกับ
+      ผลที่ได้แล้ว (เหมือน tag_token_chunks) ผลลัพธ์จึงเหมือนการติดแท็กทั้งเอกสารครั้งเดียว
+    เรียกพร้อมกันหลาย thread ได้ (ถือ lock เฉพาะตอนอ่าน/เขียน memo)
+    """
+
+    def __init__(self, tokenizer: Callable[[str], List[str]],
+                 tagger: Callable[[List[str]], List[Tuple[str, str]]],
+                 max_segments: int = DEFAULT_SEGMENT_MEMO_SIZE,
+                 protected_phrases: Iterable[str] = (),
+                 context: int = DEFAULT_TAG_CONTEXT):
+        """
+        Args:
+            tokenizer: ฟังก์ชันแยกคำ รับข้อความ คืนค่ารายการ token
+            tagger: ฟังก์ชันติดแท็ก รับรายการ token คืนค่ารายการ (token, tag)
+            max_segments: จำนวนช่วงสูงสุดที่จำไว้ (ลบช่วงที่ใช้ล่าสุดนานที่สุดก่อน)
+            protected_phrases: คำใน dictionary ของ tokenizer ที่มีช่องว่าง (ห้ามแบ่งช่วงกลางคำ)
+            context: จำนวน token บริบทด้านซ้ายเริ่มต้นเมื่อติดแท็กช่วงใหม่
+        """
+        self.tokenizer = tokenizer
+        self.tagger = tagger
+        self.max_segments = max_segments
+        self.context = max(TAG_WINDOW, context)
+
+        self._tokens: 'OrderedDict[bytes, Tuple[str, ...]]' = OrderedDict()
+        self._tags: 'OrderedDict[bytes, Tuple[str, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'segments': 0, 'token_hits': 0, 'tag_hits': 0,
+                       'context_retries': 0, 'evictions': 0}
+
+        self._protected = SpacedPhrases()
+        self.set_protected_phrases(protected_phrases)
+
+    def set_protected_phrases(self, phrases: Iterable[str]):
+        """กำหนดคำที่มีช่องว่าง: จุดแบ่งที่อยู่กลางคำเหล่านี้จะไม่แบ่ง"""
+        self._protected = SpacedPhrases(phrases)
+        self.clear()
+
+    # ---------- แบ่งช่วง ----------
+
+    def split_segments(self, text: str) -> List[str]:
+        """
+        แบ่งข้อความที่ช่องว่างเดี่ยวระหว่างประโยค/วลี (ต่อช่วงด้วย ' ' แล้วได้ข้อความเดิม)
+
+        Returns:
+            List[str]: ช่วงข้อความ (ว่างถ้าข้อความว่าง)
+        """
+        if not text:
+            return []
+        protected = self._protected
+        if not protected:
+            return _SEGMENT_SPACE.split(text)
+
+        segments = []
+        start = 0
+        for match in _SEGMENT_SPACE.finditer(text):
+            position = match.end()
+            if protected.joins(text[max(0, match.start() - protected.max_head):match.start()],
+                               text[position:position + protected.max_tail]):
+                continue
+            segments.append(text[start:match.start()])
+            start = position
+        segments.append(text[start:])
+        return segments
+
+    # ---------- memo ----------
+
+    def _lookup(self, memo: OrderedDict, key: bytes, stat: str) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            value = memo.get(key)
+            if value is not None:
+                memo.move_to_end(key)
+                self._stats[stat] += 1
+            return value
+
+    def _store(self, memo: OrderedDict, key: bytes, value: Tuple[str, ...]):
+        with self._lock:
+            memo[key] = value
+            while len(memo) > self.max_segments:
+                memo.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _segment_tokens(self, segment: str) -> Tuple[Tuple[str, ...], bool]:
+        """(token ของช่วง, เคยเห็นช่วงนี้แล้วหรือไม่)"""
+        key = _digest(segment)
+        tokens = self._lookup(self._tokens, key, 'token_hits')
+        if tokens is not None:
+            return tokens, True
+        tokens = tuple(self.tokenizer(segment))
+        self._store(self._tokens, key, tokens)
+        return tokens, False
+
+    @staticmethod
+    def _tag_key(words: List[str], tags: List[str], index: int, segment: str, start: int, end: int) -> bytes:
+        """key ของแท็กช่วง = ข้อมูลทั้งหมดที่ tagger ใช้ (ช่วง, คำ/แท็ก 2 ตัวก่อนหน้า, คำ 2 ตัวถัดไป)"""
+        return _digest('\x1e'.join((
+            '1' if index else '0',
+            '\x1f'.join(words[max(0, start - TAG_WINDOW):start]),
+            '\x1f'.join(tags[-TAG_WINDOW:]),
+            segment,
+            '\x1f'.join(words[end:end + TAG_WINDOW])
+        )))
+
+    def _tag_range(self, words: List[str], left_tags: List[str], start: int, end: int) -> Tuple[str, ...]:
+        """
+        ติดแท็ก words[start:end] ต่อจากบริบทด้านซ้ายและคำด้านขวา
+        left_tags = แท็กที่ได้แล้วของ 2 token ก่อน start
+        """
+        right = words[end:end + TAG_WINDOW]
+        size = min(self.context, start)
+        while True:
+            tagged = self.tagger(words[start - size:end] + right)
+            new_tags = [tag for _, tag in tagged]
+            # แท็ก 2 ตัวท้ายของบริบทตรงกับผลเดิม = สถานะของ tagger ตรงกัน ผลต่อจากนี้จึงเหมือนกัน
+            if size == start or new_tags[size - TAG_WINDOW:size] == left_tags:
+                return tuple(new_tags[size:size + end - start])
+            with self._lock:
+                self._stats['context_retries'] += 1
+            size = min(size * 4, start)
+
+    def tag(self, text: str) -> List[Tuple[str, str]]:
+        """
+        แยกคำและติดแท็ก POS (ผลเหมือน tagger(tokenizer(text)))
+
+        Args:
+            text: ข้อความที่ทำความสะอาดแล้ว
+
+        Returns:
+            List[Tuple[str, str]]: รายการของ (คำ, POS tag)
+        """
+        segments = self.split_segments(text)
+
+        # แยกคำทุกช่วงก่อน (การติดแท็กต้องรู้คำถัดไปของแต่ละช่วง)
+        words: List[str] = []
+        bounds = []
+        seen = []
+        for index, segment in enumerate(segments):
+            start = len(words)
+            if index:
+                words.append(' ')
+            tokens, was_seen = self._segment_tokens(segment)
+            words.extend(tokens)
+            bounds.append((start, len(words)))
+            seen.append(was_seen)
+
+        tags: List[str] = []
+        index = 0
+        while index < len(segments):
+            start, end = bounds[index]
+            key = self._tag_key(words, tags, index, segments[index], start, end)
+            unit_tags = self._lookup(self._tags, key, 'tag_hits')
+            if unit_tags is not None:
+                tags.extend(unit_tags)
+                index += 1
+                continue
+
+            # ช่วงถัดไปที่ไม่เคยเห็นเลยไม่มีทางพบใน memo จึงติดแท็กรวมในครั้งเดียว (ไม่ต้องติดแท็กบริบทซ้ำทุกช่วง)
+            last = index
+            while last + 1 < len(segments) and not seen[last + 1]:
+                last += 1
+            run_tags = self._tag_range(words, tags[-TAG_WINDOW:], start, bounds[last][1])
+            for unit in range(index, last + 1):
+                unit_start, unit_end = bounds[unit]
+                if unit != index:
+                    key = self._tag_key(words, tags, unit, segments[unit], unit_start, unit_end)
+                unit_tags = run_tags[unit_start - start:unit_end - start]
+                self._store(self._tags, key, unit_tags)
+                tags.extend(unit_tags)
+            index = last + 1
+
+        with self._lock:
+            self._stats['segments'] += len(segments)
+        return list(zip(words, tags))
+
+    def clear(self):
+        """ล้าง memo"""
+        with self._lock:
+            self._tokens.clear()
+            self._tags.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติของ memo (hit_ratio = สัดส่วนช่วงที่ไม่ต้องติดแท็กใหม่)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._tags)
+            stats['token_entries'] = len(self._tokens)
+        segments = stats['segments']
+        stats['hit_ratio'] = stats['tag_hits'] / segments if segments else 0.0
+        stats['token_hit_ratio'] = stats['token_hits'] / segments if segments else 0.0
+        stats['max_segments'] = self.max_segments
+        return stats
@@ -0,0 +1,91 @@
+"""
+Compiled text normalizer
+ทำความสะอาดข้อความก่อนแยกคำด้วย pattern ที่ compile ไว้ล่วงหน้า:
+กรองตัวอักษร -> รวมช่องว่าง -> ปรับมาตรฐานภาษาไทย (กฎเดียวกับ pythainlp.util.normalize)
+
+pythainlp.util.normalize สแกนข้อความประมาณ 30 รอบ (re.sub ทีละอักขระที่ห้ามซ้ำ + callback ของวรรณยุกต์ทุกตัว)
+ที่นี่รวมเป็น pattern เดียวต่อกฎ ข้ามกฎที่ไม่มีอักขระเกี่ยวข้องในข้อความ และไม่ใช้ callback
+"""
+
+import re
+
+# ชุดอักขระไทย (เหมือน pythainlp.thai_*)
+THAI_LEAD_VOWELS = '\u0e40\u0e41\u0e42\u0e43\u0e44'
+THAI_FOLLOW_VOWELS = '\u0e30\u0e32\u0e33\u0e45'
+THAI_ABOVE_VOWELS = '\u0e31\u0e34\u0e35\u0e36\u0e37\u0e4d\u0e47'
+THAI_BELOW_VOWELS = '\u0e38\u0e39'
+THAI_TONEMARKS = '\u0e48\u0e49\u0e4a\u0e4b'
+
+# ตัวอักษรที่เก็บไว้: อักษรไทยทั้ง block, A-Z, a-z และช่องว่าง (ที่เหลือถูกลบ)
+_SPECIAL_CHARS = re.compile(r'[^\u0E00-\u0E7F\u0041-\u005A\u0061-\u007A\s]+')
+
+# แทนที่เฉพาะช่องว่างที่ต้องเปลี่ยน (ช่องว่างหลายตัว หรือ whitespace ที่ไม่ใช่ ' ')
+# ผลเหมือน re.sub(r'\s+', ' ') แต่ไม่ต้องแทนที่ช่องว่างเดี่ยวระหว่างคำทุกตำแหน่ง
+_EXTRA_WHITESPACE = re.compile(r'\s{2,}|[^\S ]')
+
+# ---------- กฎของ pythainlp.util.normalize (ลำดับเดียวกัน) ----------
+
+# reorder_vowels: วรรณยุกต์/ทัณฑฆาต + สระบน/ล่าง -> สระบน/ล่าง + วรรณยุกต์/ทัณฑฆาต
+_TONE_BEFORE_VOWEL = re.compile(
+    f'([{THAI_TONEMARKS}\u0e4c]+)([{THAI_ABOVE_VOWELS}{THAI_BELOW_VOWELS}]+)'
+)
+# นิคหิต + วรรณยุกต์ + สระอา -> วรรณยุกต์ + สระอำ
+_NIKHAHIT_SARA_AA = re.compile(f'\u0e4d([{THAI_TONEMARKS}]*)\u0e32')
+# สระหลัง + วรรณยุกต์ -> วรรณยุกต์ + สระหลัง
+_FOLLOW_VOWEL_BEFORE_TONE = re.compile(f'([{THAI_FOLLOW_VOWELS}]+)([{THAI_TONEMARKS}]+)')
+# ลากข้าง (ที่ไม่ได้ตามหลัง ฤ/ฦ) -> สระอา
+_LAKKHANGYAO = re.compile('([^\u0e24\u0e26])\u0e45')
+
+# remove_repeat_vowels: อักขระเดียวกันซ้ำติดกัน (คั่นด้วยช่องว่างได้) เหลือตัวเดียว
+# pythainlp ใช้ pattern แยกต่ออักขระ ที่นี่ใช้ backreference รวมเป็น pattern เดียว
+_NOREPEAT_CHARS = f'{THAI_FOLLOW_VOWELS}{THAI_LEAD_VOWELS}{THAI_ABOVE_VOWELS}{THAI_BELOW_VOWELS}\u0e3a\u0e4c\u0e4d\u0e4e'
+_REPEATED_CHARS = re.compile(f'([{_NOREPEAT_CHARS}])(?:[ ]*\\1)+')
+
+# วรรณยุกต์หลายตัวติดกัน เหลือตัวสุดท้าย (ลบตัวที่มีวรรณยุกต์ตามหลัง แทน callback)
+_STACKED_TONEMARKS = re.compile(f'[{THAI_TONEMARKS}]+(?=[{THAI_TONEMARKS}])')
+
+# remove_dangling: อักขระที่ไม่ใช่พยัญชนะฐานที่ต้นข้อความ
+_DANGLING_CHARS = f'{THAI_ABOVE_VOWELS}{THAI_BELOW_VOWELS}{THAI_TONEMARKS}\u0e3a\u0e4c\u0e4d\u0e4e'
+
+
+def remove_special_chars(text: str) -> str:
+    """ลบตัวอักษรพิเศษและตัวเลขที่ไม่จำเป็น (รองรับทั้งไทยและอังกฤษ)"""
+    return _SPECIAL_CHARS.sub('', text)
+
+
+def normalize_thai(text: str) -> str:
+    """
+    ปรับมาตรฐานข้อความไทย ผลเหมือน pythainlp.util.normalize สำหรับข้อความที่ผ่าน
+    remove_special_chars และรวมช่องว่างแล้ว (ไม่มี zero-width, ช่องว่างซ้ำ หรือขึ้นบรรทัดใหม่)
+    """
+    if text.isascii():
+        return text.strip()
+
+    text = text.strip()
+    if '\u0e40\u0e40' in text:
+        text = text.replace('\u0e40\u0e40', '\u0e41')
+    text = _TONE_BEFORE_VOWEL.sub(r'\2\1', text)
+    if '\u0e4d' in text:
+        text = _NIKHAHIT_SARA_AA.sub('\\1\u0e33', text)
+    text = _FOLLOW_VOWEL_BEFORE_TONE.sub(r'\2\1', text)
+    if '\u0e45' in text:
+        text = _LAKKHANGYAO.sub('\\1\u0e32', text)
+
+    text = _REPEATED_CHARS.sub(r'\1', text)
+    text = _STACKED_TONEMARKS.sub('', text)
+    return text.lstrip(_DANGLING_CHARS)
+
+
+def normalize_whitespace(text: str) -> str:
+    """ลบช่องว่างที่เกินและปรับมาตรฐานข้อความ (ใช้หลัง remove_special_chars)"""
+    return normalize_thai(_EXTRA_WHITESPACE.sub(' ', text)).strip()
+
+
+def clean_text(text: str) -> str:
+    """ทำความสะอาดข้อความ (ไม่ใช้ cache) ใช้ร่วมกันระหว่าง detector และ worker process"""
+    return normalize_whitespace(_SPECIAL_CHARS.sub('', text))
+
+
+def is_english_word(token: str) -> bool:
+    """token เป็นคำภาษาอังกฤษล้วน (A-Z, a-z) หรือไม่ (แทน re.match(r'^[a-zA-Z]+$') ต่อ token)"""
+    return token.isascii() and token.isalpha()
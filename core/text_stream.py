@@ -0,0 +1,194 @@
+"""
+Streaming helpers for chunked text analysis
+เครื่องมือสำหรับแบ่งข้อความยาวเป็นช่วงและติดแท็ก POS ทีละช่วง โดยให้ผลเหมือนการประมวลผลครั้งเดียว
+"""
+
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .text_normalizer import _NOREPEAT_CHARS
+
+# ขนาดช่วงข้อความเริ่มต้น (จำนวนตัวอักษร)
+DEFAULT_CHUNK_CHARS = 20000
+
+# อักขระไทยที่ไม่ใช่ตัวฐาน (สระบน/ล่าง วรรณยุกต์ ฯลฯ)
+# ห้ามเริ่มช่วงใหม่ด้วยอักขระเหล่านี้ เพราะ normalize() จะลบอักขระที่ค้างอยู่ต้นข้อความ
+_THAI_COMBINING = '\u0e31\u0e33-\u0e3a\u0e45-\u0e4e'
+
+# จุดแบ่งที่ปลอดภัย: ช่องว่างทั้งช่วง (ไม่ตัดกลางช่วง) ตามด้วยอักขระที่ไม่ใช่ช่องว่าง ไม่ใช่อักขระประกอบ
+# และไม่ใช่อักขระที่ห้ามซ้ำ (normalize() รวมสระ เ แ โ ใ ไ ะ า ฯลฯ ที่ซ้ำกันแม้มีช่องว่างคั่น)
+_SAFE_SPLIT = re.compile(rf'\s+(?=[^\s{_THAI_COMBINING}{_NOREPEAT_CHARS}])')
+
+
+class SpacedPhrases:
+    """
+    คำใน dictionary ที่มีช่องว่าง (เช่น 'ทั้งๆ ที่', 'นานๆ ครั้ง') ซึ่ง newmm ตัดเป็นคำเดียวข้ามช่องว่าง
+    จุดแบ่งที่ช่องว่างอยู่กลางคำเหล่านี้เมื่อข้อความก่อนช่องว่างลงท้ายด้วยส่วนหน้าของคำ
+    และข้อความหลังช่องว่างขึ้นต้นด้วยส่วนที่เหลือ (ข้อความที่ทำความสะอาดแล้ว ช่องว่างเดี่ยว)
+    """
+
+    def __init__(self, phrases: Iterable[str] = ()):
+        # ส่วนหลังช่องว่าง -> ส่วนหน้าที่เป็นไปได้
+        self._heads: Dict[str, Set[str]] = {}
+        for phrase in phrases:
+            parts = phrase.split(' ')
+            for index in range(1, len(parts)):
+                head = ' '.join(parts[:index])
+                tail = ' '.join(parts[index:])
+                if head and tail:
+                    self._heads.setdefault(tail, set()).add(head)
+        self._tail_lengths = sorted({len(tail) for tail in self._heads})
+        self.max_head = max((len(head) for heads in self._heads.values() for head in heads), default=0)
+        self.max_tail = self._tail_lengths[-1] if self._tail_lengths else 0
+
+    def __bool__(self) -> bool:
+        return bool(self._heads)
+
+    def joins(self, before: str, after: str) -> bool:
+        """ช่องว่างระหว่าง before และ after อยู่กลางคำที่มีช่องว่างหรือไม่ (ห้ามแบ่งตรงนั้น)"""
+        for length in self._tail_lengths:
+            heads = self._heads.get(after[:length])
+            if heads and any(before.endswith(head) for head in heads):
+                return True
+        return False
+
+
+def split_on_boundaries(pieces: Iterable[str], chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                        protected_phrases: Iterable[str] = (),
+                        normalize: Optional[Callable[[str], str]] = None) -> Iterator[str]:
+    """
+    แบ่งข้อความเป็นช่วงที่ขอบประโยค/ย่อหน้า (ช่องว่างหรือขึ้นบรรทัดใหม่)
+    ภาษาไทยไม่มีช่องว่างระหว่างคำ ช่องว่างจึงเป็นขอบประโยค จะไม่ตัดกลางคำ
+    ยกเว้นคำใน dictionary ที่มีช่องว่าง (protected_phrases) ซึ่งจะไม่แบ่งกลางคำ
+
+    แต่ละช่วงจะลงท้ายด้วยช่องว่างทั้งช่วง (ถ้ามี) ต่อกันแล้วได้ข้อความเดิมทุกตัวอักษร
+    ถ้าไม่พบจุดแบ่งเลย (ข้อความยาวมากที่ไม่มีช่องว่าง) จะรวมไว้จนกว่าจะพบ
+
+    Args:
+        pieces: ข้อความ หรือ iterable ของชิ้นข้อความ (เช่น ทีละหน้า)
+        chunk_chars: ขนาดช่วงโดยประมาณ (จำนวนตัวอักษร)
+        protected_phrases: คำใน dictionary ของ tokenizer ที่มีช่องว่าง
+        normalize: ฟังก์ชันทำความสะอาดที่ใช้กับช่วงภายหลัง สำหรับเทียบข้อความหลังจุดแบ่งกับคำเหล่านั้น
+
+    Yields:
+        str: ช่วงข้อความ
+    """
+    if isinstance(pieces, str):
+        pieces = (pieces,)
+
+    protected = SpacedPhrases(protected_phrases)
+    # ข้อความรอบจุดแบ่งที่ต้องเห็นก่อนตัดสินใจ (เผื่ออักขระที่ normalize ลบทิ้ง)
+    lookbehind = 2 * protected.max_head
+    lookahead = 2 * protected.max_tail
+
+    buffer = ''
+    start = 0   # ต้นช่วงถัดไปใน buffer
+    search = 0  # ตำแหน่งที่ค้นหาจุดแบ่งต่อ (ก่อนหน้านี้ค้นแล้วไม่พบ)
+    for piece in pieces:
+        if not piece:
+            continue
+        # ตัดส่วนที่ส่งออกแล้วทิ้งครั้งเดียวต่อชิ้น (ไม่คัดลอก buffer ทุกช่วงที่ส่งออก)
+        buffer = buffer[start:] + piece
+        search -= start
+        start = 0
+
+        while len(buffer) - start > chunk_chars:
+            match = _SAFE_SPLIT.search(buffer, max(search, start + chunk_chars - 1))
+            if match is None:
+                # ช่องว่างท้าย buffer อาจกลายเป็นจุดแบ่งเมื่อมีชิ้นถัดไป
+                search = max(start, len(buffer) - 1)
+                break
+            position = match.end()
+            if protected:
+                if position + lookahead > len(buffer):
+                    # ยังตัดสินไม่ได้ว่าอยู่กลางคำหรือไม่ รอชิ้นถัดไป
+                    search = match.start()
+                    break
+                before = buffer[max(0, match.start() - lookbehind):match.start()]
+                after = buffer[position:position + lookahead]
+                if normalize is not None:
+                    before, after = normalize(before), normalize(after)
+                if protected.joins(before, after):
+                    search = position
+                    continue
+            yield buffer[start:position]
+            start = search = position
+
+    if len(buffer) > start:
+        yield buffer[start:]
+
+
+def _find_sync_point(tags: List[str], committed_tags: List[str]) -> int:
+    """
+    หาตำแหน่ง j (2 <= j <= len(committed_tags)) ที่แท็ก j-1 และ j-2 ของการติดแท็กรอบใหม่
+    ตรงกับแท็กที่ยืนยันแล้ว คืนค่า -1 ถ้าไม่พบ
+    """
+    for j in range(len(committed_tags), 1, -1):
+        if tags[j - 1] == committed_tags[j - 1] and tags[j - 2] == committed_tags[j - 2]:
+            return j
+    return -1
+
+
+def tag_token_chunks(token_chunks: Iterable[List[str]],
+                     tagger: Callable[[List[str]], List[Tuple[str, str]]],
+                     context: int = 32,
+                     hold: int = 2,
+                     max_context: int = 512) -> Iterator[List[Tuple[str, str]]]:
+    """
+    ติดแท็ก POS ทีละช่วงให้ได้ผลเหมือนการติดแท็กทั้งเอกสารครั้งเดียว
+
+    perceptron tagger ใช้คำรอบข้าง ±2 คำ และแท็กของ 2 คำก่อนหน้า (greedy)
+    จึงต้อง (1) เก็บ token ท้ายช่วงไว้ `hold` ตัวจนกว่าจะเห็นคำถัดไป และ
+    (2) ติดแท็กช่วงใหม่ต่อจากบริบท token ที่ยืนยันแล้ว แล้วตรวจหาจุดที่แท็ก
+    2 ตัวก่อนหน้าตรงกับผลที่ยืนยันแล้ว (sync point) ตั้งแต่จุดนั้นไปผลลัพธ์
+    จะเหมือนการติดแท็กครั้งเดียวทุกประการ ถ้าไม่พบจะขยายบริบทจนถึง `max_context`
+
+    Args:
+        token_chunks: iterable ของรายการ token ต่อช่วง
+        tagger: ฟังก์ชันติดแท็ก รับรายการ token คืนค่ารายการ (token, tag)
+        context: จำนวน token ที่ยืนยันแล้วที่ใช้เป็นบริบทด้านซ้ายตามปกติ
+        hold: จำนวน token ท้ายช่วงที่ยังไม่ยืนยัน (ต้องรอบริบทด้านขวา)
+        max_context: จำนวน token ที่ยืนยันแล้วสูงสุดที่เก็บไว้สำหรับขยายบริบท
+
+    Yields:
+        List[Tuple[str, str]]: (token, tag) ที่ยืนยันแล้วของแต่ละช่วง
+    """
+    committed_words: List[str] = []
+    committed_tags: List[str] = []
+    pending: List[str] = []
+
+    def tag_with_context(new_tokens: List[str]) -> Tuple[List[Tuple[str, str]], int]:
+        """ติดแท็ก new_tokens ต่อจากบริบท คืนค่า (ผลการติดแท็ก, จำนวน token บริบท)"""
+        size = min(context, len(committed_words))
+        while True:
+            words = committed_words[len(committed_words) - size:]
+            tagged = tagger(words + new_tokens)
+            if size < 2:
+                return tagged, size
+            tags = [tag for _, tag in tagged]
+            if _find_sync_point(tags, committed_tags[len(committed_tags) - size:]) >= 0:
+                return tagged, size
+            if size == len(committed_words):
+                return tagged, size
+            size = min(size * 4, len(committed_words))
+
+    for tokens in token_chunks:
+        if not tokens:
+            continue
+
+        new_tokens = pending + tokens
+        tagged, offset = tag_with_context(new_tokens)
+
+        end = max(offset, len(tagged) - hold)
+        output = tagged[offset:end]
+        if output:
+            yield output
+
+        pending = new_tokens[end - offset:]
+        committed_words = (committed_words + [token for token, _ in output])[-max_context:]
+        committed_tags = (committed_tags + [tag for _, tag in output])[-max_context:]
+
+    # ช่วงสุดท้าย: token ที่ค้างอยู่มีบริบทด้านขวาครบแล้ว (จบเอกสาร)
+    if pending:
+        tagged, offset = tag_with_context(pending)
+        yield tagged[offset:]
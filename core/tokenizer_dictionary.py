@@ -0,0 +1,146 @@
+"""
+Custom tokenizer dictionary
+dictionary ของ newmm ที่รวมคำของ PyThaiNLP กับคำสำคัญของหมวดหมู่รัฐสภา
+คำประสม (เช่น หลักประกันสุขภาพถ้วนหน้า, กระทรวงการคลัง) จึงเป็น token เดียวและตรงกับ exact match ของ categorizer
+compile เป็นตาราง prefix แล้วเก็บไว้บนดิสก์ สร้างใหม่เฉพาะเมื่อรายการคำสำคัญหรือเวอร์ชันของ dictionary เปลี่ยน
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List
+
+# เปลี่ยนเมื่อรูปแบบไฟล์เปลี่ยน (ไฟล์เก่าจะถูกสร้างใหม่)
+DICTIONARY_FORMAT_VERSION = 1
+
+# prefix ของไฟล์ dictionary (ไฟล์อื่นที่ขึ้นต้นด้วย prefix นี้จะถูกลบเมื่อสร้าง dictionary ใหม่)
+DICTIONARY_PREFIX = 'tokenizer_dict_'
+
+
+class PrefixTrie:
+    """
+    dictionary แบบ compile: prefix ทุกตัวของทุกคำ -> เป็นคำหรือไม่ (dict เดียว ไม่มี object ต่อ node)
+    ใช้แทน pythainlp.util.Trie ใน word_tokenize(custom_dict=...) ได้ (newmm ใช้ prefixes() และ len())
+    โหลดจาก pickle เร็วกว่าการสร้าง Trie แบบ node ใหม่หลายเท่า
+    """
+
+    __slots__ = ('_prefixes', '_size', 'fingerprint')
+
+    def __init__(self, words: Iterable[str] = (), fingerprint: str = ''):
+        """
+        Args:
+            words: คำใน dictionary (ตัดช่องว่างหัวท้ายเหมือน pythainlp.util.Trie)
+            fingerprint: hash ของแหล่งคำ (ใช้เป็นส่วนหนึ่งของ cache key ของผลการแยกคำ)
+        """
+        prefixes: Dict[str, bool] = {}
+        for word in words:
+            word = word.strip()
+            if not word:
+                continue
+            for end in range(1, len(word)):
+                prefixes.setdefault(word[:end], False)
+            prefixes[word] = True
+        self._set_prefixes(prefixes)
+        self.fingerprint = fingerprint
+
+    def _set_prefixes(self, prefixes: Dict[str, bool]):
+        self._prefixes = prefixes
+        self._size = sum(prefixes.values())
+
+    @classmethod
+    def from_prefixes(cls, prefixes: Dict[str, bool], fingerprint: str = '') -> 'PrefixTrie':
+        """สร้างจากตาราง prefix ที่ compile แล้ว (เช่น โหลดจากดิสก์)"""
+        trie = cls(fingerprint=fingerprint)
+        trie._set_prefixes(prefixes)
+        return trie
+
+    def prefixes(self, text: str) -> List[str]:
+        """คำใน dictionary ทั้งหมดที่เป็นส่วนต้นของ text (สั้นไปยาว)"""
+        result = []
+        get = self._prefixes.get
+        for end in range(1, len(text) + 1):
+            prefix = text[:end]
+            is_word = get(prefix)
+            if is_word is None:
+                break
+            if is_word:
+                result.append(prefix)
+        return result
+
+    def __contains__(self, word: str) -> bool:
+        return self._prefixes.get(word, False)
+
+    def __iter__(self) -> Iterator[str]:
+        return (prefix for prefix, is_word in self._prefixes.items() if is_word)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def dictionary_fingerprint(keywords: Iterable[str], base_version: str) -> str:
+    """hash ของคำสำคัญและเวอร์ชันของ dictionary หลัก"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f'v{DICTIONARY_FORMAT_VERSION}\x1f{base_version}'.encode('utf-8'))
+    for keyword in sorted(set(keywords)):
+        hasher.update(b'\x1f')
+        hasher.update(keyword.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def load_dictionary(directory: str, keywords: Iterable[str],
+                    base_words: Callable[[], Iterable[str]], base_version: str) -> PrefixTrie:
+    """
+    โหลด dictionary ที่ compile แล้วจาก directory หรือสร้างใหม่ (แล้วบันทึก) ถ้ายังไม่มีไฟล์ของคำชุดนี้
+
+    Args:
+        directory: โฟลเดอร์ที่เก็บไฟล์ dictionary
+        keywords: คำที่เพิ่มจาก dictionary หลัก
+        base_words: ฟังก์ชันที่คืนค่าคำของ dictionary หลัก (เรียกเฉพาะตอนสร้างใหม่)
+        base_version: เวอร์ชันของ dictionary หลัก (เช่น เวอร์ชัน PyThaiNLP)
+
+    Returns:
+        PrefixTrie: dictionary สำหรับ word_tokenize(custom_dict=...)
+    """
+    keywords = sorted(set(keywords))
+    fingerprint = dictionary_fingerprint(keywords, base_version)
+    path = os.path.join(directory, f'{DICTIONARY_PREFIX}{fingerprint}.pkl')
+
+    try:
+        with open(path, 'rb') as f:
+            return PrefixTrie.from_prefixes(pickle.load(f), fingerprint)
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError) as e:
+        print(f"⚠️ ไฟล์ dictionary เสียหาย กำลังสร้างใหม่: {e}")
+
+    trie = PrefixTrie(chain(base_words(), keywords), fingerprint)
+    try:
+        _save(directory, path, trie._prefixes)
+    except OSError as e:
+        print(f"⚠️ บันทึก dictionary ไม่สำเร็จ: {e}")
+    return trie
+
+
+def _save(directory: str, path: str, prefixes: Dict[str, bool]):
+    """เขียนไฟล์ชั่วคราวแล้ว os.replace (process อื่นไม่อ่านไฟล์ที่เขียนไม่เสร็จ) และลบ dictionary รุ่นเก่า"""
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(prefixes, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    with os.scandir(directory) as entries:
+        stale = [entry.path for entry in entries
+                 if entry.name.startswith(DICTIONARY_PREFIX) and entry.path != path]
+    for stale_path in stale:
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
@@ -0,0 +1,351 @@
+"""
+Integer vocabulary and array-backed frequency tables
+แปลงคำและ POS tag เป็นเลข id แล้วเก็บความถี่ใน NumPy array และเมทริกซ์ word×POS แบบ sparse
+ใช้หน่วยความจำน้อยกว่า Counter / defaultdict(Counter) ที่ใช้ string เป็น key
+และการรวมตาราง, top-k และเวกเตอร์ของเอกสารทำแบบ vectorized
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+COUNT_DTYPE = np.int64
+INITIAL_CAPACITY = 1024
+
+# key ของคู่ (คำ, POS) ในเมทริกซ์ sparse = word_id * TAG_STRIDE + tag_id
+TAG_STRIDE = 1 << 16
+
+# จำนวนคู่ (คำ, POS) ที่พักไว้ก่อนรวมเข้าเมทริกซ์ (รวมทีละมากๆ ถูกกว่ารวมทุกครั้ง)
+DEFAULT_MAX_PENDING_PAIRS = 1 << 16
+
+# จำนวนคำอันดับสูงสุดที่ดูแลแบบ incremental (คำขอ top-n ที่ n ไม่เกินค่านี้ไม่ต้องสแกนทั้ง vocabulary)
+DEFAULT_TOP_CAPACITY = 128
+
+
+class Vocabulary:
+    """ตารางแปลง string <-> integer id (id เรียงตามลำดับที่พบครั้งแรก เริ่มจาก 0)"""
+
+    def __init__(self, items: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._items: List[str] = []
+        for item in items:
+            self.add(item)
+
+    def add(self, item: str) -> int:
+        """คืนค่า id ของ item (เพิ่มใหม่ถ้ายังไม่มี)"""
+        item_id = self._ids.get(item)
+        if item_id is None:
+            item_id = len(self._items)
+            self._ids[item] = item_id
+            self._items.append(item)
+        return item_id
+
+    def encode(self, items: Iterable[str]) -> np.ndarray:
+        """แปลงรายการ string เป็น array ของ id (เพิ่มคำใหม่อัตโนมัติ)"""
+        add = self.add
+        return np.fromiter((add(item) for item in items), dtype=np.int64)
+
+    def get(self, item: str, default: Optional[int] = None) -> Optional[int]:
+        """id ของ item (ไม่เพิ่มใหม่)"""
+        return self._ids.get(item, default)
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        """แปลง id กลับเป็น string"""
+        items = self._items
+        return [items[item_id] for item_id in ids]
+
+    def clear(self):
+        self._ids.clear()
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+
+class FrequencyTable:
+    """
+    ตารางความถี่คำแบบ array
+    - counts[word_id] = ความถี่ของคำ (NumPy array ขยายขนาดแบบทวีคูณ)
+    - เมทริกซ์ word×POS แบบ sparse เก็บเป็น key ที่เรียงแล้ว + ความถี่ (คู่ใหม่พักไว้แล้ว compact ทีละชุด)
+    - ดัชนี top-k: id ของคำอันดับสูงสุด top_capacity คำ เรียงไว้แล้ว อัปเดตเฉพาะคำที่ถูกเพิ่มในแต่ละครั้ง
+      (ความถี่เพิ่มขึ้นอย่างเดียว คำที่อยู่นอกดัชนีจึงแซงขึ้นมาได้เฉพาะตอนที่ตัวเองถูกเพิ่ม)
+    ไม่มี lock ในตัว: ผู้เรียกที่ใช้จากหลาย thread ต้องถือ lock เอง
+    """
+
+    def __init__(self, max_pending_pairs: int = DEFAULT_MAX_PENDING_PAIRS,
+                 top_capacity: int = DEFAULT_TOP_CAPACITY):
+        """
+        Args:
+            max_pending_pairs: จำนวนคู่ (คำ, POS) ที่พักไว้ก่อน compact
+            top_capacity: ขนาดดัชนี top-k (0 = ไม่ใช้ดัชนี สแกนทั้ง vocabulary ทุกครั้ง)
+        """
+        self.words = Vocabulary()
+        self.tags = Vocabulary()
+        self.max_pending_pairs = max_pending_pairs
+        self.top_capacity = max(0, top_capacity)
+        self.total = 0
+
+        self.counts = np.zeros(INITIAL_CAPACITY, dtype=COUNT_DTYPE)
+        self._top_ids = np.empty(0, dtype=np.int64)
+        self._in_top = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._pair_keys = np.empty(0, dtype=np.int64)
+        self._pair_counts = np.empty(0, dtype=COUNT_DTYPE)
+        self._pending_keys = []
+        self._pending_counts = []
+        self._pending_size = 0
+
+    # ---------- การเพิ่มข้อมูล ----------
+
+    def _ensure_capacity(self, size: int):
+        if size > len(self.counts):
+            counts = np.zeros(max(size, 2 * len(self.counts)), dtype=COUNT_DTYPE)
+            counts[:len(self.counts)] = self.counts
+            in_top = np.zeros(len(counts), dtype=bool)
+            in_top[:len(self._in_top)] = self._in_top
+            self.counts = counts
+            self._in_top = in_top
+
+    def _update_top(self, touched_ids: np.ndarray):
+        """
+        อัปเดตดัชนี top-k หลังคำใน touched_ids ถูกเพิ่มความถี่ (O(จำนวนคำที่ถูกเพิ่ม + top_capacity))
+        ลำดับเดียวกับ top_ids(): ความถี่มากก่อน ความถี่เท่ากันคำที่พบก่อนมาก่อน
+        """
+        capacity = self.top_capacity
+        if not capacity:
+            return
+        counts = self.counts
+        top = self._top_ids
+        top = top[np.lexsort((top, -counts[top]))]
+
+        new = np.unique(touched_ids)
+        new = new[~self._in_top[new]]
+        new = new[counts[new] > 0]
+        if len(top) >= capacity and len(new):
+            # คำใหม่ต้องแซงคำอันดับสุดท้ายของดัชนีจึงจะเข้าได้
+            last = top[-1]
+            new_counts = counts[new]
+            new = new[(new_counts > counts[last]) | ((new_counts == counts[last]) & (new < last))]
+
+        if len(new):
+            top = np.concatenate([top, new])
+            top = top[np.lexsort((top, -counts[top]))]
+            self._in_top[top[capacity:]] = False
+            top = top[:capacity]
+            self._in_top[top] = True
+        self._top_ids = top
+
+    def add_ids(self, word_ids: np.ndarray, counts: np.ndarray, tag_ids: np.ndarray = None):
+        """
+        รวมความถี่จาก array ของ id (id ซ้ำกันได้)
+
+        Args:
+            word_ids: id ของคำ
+            counts: ความถี่ของแต่ละตำแหน่ง
+            tag_ids: id ของ POS tag (None = ไม่บันทึกเมทริกซ์ word×POS)
+        """
+        word_ids = np.asarray(word_ids, dtype=np.int64)
+        counts = np.asarray(counts, dtype=COUNT_DTYPE)
+        if not len(word_ids):
+            return
+
+        self._ensure_capacity(len(self.words))
+        np.add.at(self.counts, word_ids, counts)
+        self.total += int(counts.sum())
+        self._update_top(word_ids)
+
+        if tag_ids is not None:
+            self._add_pairs(word_ids * TAG_STRIDE + np.asarray(tag_ids, dtype=np.int64), counts)
+
+    def _add_pairs(self, keys: np.ndarray, counts: np.ndarray):
+        self._pending_keys.append(keys)
+        self._pending_counts.append(counts)
+        self._pending_size += len(keys)
+        if self._pending_size >= self.max_pending_pairs:
+            self._compact()
+
+    def _compact(self):
+        """รวมคู่ที่พักไว้เข้ากับเมทริกซ์ sparse (เรียง key และรวม key ที่ซ้ำกัน)"""
+        if not self._pending_keys:
+            return
+        keys = np.concatenate([self._pair_keys] + self._pending_keys)
+        counts = np.concatenate([self._pair_counts] + self._pending_counts)
+        self._pending_keys = []
+        self._pending_counts = []
+        self._pending_size = 0
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.zeros(len(unique_keys), dtype=COUNT_DTYPE)
+        np.add.at(summed, inverse, counts)
+        self._pair_keys = unique_keys
+        self._pair_counts = summed
+
+    def add_tagged(self, pos_tags: Sequence[Tuple[str, str]]):
+        """เพิ่มรายการ (คำ, POS tag) ของเอกสาร (แต่ละรายการนับ 1)"""
+        if not pos_tags:
+            return
+        word_ids = self.words.encode(word for word, _ in pos_tags)
+        tag_ids = self.tags.encode(tag for _, tag in pos_tags)
+        self.add_ids(word_ids, np.ones(len(word_ids), dtype=COUNT_DTYPE), tag_ids)
+
+    def add_pairs(self, word_pos_counts: Mapping[Tuple[str, str], int]):
+        """เพิ่มความถี่ของคู่ (คำ, POS tag) เช่น Counter จาก worker process"""
+        if not word_pos_counts:
+            return
+        pairs = list(word_pos_counts)
+        word_ids = self.words.encode(word for word, _ in pairs)
+        tag_ids = self.tags.encode(tag for _, tag in pairs)
+        counts = np.fromiter(word_pos_counts.values(), dtype=COUNT_DTYPE, count=len(pairs))
+        self.add_ids(word_ids, counts, tag_ids)
+
+    def add_counts(self, word_counts: Mapping[str, int]) -> np.ndarray:
+        """
+        เพิ่มความถี่คำ (ไม่มี POS)
+
+        Returns:
+            np.ndarray: id ของคำที่เพิ่ม
+        """
+        word_ids = self.words.encode(word_counts)
+        if len(word_ids):
+            counts = np.fromiter(word_counts.values(), dtype=COUNT_DTYPE, count=len(word_ids))
+            self.add_ids(word_ids, counts)
+        return word_ids
+
+    def merge(self, other: 'FrequencyTable'):
+        """รวมตารางอื่นเข้ามา (แปลง id ของอีกตารางด้วย array เดียว แล้วรวมแบบ vectorized)"""
+        word_map = self.words.encode(other.words)
+        if not len(word_map):
+            return
+        other_counts = other.counts[:len(other.words)]
+        ids = np.flatnonzero(other_counts)
+        self._ensure_capacity(len(self.words))
+        np.add.at(self.counts, word_map[ids], other_counts[ids])
+        self.total += int(other_counts[ids].sum())
+        self._update_top(word_map[ids])
+
+        other._compact()
+        if len(other._pair_keys):
+            tag_map = self.tags.encode(other.tags)
+            keys = (word_map[other._pair_keys // TAG_STRIDE] * TAG_STRIDE
+                    + tag_map[other._pair_keys % TAG_STRIDE])
+            self._add_pairs(keys, other._pair_counts.copy())
+
+    def clear(self):
+        """ล้างความถี่และ vocabulary ทั้งหมด"""
+        self.words.clear()
+        self.tags.clear()
+        self.total = 0
+        self.counts = np.zeros(INITIAL_CAPACITY, dtype=COUNT_DTYPE)
+        self._top_ids = np.empty(0, dtype=np.int64)
+        self._in_top = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._pair_keys = np.empty(0, dtype=np.int64)
+        self._pair_counts = np.empty(0, dtype=COUNT_DTYPE)
+        self._pending_keys = []
+        self._pending_counts = []
+        self._pending_size = 0
+
+    # ---------- การอ่านข้อมูล ----------
+
+    def count(self, word: str) -> int:
+        """ความถี่ของคำ"""
+        word_id = self.words.get(word)
+        return int(self.counts[word_id]) if word_id is not None else 0
+
+    def top_ids(self, n: int = None) -> np.ndarray:
+        """
+        id ของคำที่มีความถี่สูงสุด n คำ เรียงจากมากไปน้อย
+        ความถี่เท่ากันเรียงตามลำดับที่พบคำก่อน (เหมือน Counter.most_common)
+        ถ้า n ไม่เกินขนาดดัชนี top-k จะตอบจากดัชนีทันที ไม่ต้องสแกนทั้ง vocabulary
+        """
+        top = self._top_ids
+        if n is not None and 0 < n and (n <= len(top) or len(top) < self.top_capacity):
+            # ดัชนีที่ยังไม่เต็มมีทุกคำที่ความถี่มากกว่า 0 อยู่แล้ว
+            return top[:n].copy()
+
+        counts = self.counts[:len(self.words)]
+        if n is None or n >= len(counts):
+            candidates = np.flatnonzero(counts)
+        elif n <= 0:
+            return np.empty(0, dtype=np.int64)
+        else:
+            # ค่าความถี่อันดับที่ n (argpartition เป็น O(V) ไม่ต้องเรียงทั้งหมด)
+            threshold = counts[np.argpartition(-counts, n - 1)[n - 1]]
+            if threshold <= 0:
+                candidates = np.flatnonzero(counts)
+            else:
+                above = np.flatnonzero(counts > threshold)
+                ties = np.flatnonzero(counts == threshold)[:n - len(above)]
+                candidates = np.concatenate([above, ties])
+
+        order = np.lexsort((candidates, -counts[candidates]))
+        return candidates[order][:n] if n is not None else candidates[order]
+
+    def most_common(self, n: int = None) -> List[Tuple[str, int]]:
+        """คำที่มีความถี่สูงสุด n คำ (None = ทุกคำ) ในรูปแบบเดียวกับ Counter.most_common"""
+        ids = self.top_ids(n)
+        return list(zip(self.words.decode(ids), self.counts[ids].tolist()))
+
+    def pos_distribution(self, word: str) -> Dict[str, int]:
+        """การกระจายของ POS tag ของคำ (ค้นหาช่วง key ของคำในเมทริกซ์ด้วย binary search)"""
+        word_id = self.words.get(word)
+        if word_id is None:
+            return {}
+        self._compact()
+        start, end = np.searchsorted(self._pair_keys, [word_id * TAG_STRIDE, (word_id + 1) * TAG_STRIDE])
+        tag_ids = self._pair_keys[start:end] % TAG_STRIDE
+        return dict(zip(self.tags.decode(tag_ids), self._pair_counts[start:end].tolist()))
+
+    def pos_totals(self) -> Dict[str, int]:
+        """ความถี่รวมของแต่ละ POS tag"""
+        self._compact()
+        if not len(self._pair_keys):
+            return {}
+        totals = np.zeros(len(self.tags), dtype=COUNT_DTYPE)
+        np.add.at(totals, self._pair_keys % TAG_STRIDE, self._pair_counts)
+        return {tag: int(total) for tag, total in zip(self.tags, totals) if total}
+
+    def document_vector(self, word_counts: Mapping[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        เวกเตอร์ sparse ของเอกสารในพื้นที่ vocabulary นี้ (ไม่เพิ่มคำใหม่ คำที่ไม่รู้จักจะถูกข้าม)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (id ของคำเรียงจากน้อยไปมาก, ความถี่)
+        """
+        get = self.words.get
+        ids = np.fromiter((get(word, -1) for word in word_counts), dtype=np.int64, count=len(word_counts))
+        counts = np.fromiter(word_counts.values(), dtype=COUNT_DTYPE, count=len(word_counts))
+        known = ids >= 0
+        ids, counts = ids[known], counts[known]
+        order = np.argsort(ids)
+        return ids[order], counts[order]
+
+    def to_counter(self) -> Counter:
+        """แปลงเป็น Counter (ลำดับคำตามลำดับที่พบครั้งแรก)"""
+        counts = self.counts[:len(self.words)].tolist()
+        return Counter({word: count for word, count in zip(self.words, counts) if count})
+
+    def word_pos_items(self) -> Iterator[Tuple[str, str, int]]:
+        """วนทุกคู่ (คำ, POS tag, ความถี่)"""
+        self._compact()
+        words = self.words.decode(self._pair_keys // TAG_STRIDE)
+        tags = self.tags.decode(self._pair_keys % TAG_STRIDE)
+        return zip(words, tags, self._pair_counts.tolist())
+
+    @property
+    def nbytes(self) -> int:
+        """ขนาดของ array ทั้งหมด (ไม่รวม vocabulary)"""
+        return (self.counts.nbytes + self._in_top.nbytes + self._pair_keys.nbytes + self._pair_counts.nbytes
+                + sum(array.nbytes for array in self._pending_keys + self._pending_counts))
+
+    def __len__(self) -> int:
+        """จำนวนคำที่ไม่ซ้ำ (คำเข้า vocabulary เมื่อถูกเพิ่มเท่านั้น จึงไม่ต้องนับ array)"""
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return self.count(word) > 0
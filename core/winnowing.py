@@ -0,0 +1,139 @@
+"""
+Winnowing fingerprints for passage reuse detection
+fingerprint ของเอกสาร = hash ของ k-gram (ลำดับคำติดกัน k คำ) ที่เลือกด้วยค่าต่ำสุดในแต่ละหน้าต่าง w ตำแหน่ง
+(robust winnowing) ข้อความที่ซ้ำกันยาวอย่างน้อย w + k - 1 คำจะมี fingerprint ร่วมกันอย่างน้อยหนึ่งตัวเสมอ
+เก็บ fingerprint ในตารางที่มี index ตาม hash การค้นหาเอกสารใหม่จึงอ่านเฉพาะ posting ของ hash ในเอกสารนั้น
+แล้วจัดเรียง (align) ตำแหน่งที่ตรงกันเป็นช่วงข้อความที่ซ้ำ
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .minhash import MinHasher
+
+DEFAULT_KGRAM_SIZE = 5
+DEFAULT_WINDOW = 8
+
+# ค่าคงที่ของ polynomial hash และ finalizer ของ splitmix64 (กระจาย bit ให้ทั่ว 64 bit)
+_KGRAM_MULTIPLIER = np.uint64(0x100000001B3)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+class Winnower:
+    """สร้าง fingerprint (hash 64-bit แบบ signed, ตำแหน่งคำ) จาก hash ของ token (MinHasher.token_hashes)"""
+
+    def __init__(self, kgram_size: int = DEFAULT_KGRAM_SIZE, window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            kgram_size: จำนวนคำต่อ k-gram (ช่วงที่ซ้ำสั้นกว่านี้ไม่ถูกตรวจพบ)
+            window: ขนาดหน้าต่างของ winnowing (ความหนาแน่นของ fingerprint ประมาณ 2 / (window + 1))
+        """
+        if kgram_size < 1 or window < 1:
+            raise ValueError('kgram_size และ window ต้องมากกว่า 0')
+        self.kgram_size = kgram_size
+        self.window = window
+
+    @property
+    def guarantee_threshold(self) -> int:
+        """ความยาว (จำนวนคำ) ของข้อความที่ซ้ำซึ่งรับประกันว่าจะพบ fingerprint ร่วมกัน"""
+        return self.window + self.kgram_size - 1
+
+    token_hashes = staticmethod(MinHasher.token_hashes)
+
+    def kgram_hashes(self, token_hashes: np.ndarray) -> np.ndarray:
+        """hash 64-bit ของ k-gram ทุกตำแหน่ง (ตำแหน่ง i = คำที่ i ถึง i + k - 1)"""
+        count = len(token_hashes) - self.kgram_size + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.uint64)
+        combined = np.zeros(count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for offset in range(self.kgram_size):
+                combined = combined * _KGRAM_MULTIPLIER + token_hashes[offset:offset + count]
+            combined = (combined ^ (combined >> np.uint64(30))) * _MIX_1
+            combined = (combined ^ (combined >> np.uint64(27))) * _MIX_2
+            combined ^= combined >> np.uint64(31)
+        return combined
+
+    def fingerprints(self, token_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        เลือก fingerprint ด้วย robust winnowing: ค่าต่ำสุดของแต่ละหน้าต่าง (ตำแหน่งขวาสุดถ้าเท่ากัน)
+        หน้าต่างที่ติดกันมักเลือกตำแหน่งเดียวกัน จึงเก็บเพียงครั้งเดียว
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (hash แบบ int64, ตำแหน่งคำเริ่มต้นของ k-gram) เรียงตามตำแหน่ง
+        """
+        hashes = self.kgram_hashes(token_hashes)
+        if not len(hashes):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        window = min(self.window, len(hashes))
+        windows = np.lib.stride_tricks.sliding_window_view(hashes, window)
+        # argmin ของหน้าต่างที่กลับด้าน = ตำแหน่งขวาสุดของค่าต่ำสุด
+        rightmost = window - 1 - np.argmin(windows[:, ::-1], axis=1)
+        positions = np.unique(np.arange(len(windows)) + rightmost)
+        return hashes[positions].view(np.int64), positions.astype(np.int64)
+
+
+def align_passages(query_positions: np.ndarray, source_positions: np.ndarray,
+                   kgram_size: int, max_gap: int) -> List[Tuple[int, int, int, int, int]]:
+    """
+    รวม fingerprint ที่ตรงกันระหว่างเอกสารสองฉบับเป็นช่วงข้อความ: fingerprint ที่อยู่บนเส้นทแยงเดียวกัน
+    (ระยะเลื่อน source - query เท่ากัน) และห่างกันไม่เกิน max_gap ตำแหน่งถือเป็นช่วงเดียวกัน
+
+    Args:
+        query_positions: ตำแหน่ง k-gram ในเอกสารที่ค้นหา
+        source_positions: ตำแหน่ง k-gram ที่ตรงกันในเอกสารต้นทาง
+        kgram_size: จำนวนคำต่อ k-gram
+        max_gap: ระยะห่างสูงสุดระหว่าง fingerprint ในช่วงเดียวกัน (ขนาดหน้าต่างของ winnowing)
+
+    Returns:
+        List[Tuple[int, int, int, int, int]]: (query_start, query_end, source_start, source_end, fingerprints)
+        ตำแหน่งคำแบบ [start, end) เรียงตาม query_start
+    """
+    if not len(query_positions):
+        return []
+    diagonals = source_positions - query_positions
+    order = np.lexsort((query_positions, diagonals))
+    queries = query_positions[order].tolist()
+    diagonals = diagonals[order].tolist()
+
+    passages = []
+    start = previous = queries[0]
+    diagonal = diagonals[0]
+    count = 1
+    for query, current in zip(queries[1:], diagonals[1:]):
+        if current == diagonal and query - previous <= max_gap:
+            if query != previous:
+                count += 1
+            previous = query
+            continue
+        passages.append((start, previous + kgram_size, start + diagonal, previous + kgram_size + diagonal, count))
+        start = previous = query
+        diagonal = current
+        count = 1
+    passages.append((start, previous + kgram_size, start + diagonal, previous + kgram_size + diagonal, count))
+    passages.sort()
+    return passages
+
+
+def merge_postings(query_hashes: np.ndarray, query_positions: np.ndarray,
+                   postings: List[Tuple[int, int, int]]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    จับคู่ posting (hash, analysis_id, ตำแหน่งในต้นทาง) กับตำแหน่งของ hash เดียวกันในเอกสารที่ค้นหา
+
+    Returns:
+        Dict[int, Tuple[np.ndarray, np.ndarray]]: analysis_id -> (ตำแหน่งใน query, ตำแหน่งในต้นทาง)
+    """
+    query_index: Dict[int, List[int]] = {}
+    for fingerprint, position in zip(query_hashes.tolist(), query_positions.tolist()):
+        query_index.setdefault(fingerprint, []).append(position)
+
+    matches: Dict[int, Tuple[List[int], List[int]]] = {}
+    for fingerprint, analysis_id, source_position in postings:
+        queries, sources = matches.setdefault(analysis_id, ([], []))
+        for query_position in query_index.get(fingerprint, ()):
+            queries.append(query_position)
+            sources.append(source_position)
+    return {analysis_id: (np.asarray(queries, dtype=np.int64), np.asarray(sources, dtype=np.int64))
+            for analysis_id, (queries, sources) in matches.items()}
@@ -0,0 +1,105 @@
+"""
+Batch analysis CLI
+วิเคราะห์เอกสาร .txt/.pdf ทั้งโฟลเดอร์ (หรือไฟล์ tar) ด้วย worker processes
+บันทึกผลลงฐานข้อมูลแบบ bulk และสรุปเป็นรายงานรวม พร้อมอัตรา documents/sec
+
+การใช้งาน:
+    python scripts/batch_analyze.py transcripts/
+    python scripts/batch_analyze.py hansard-2024.tar.gz --workers 8 --output report.json
+    python scripts/batch_analyze.py transcripts/ --no-db
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.batch_processor import BatchProcessor, open_batch_source
+from core.duplicate_word_detector import DEFAULT_DICTIONARY_DIR
+from config.config import (
+    MINHASH_BANDS, MINHASH_NUM_PERM, MINHASH_SHINGLE_SIZE, PASSAGE_KGRAM_SIZE, PASSAGE_WINDOW
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='วิเคราะห์เอกสารหลายไฟล์ในครั้งเดียว')
+    parser.add_argument('source', help='โฟลเดอร์, ไฟล์ tar (.tar/.tar.gz/.tgz) หรือไฟล์ .txt/.pdf')
+    parser.add_argument('--workers', type=int, default=None, help='จำนวน worker process (ค่าเริ่มต้น = จำนวน CPU)')
+    parser.add_argument('--no-db', action='store_true', help='ไม่บันทึกผลลงฐานข้อมูล')
+    parser.add_argument('--database-url', help='ค่าเริ่มต้น: DATABASE_URL หรือ SQLite ใน data/')
+    parser.add_argument('--title-prefix', default='', help='ข้อความนำหน้าชื่อการวิเคราะห์ที่บันทึก')
+    parser.add_argument('--top', type=int, default=20, help='จำนวนคำที่แสดงในรายงาน')
+    parser.add_argument('--output', help='บันทึกรายงานรวมเป็นไฟล์ JSON')
+    parser.add_argument('--dictionary', default=DEFAULT_DICTIONARY_DIR,
+                        help='โฟลเดอร์ของ dictionary ที่รวมคำสำคัญของหมวดหมู่ (ค่าเริ่มต้น: dictionary/)')
+    args = parser.parse_args()
+
+    database = None
+    if not args.no_db:
+        from core.database_manager import DatabaseManager
+        # ใช้ค่าลายเซ็นเดียวกับเว็บแอป (app.py build_database) เพื่อให้เทียบกับเอกสารที่บันทึกจากเว็บได้
+        database = DatabaseManager(
+            args.database_url,
+            num_perm=MINHASH_NUM_PERM,
+            lsh_bands=MINHASH_BANDS,
+            shingle_size=MINHASH_SHINGLE_SIZE,
+            kgram_size=PASSAGE_KGRAM_SIZE,
+            winnow_window=PASSAGE_WINDOW
+        )
+
+    processor = BatchProcessor(max_workers=args.workers, database=database, dictionary_dir=args.dictionary)
+
+    def show_progress(done, total, name):
+        print(f"\r[{done}/{total}] {name[:60]:<60}", end='', flush=True)
+
+    try:
+        with open_batch_source(args.source) as paths:
+            if not paths:
+                print("ไม่พบไฟล์ .txt หรือ .pdf")
+                sys.exit(1)
+            print(f"พบ {len(paths)} ไฟล์ ใช้ {processor.max_workers} worker processes")
+            report = processor.run(
+                paths,
+                save_to_db=database is not None,
+                title_prefix=args.title_prefix,
+                top_n=max(args.top, 50),
+                progress_callback=show_progress
+            )
+    finally:
+        processor.cleanup()
+        if database is not None:
+            database.close()
+
+    print()
+    print("=" * 60)
+    print(f"เอกสาร: {report['succeeded']}/{report['documents']} สำเร็จ")
+    print(f"คำทั้งหมด: {report['total_words']:,}  คำไม่ซ้ำ: {report['unique_words']:,}")
+    print()
+    print("หมวดหมู่:")
+    for item in report['category_summary']:
+        print(f"  {item['category']:<20} {item['total_frequency']:>10,} ({item['unique_words']:,} คำ)")
+    print()
+    print(f"คำที่พบบ่อยที่สุด {args.top} อันดับ:")
+    for word, frequency in report['top_words'][:args.top]:
+        print(f"  {word:<20} {frequency:>10,}")
+
+    if report['errors']:
+        print()
+        print("ข้อผิดพลาด:")
+        for error in report['errors']:
+            print(f"  {error['name']}: {error['error']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nบันทึกรายงานที่ {args.output}")
+
+    print("=" * 60)
+    print(f"เวลา: {report['elapsed_seconds']:.2f}s  "
+          f"throughput: {report['docs_per_sec']:.2f} docs/sec ({report['workers']} workers)")
+
+
+if __name__ == '__main__':
+    main()
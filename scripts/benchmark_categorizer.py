@@ -0,0 +1,106 @@
+"""
+Benchmark: ParliamentWordCategorizer.categorize_words
+วัดความเร็วการจัดหมวดหมู่คำด้วย automaton เทียบกับการวนลูปทุกคำสำคัญ (วิธีเดิม)
+และแสดงว่าเวลาเพิ่มขึ้นแบบเชิงเส้นตามขนาดคำศัพท์
+
+การใช้งาน:
+    python scripts/benchmark_categorizer.py
+    python scripts/benchmark_categorizer.py --sizes 1000 10000 100000 --no-linear
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.word_categorizer import ParliamentWordCategorizer
+
+
+def build_vocabulary(categorizer: ParliamentWordCategorizer, size: int, seed: int = 42) -> dict:
+    """สร้างคำศัพท์สังเคราะห์ที่มีทั้งคำตรง คำประกอบ ส่วนของคำ และคำสุ่ม"""
+    rng = random.Random(seed)
+    keywords = [k for words in categorizer.categories.values() for k in words]
+    thai_chars = [chr(c) for c in range(0x0E01, 0x0E2F)]
+
+    vocabulary = {}
+    while len(vocabulary) < size:
+        keyword = rng.choice(keywords)
+        roll = rng.random()
+        if roll < 0.1:
+            word = keyword
+        elif roll < 0.4:
+            word = keyword + rng.choice(keywords)[:rng.randint(1, 6)]
+        elif roll < 0.6:
+            start = rng.randrange(len(keyword))
+            word = keyword[start:start + rng.randint(3, 8)]
+        else:
+            word = ''.join(rng.choice(thai_chars) for _ in range(rng.randint(3, 12)))
+        vocabulary[word] = rng.randint(1, 50)
+    return vocabulary
+
+
+def categorize_linear(categorizer: ParliamentWordCategorizer, word_frequency: dict) -> dict:
+    """จัดหมวดหมู่ด้วยวิธีเดิม (วนลูปทุกคำสำคัญ)"""
+    categorized = {}
+    for word, frequency in word_frequency.items():
+        if word in categorizer.word_to_category:
+            for category in categorizer.word_to_category[word]:
+                categorized.setdefault(category, {})[word] = frequency
+            continue
+        best_match = categorizer._find_best_match_linear(word)
+        categorized.setdefault(best_match or 'อื่นๆ', {})[word] = frequency
+    return categorized
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    """คืนค่าเวลาที่ดีที่สุดจากการรันหลายรอบ (วินาที)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark การจัดหมวดหมู่คำ')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000, 8000, 16000, 32000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-linear', action='store_true', help='ไม่วัดวิธีเดิม (ช้ามากสำหรับคำศัพท์ขนาดใหญ่)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    categorizer = ParliamentWordCategorizer()
+    build_time = time.perf_counter() - start
+    print(f"สร้าง automaton: {build_time * 1000:.1f} ms "
+          f"({len(categorizer._keyword_automaton)} states, {len(categorizer._substring_index)} substrings)")
+    print()
+    print(f"{'vocab':>10} {'automaton (s)':>14} {'us/word':>9} {'linear (s)':>12} {'us/word':>9} {'speedup':>8}")
+
+    for size in args.sizes:
+        vocabulary = build_vocabulary(categorizer, size)
+
+        automaton_time = time_call(categorizer.categorize_words, vocabulary, repeat=args.repeat)
+        line = f"{size:>10} {automaton_time:>14.4f} {automaton_time / size * 1e6:>9.2f}"
+
+        if not args.no_linear:
+            linear_time = time_call(categorize_linear, categorizer, vocabulary, repeat=1)
+            line += (f" {linear_time:>12.4f} {linear_time / size * 1e6:>9.2f}"
+                     f" {linear_time / automaton_time:>7.1f}x")
+
+            # ตรวจสอบว่าผลลัพธ์เหมือนกันทุกประการ
+            expected = categorize_linear(categorizer, vocabulary)
+            actual = categorizer.categorize_words(vocabulary)
+            assert expected == actual, f"ผลลัพธ์ไม่ตรงกันที่ขนาด {size}"
+
+        print(line)
+
+    print()
+    print("us/word ที่คงที่ แสดงว่าเวลาเพิ่มขึ้นแบบเชิงเส้นตามขนาดคำศัพท์")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Micro-benchmark: การทำความสะอาดข้อความก่อนแยกคำ
+เปรียบเทียบขั้นตอนเดิม (re.sub ที่ไม่ได้ compile 2 รอบ + pythainlp.util.normalize + strip)
+กับ core.text_normalizer.clean_text ที่ขนาดข้อความ 1KB - 50MB (ข้อความจำลองแบบบันทึกการประชุมสภา)
+และเปรียบเทียบการตรวจคำภาษาอังกฤษต่อ token (re.match vs is_english_word)
+ทุกขนาดตรวจสอบว่าผลลัพธ์เหมือนขั้นตอนเดิมทุกตัวอักษร
+
+การใช้งาน:
+    python scripts/benchmark_normalizer.py
+    python scripts/benchmark_normalizer.py --sizes 1K 1M 50M --repeat 5
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pythainlp.util import normalize
+
+from core.text_normalizer import clean_text, is_english_word
+
+SENTENCES = [
+    'ท่านประธานที่เคารพ กระผมขอหารือเรื่องงบประมาณของกระทรวงศึกษาธิการในปีงบประมาณ ๒๕๖๗',
+    'รัฐบาลต้องเร่งแก้ไขปัญหาเศรษฐกิจ ค่าครองชีพ และหนี้สินของประชาชนอย่างเร่งด่วน (ร้อยละ 12.5)',
+    'คณะกรรมาธิการได้พิจารณาร่างพระราชบัญญัติดังกล่าวแล้ว ตามมาตรา ๗๗ และเสนอให้สภาลงมติรับหลักการ',
+    'ขอให้กระทรวงสาธารณสุขจัดสรรบุคลากรทางการแพทย์ให้โรงพยาบาลชุมชนอย่างเพียงพอ...',
+    'นายกรัฐมนตรี: ขอบคุณท่านสมาชิกครับ  เรื่องนี้รัฐบาลได้มอบหมายให้ กพ. ดำเนินการแล้ว',
+    'The committee reviewed the budget report, the GDP forecast and the infrastructure policy.',
+    'ที่ประชุมมีมติเห็นชอบ ๓๔๕ เสียง ไม่เห็นชอบ ๑๒ เสียง งดออกเสียง ๕ เสียง',
+    'ขออนุญาตท่านประธานครับ ผมมีข้อสังเกตเพิ่มเติม ​เรื่องโครงการก่อสร้างถนนในจังหวัดเชียงใหม่',
+    # คำพิมพ์ผิดที่ normalize ต้องแก้ (สระซ้ำ, วรรณยุกต์ซ้อน, เเ สองตัว)
+    'เเต่ว่าาา ประชาชนน่่าจะได้รับประโยชน์ ต้องมีการตรวจสอบบบ',
+]
+
+SIZE_UNITS = {'K': 1024, 'M': 1024 * 1024}
+
+
+def parse_size(value: str) -> int:
+    value = value.upper()
+    if value[-1] in SIZE_UNITS:
+        return int(float(value[:-1]) * SIZE_UNITS[value[-1]])
+    return int(value)
+
+
+def build_text(size: int, seed: int = 42) -> str:
+    """ข้อความจำลองขนาดประมาณ size bytes (UTF-8) มีเลขหน้า ย่อหน้า และช่องว่างซ้ำ"""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    page = 1
+    while total < size:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        parts.append(rng.choice([' ', ' ', '  ', '\n', '\n\n', '\t']))
+        total += len(sentence.encode('utf-8')) + 1
+        if rng.random() < 0.02:
+            page += 1
+            parts.append(f'\n- {page} -\n')
+    return ''.join(parts)
+
+
+def legacy_clean_text(text: str) -> str:
+    """ขั้นตอนเดิมก่อนใช้ text_normalizer"""
+    text = re.sub(r'[^฀-๿A-Za-z\s]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = normalize(text)
+    return text.strip()
+
+
+def legacy_is_english_word(token: str) -> bool:
+    return bool(re.match(r'^[a-zA-Z]+$', token))
+
+
+def best_of(func, arg, repeat: int):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.0f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:.1f} ms'
+    return f'{seconds:.2f} s'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark การทำความสะอาดข้อความ')
+    parser.add_argument('--sizes', nargs='+', default=['1K', '10K', '100K', '1M', '10M', '50M'])
+    parser.add_argument('--repeat', type=int, default=3, help='จำนวนรอบต่อขนาด (ใช้เวลาที่ดีที่สุด)')
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'legacy':>12} {'compiled':>12} {'speedup':>9} {'MB/s':>8}")
+    for label in args.sizes:
+        size = parse_size(label)
+        text = build_text(size)
+        repeat = args.repeat if size <= 10 * SIZE_UNITS['M'] else 1
+
+        legacy_seconds, expected = best_of(legacy_clean_text, text, repeat)
+        compiled_seconds, result = best_of(clean_text, text, repeat)
+        assert result == expected, f'ผลลัพธ์ไม่ตรงกันที่ขนาด {label}'
+
+        megabytes = len(text.encode('utf-8')) / SIZE_UNITS['M']
+        print(f"{label:>8} {format_seconds(legacy_seconds):>12} {format_seconds(compiled_seconds):>12} "
+              f"{legacy_seconds / compiled_seconds:>8.1f}x {megabytes / compiled_seconds:>8.1f}")
+
+    # การตรวจคำภาษาอังกฤษต่อ token (retag_english)
+    tokens = clean_text(build_text(SIZE_UNITS['M'])).split(' ')
+    legacy_seconds, expected = best_of(lambda items: [legacy_is_english_word(t) for t in items], tokens, args.repeat)
+    compiled_seconds, result = best_of(lambda items: [is_english_word(t) for t in items], tokens, args.repeat)
+    assert result == expected, 'ผลการตรวจคำภาษาอังกฤษไม่ตรงกัน'
+    print()
+    print(f"English token check ({len(tokens):,} tokens): re.match {format_seconds(legacy_seconds)}, "
+          f"is_english_word {format_seconds(compiled_seconds)} ({legacy_seconds / compiled_seconds:.1f}x)")
+    print()
+    print("✅ ผลลัพธ์ตรงกัน")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: หาวลีซ้ำด้วย suffix array vs นับ n-gram ทุกความยาวลง Counter
+ใช้ลำดับ token id สังเคราะห์ (ความถี่แบบ Zipf + วลีตามระเบียบที่ซ้ำทั้งเอกสาร) ขนาดเท่ารายงานการประชุมทั้งสมัย
+ตรวจสอบว่า n-gram ที่ซ้ำตรงกับการนับด้วย Counter ทุกประการ
+
+การใช้งาน:
+    python scripts/benchmark_phrases.py
+    python scripts/benchmark_phrases.py --tokens 1000000 --max-length 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.phrases import SuffixArray, find_repeated_phrases
+
+
+def build_tokens(size: int, vocabulary: int = 20000, phrase_length: int = 40, seed: int = 42) -> np.ndarray:
+    """token id แบบ Zipf และวลียาว phrase_length token ที่แทรกซ้ำทุกประมาณ 2,000 token"""
+    rng = np.random.default_rng(seed)
+    ids = rng.zipf(1.3, size) % vocabulary
+    phrase = rng.integers(0, vocabulary, phrase_length)
+    for position in rng.integers(0, size - phrase_length, size // 2000):
+        ids[position:position + phrase_length] = phrase
+    return ids
+
+
+def count_ngrams(ids: list, min_length: int, max_length: int, min_count: int) -> dict:
+    """วิธีเดิม: นับ n-gram ทุกความยาวลง Counter"""
+    repeated = {}
+    for length in range(min_length, max_length + 1):
+        counts = Counter(tuple(ids[i:i + length]) for i in range(len(ids) - length + 1))
+        repeated[length] = {gram: count for gram, count in counts.items() if count >= min_count}
+    return repeated
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark การหาวลีซ้ำด้วย suffix array')
+    parser.add_argument('--tokens', type=int, default=200000)
+    parser.add_argument('--min-length', type=int, default=3)
+    parser.add_argument('--max-length', type=int, default=6, help='ความยาว n-gram สูงสุดของวิธีเดิม')
+    parser.add_argument('--min-count', type=int, default=2)
+    args = parser.parse_args()
+
+    ids = build_tokens(args.tokens)
+    print(f"{len(ids):,} tokens")
+
+    start = time.perf_counter()
+    expected = count_ngrams(ids.tolist(), args.min_length, args.max_length, args.min_count)
+    counter_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = SuffixArray(ids)
+    actual = {}
+    for length in range(args.min_length, args.max_length + 1):
+        actual[length] = {tuple(ids[positions[0]:positions[0] + length].tolist()): len(positions)
+                          for _, positions in index.ngrams(length, args.min_count)}
+    ngram_seconds = time.perf_counter() - start
+
+    assert actual == expected, 'n-gram ที่ซ้ำไม่ตรงกัน'
+
+    start = time.perf_counter()
+    maximal = find_repeated_phrases(ids, args.min_length, args.min_count, mode='maximal')
+    maximal_seconds = time.perf_counter() - start
+
+    print(f"{'':<34} {'time (s)':>10}")
+    print(f"{'Counter (n-gram ' + str(args.min_length) + '-' + str(args.max_length) + ')':<34} {counter_seconds:>10.3f}")
+    print(f"{'suffix array (n-gram ชุดเดียวกัน)':<34} {ngram_seconds:>10.3f}")
+    print(f"{'suffix array (maximal repeats)':<34} {maximal_seconds:>10.3f}  ({len(maximal):,} วลี ทุกความยาว,"
+          f" ยาวสุด {max((length for length, _, _ in maximal), default=0)} token)")
+    print()
+    print("✅ ผลลัพธ์ตรงกัน")
+
+
+if __name__ == '__main__':
+    main()
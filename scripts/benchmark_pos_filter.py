@@ -0,0 +1,88 @@
+"""
+Benchmark: ขั้นตอนกรองคำตาม POS และนับความถี่
+เปรียบเทียบแบบเดิม (any() ต่อ token + Counter แยกสองชุด) กับ filter_pos_tags + count_pos_tags
+(ตรวจ tag ครั้งเดียวต่อแบบ + นับคู่ (คำ, POS) รอบเดียว) และตรวจสอบว่าผลลัพธ์ (รวมลำดับ key) เหมือนเดิม
+
+การใช้งาน:
+    python scripts/benchmark_pos_filter.py
+    python scripts/benchmark_pos_filter.py --tokens 1000000 --vocabulary 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.duplicate_word_detector import DEFAULT_TARGET_POS, count_pos_tags, filter_pos_tags
+
+POS_TAGS = ['NCMN', 'VACT', 'VSTA', 'NPRP', 'ADVN', 'JSBR', 'RPRE', 'NCNM',
+            'PUNC', 'XVAE', 'DDAC', 'CNIT', 'NONM', 'PPRS', 'CFQC']
+STOPWORDS = {'ที่', 'และ', 'ของ', 'ใน', 'การ', 'ให้', 'ได้', 'เป็น', 'มี', 'ว่า'}
+
+
+def build_pos_tags(tokens: int, vocabulary: int, seed: int = 42):
+    rng = random.Random(seed)
+    words = list(STOPWORDS) + ['ก', 'ๆ'] + [f'คำ{i}' for i in range(vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return [(word, rng.choice(POS_TAGS)) for word in rng.choices(words, weights=weights, k=tokens)]
+
+
+def legacy_stage(pos_tags, stopwords, target_pos):
+    filtered = []
+    for word, pos in pos_tags:
+        if (word not in stopwords and
+            len(word) > 1 and
+            any(tag in pos for tag in target_pos)):
+            filtered.append((word, pos))
+    word_counts = Counter([word for word, pos in filtered])
+    pos_counts = Counter([pos for word, pos in filtered])
+    return filtered, word_counts, pos_counts
+
+
+def batched_stage(pos_tags, stopwords, target_pos):
+    filtered = filter_pos_tags(pos_tags, stopwords, target_pos)
+    word_counts, pos_counts, _ = count_pos_tags(filtered)
+    return filtered, word_counts, pos_counts
+
+
+def best_of(func, repeat, *args):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark การกรอง POS และนับความถี่')
+    parser.add_argument('--tokens', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tokens':>10} {'legacy':>12} {'batched':>12} {'speedup':>9}")
+    for tokens in args.tokens:
+        pos_tags = build_pos_tags(tokens, args.vocabulary)
+        legacy_seconds, expected = best_of(legacy_stage, args.repeat, pos_tags, STOPWORDS, DEFAULT_TARGET_POS)
+        batched_seconds, result = best_of(batched_stage, args.repeat, pos_tags, STOPWORDS, DEFAULT_TARGET_POS)
+
+        # ผลต้องเหมือนเดิมทุกประการ รวมถึงลำดับ key ของ Counter (มีผลต่อ JSON และลำดับความถี่เท่ากัน)
+        assert result[0] == expected[0], 'คำที่กรองแล้วไม่ตรงกัน'
+        assert list(result[1].items()) == list(expected[1].items()), 'ความถี่คำไม่ตรงกัน'
+        assert list(result[2].items()) == list(expected[2].items()), 'ความถี่ POS ไม่ตรงกัน'
+
+        print(f"{tokens:>10,} {legacy_seconds * 1000:>10.1f}ms {batched_seconds * 1000:>10.1f}ms "
+              f"{legacy_seconds / batched_seconds:>8.1f}x")
+
+    print()
+    print("✅ ผลลัพธ์ตรงกัน")
+
+
+if __name__ == '__main__':
+    main()
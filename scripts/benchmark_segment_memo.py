@@ -0,0 +1,134 @@
+"""
+Benchmark: แยกคำ/ติดแท็กทั้งข้อความ vs memo ต่อช่วงข้อความ (SegmentTagMemo)
+จำลองรายงานการประชุมหลายสมัยที่มีวลีตามระเบียบ หัวข้อผู้อภิปราย และวาระซ้ำกัน
+วัดเวลา อัตรา hit ของ memo และตรวจสอบว่าผลลัพธ์ (token, POS) เหมือนกันทุกประการ
+
+การใช้งาน:
+    python scripts/benchmark_segment_memo.py
+    python scripts/benchmark_segment_memo.py --sessions 50 --new-sentences 40
+    python scripts/benchmark_segment_memo.py --file session1.txt --file session2.txt
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.duplicate_word_detector import create_segment_memo, retag_english, tag_text
+from core.text_normalizer import clean_text
+
+# ข้อความตามระเบียบที่ซ้ำทุกสมัยประชุม (ลำดับเดิม)
+OPENING = [
+    "เปิดประชุมเวลา นาฬิกา",
+    "เมื่อสมาชิกมาครบองค์ประชุมแล้ว ประธานสภาผู้แทนราษฎรขึ้นบัลลังก์ ดำเนินการประชุมตามระเบียบวาระ",
+    "ระเบียบวาระที่ เรื่องที่ประธานแจ้งต่อที่ประชุม",
+    "ระเบียบวาระที่ รับรองรายงานการประชุม",
+    "ระเบียบวาระที่ กระทู้ถาม",
+    "ระเบียบวาระที่ เรื่องด่วน",
+]
+VOTE = [
+    "ขอให้ที่ประชุมลงมติ สมาชิกท่านใดเห็นด้วย กรุณากดปุ่มเห็นด้วย",
+    "ท่านใดไม่เห็นด้วย กรุณากดปุ่มไม่เห็นด้วย ท่านใดงดออกเสียง กรุณากดปุ่มงดออกเสียง",
+    "ขอให้เจ้าหน้าที่ประกาศผลการลงมติ ที่ประชุมลงมติเห็นด้วย",
+]
+CLOSING = [
+    "ไม่มีเรื่องอื่นใดที่จะพิจารณา ขอขอบคุณสมาชิกทุกท่าน",
+    "ขอปิดการประชุม",
+    "ปิดประชุมเวลา นาฬิกา",
+]
+SPEAKERS = [
+    "นายสมชาย ใจดี สมาชิกสภาผู้แทนราษฎร จังหวัดเชียงใหม่",
+    "นางสาวสมหญิง รักไทย สมาชิกสภาผู้แทนราษฎร แบบบัญชีรายชื่อ",
+    "นายประเสริฐ มั่นคง รัฐมนตรีว่าการกระทรวงเกษตรและสหกรณ์",
+    "นางวิไล ศรีสุข สมาชิกสภาผู้แทนราษฎร จังหวัดขอนแก่น",
+]
+# คำสำหรับสร้างคำอภิปรายที่ไม่ซ้ำกันในแต่ละสมัย
+SPEECH_WORDS = [
+    "รัฐบาล", "กระทรวง", "ประชาชน", "เกษตรกร", "ชาวนา", "คณะกรรมาธิการ", "โรงเรียน", "ต้อง", "เร่ง", "แก้ไข",
+    "ได้รับ", "ผลกระทบ", "จาก", "ควร", "พิจารณา", "ทบทวน", "จัดสรร", "งบประมาณ", "ให้", "ยังไม่ได้",
+    "ดำเนินการ", "ปัญหา", "น้ำท่วม", "ราคา", "ข้าว", "ตกต่ำ", "ภัยแล้ง", "หนี้สิน", "ครัวเรือน", "ระบบ",
+    "สุขภาพ", "การศึกษา", "ถนน", "หมู่บ้าน", "ไฟฟ้า", "ประปา", "อำเภอ", "ตำบล", "จังหวัด", "ชายแดน",
+    "โครงการ", "นโยบาย", "เศรษฐกิจ", "ท้องถิ่น", "พัฒนา", "สนับสนุน", "ความเดือดร้อน", "อย่างเร่งด่วน",
+]
+
+
+def speech_sentence(rng: random.Random) -> str:
+    """ประโยคอภิปรายสุ่ม (วลีละ 3-7 คำ คั่นด้วยช่องว่าง)"""
+    phrases = [''.join(rng.choices(SPEECH_WORDS, k=rng.randint(3, 7))) for _ in range(rng.randint(1, 3))]
+    return ' '.join(phrases)
+
+
+def build_sessions(sessions: int, new_sentences: int, debates: int = 6, seed: int = 42) -> list:
+    """
+    สร้างรายงานการประชุมแต่ละสมัย: ข้อความตามระเบียบ (เปิด/วาระ/ลงมติ/ปิด) + หัวข้อผู้อภิปราย
+    + คำอภิปรายที่สร้างใหม่ new_sentences ประโยคต่อสมัย
+    """
+    rng = random.Random(seed)
+    result = []
+    for _ in range(sessions):
+        lines = list(OPENING)
+        for debate in range(debates):
+            for _ in range(2):
+                lines.append(rng.choice(SPEAKERS))
+                lines.append("ท่านประธานที่เคารพ")
+                lines.extend(speech_sentence(rng) for _ in range(new_sentences // (debates * 2)))
+                lines.append("ขอบคุณท่านประธาน")
+            lines.extend(VOTE)
+        lines.extend(CLOSING)
+        result.append('\n'.join(lines))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memo ของการแยกคำ/ติดแท็กต่อช่วงข้อความ')
+    parser.add_argument('--file', action='append', help='ไฟล์ข้อความ UTF-8 (ระบุได้หลายไฟล์ ไฟล์ละหนึ่งสมัย)')
+    parser.add_argument('--sessions', type=int, default=30)
+    parser.add_argument('--new-sentences', type=int, default=60, help='จำนวนประโยคอภิปรายที่ไม่ซ้ำต่อสมัย')
+    parser.add_argument('--memo-size', type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.file:
+        sessions = []
+        for path in args.file:
+            with open(path, 'r', encoding='utf-8') as f:
+                sessions.append(f.read())
+    else:
+        sessions = build_sessions(args.sessions, args.new_sentences)
+    texts = [clean_text(session) for session in sessions]
+    print(f"{len(texts)} สมัย, {sum(len(text) for text in texts):,} ตัวอักษร")
+
+    # โหลด dictionary และ model ก่อนจับเวลา
+    tag_text('ประเทศไทย')
+    memo = create_segment_memo(args.memo_size)
+
+    start = time.perf_counter()
+    expected = [tag_text(text) for text in texts]
+    full_seconds = time.perf_counter() - start
+
+    # แยกเวลาของสมัยแรก (memo ยังว่าง) กับสมัยถัดไป
+    start = time.perf_counter()
+    actual = [memo.tag(texts[0])]
+    first_seconds = time.perf_counter() - start
+    actual.extend(memo.tag(text) for text in texts[1:])
+    memo_seconds = time.perf_counter() - start
+
+    # tag_text ใส่แท็กคำอังกฤษใหม่ภายหลัง เทียบเฉพาะผลของ tokenizer/tagger
+    assert [retag_english(tags) for tags in actual] == expected, 'ผลการแยกคำ/ติดแท็กไม่ตรงกัน'
+
+    stats = memo.get_stats()
+    print(f"ช่วงข้อความทั้งหมด: {stats['segments']:,}  hit ratio (แท็ก): {stats['hit_ratio']:.1%}"
+          f"  (แยกคำ): {stats['token_hit_ratio']:.1%}  ขยายบริบท: {stats['context_retries']}")
+    print()
+    print(f"{'':<22} {'time (s)':>10}")
+    print(f"{'ทั้งข้อความ':<22} {full_seconds:>10.3f}")
+    print(f"{'memo ต่อช่วง':<22} {memo_seconds:>10.3f}  (สมัยแรก {first_seconds:.3f} s)")
+    print(f"speedup: {full_seconds / memo_seconds:.2f}x")
+    print()
+    print("✅ ผลลัพธ์ตรงกัน")
+
+
+if __name__ == '__main__':
+    main()
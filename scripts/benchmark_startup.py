@@ -0,0 +1,120 @@
+"""
+Benchmark: เวลาเริ่มต้น (import time) ของ core และ Flask app
+รันใน interpreter ใหม่ทุกครั้ง (cold import) วัดเวลาหลายรอบ แสดงโมดูลที่ใช้เวลานำเข้านานที่สุด
+และตรวจสอบงบประมาณเวลา (regression budget) กับรายชื่อ library หนักที่ต้องไม่ถูกโหลดตอนเริ่มต้น
+
+การใช้งาน:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --repeat 10 --budget-core 0.2 --budget-app 1.0
+คืนค่า exit code 1 ถ้าเกินงบประมาณ (ใช้ใน CI ได้)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# library ที่ต้องนำเข้าเมื่อใช้งานจริงเท่านั้น (ไม่ใช่ตอน import)
+HEAVY_MODULES = [
+    'matplotlib', 'pandas', 'plotly', 'seaborn', 'wordcloud',
+    'pythainlp', 'sqlalchemy', 'pdfplumber', 'PyPDF2', 'pdf2image', 'pytesseract'
+]
+
+# งบประมาณเริ่มต้น (วินาที) ของ import แต่ละแบบ
+DEFAULT_BUDGETS = {
+    'core': 0.25,
+    'app': 1.5
+}
+
+TARGETS = {
+    'core': 'import core',
+    'app': 'import app'
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+
+def run_probe(statement: str) -> dict:
+    """นำเข้าใน interpreter ใหม่ คืนค่าเวลาและ library หนักที่ถูกโหลด"""
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def top_imports(statement: str, limit: int = 10) -> list:
+    """ใช้ -X importtime หาโมดูลที่ใช้เวลานำเข้า (cumulative) นานที่สุด"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # รูปแบบ: "import time:  self [us] | cumulative | imported package"
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark เวลาเริ่มต้นของ core และ app')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-core', type=float, default=DEFAULT_BUDGETS['core'])
+    parser.add_argument('--budget-app', type=float, default=DEFAULT_BUDGETS['app'])
+    parser.add_argument('--profile', action='store_true', help='แสดงโมดูลที่ใช้เวลานำเข้านานที่สุด')
+    args = parser.parse_args()
+
+    budgets = {'core': args.budget_core, 'app': args.budget_app}
+    failures = []
+
+    print(f"{'target':<8} {'median (s)':>11} {'min (s)':>9} {'budget (s)':>11}  heavy modules loaded")
+    for target, statement in TARGETS.items():
+        try:
+            runs = [run_probe(statement) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            print(f"{target:<8} นำเข้าไม่สำเร็จ:\n{e.stderr}")
+            failures.append(f"{target}: import failed")
+            continue
+
+        times = [run['seconds'] for run in runs]
+        median = statistics.median(times)
+        heavy = runs[-1]['heavy']
+        print(f"{target:<8} {median:>11.3f} {min(times):>9.3f} {budgets[target]:>11.3f}  {', '.join(heavy) or '-'}")
+
+        if median > budgets[target]:
+            failures.append(f"{target}: {median:.3f}s > budget {budgets[target]:.3f}s")
+        if heavy:
+            failures.append(f"{target}: โหลด {', '.join(heavy)} ตอนเริ่มต้น")
+
+        if args.profile:
+            for cumulative_us, name in top_imports(statement):
+                print(f"    {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    if failures:
+        print()
+        print("❌ เกินงบประมาณ:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+
+    print()
+    print("✅ อยู่ในงบประมาณ")
+
+
+if __name__ == '__main__':
+    main()
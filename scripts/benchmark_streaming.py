@@ -0,0 +1,130 @@
+"""
+Benchmark: analyze_text vs analyze_text_stream
+เปรียบเทียบเวลาและหน่วยความจำสูงสุดระหว่างการวิเคราะห์ครั้งเดียวกับแบบ streaming
+และตรวจสอบว่าผลรวมเหมือนกันทุกประการ
+
+การใช้งาน:
+    python scripts/benchmark_streaming.py                    # ใช้ข้อความสังเคราะห์
+    python scripts/benchmark_streaming.py --file hansard.txt # ใช้ไฟล์จริง
+
+ข้อความสังเคราะห์มีสองกรณี: ย่อหน้าทั่วไป และข้อความที่มีคำใน dictionary ที่มีช่องว่าง (เช่น 'ทั้งๆ ที่')
+ซึ่งตรวจด้วยช่วงขนาดเล็กหลายขนาดเพื่อให้จุดแบ่งตกอยู่กลางคำเหล่านั้น
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.duplicate_word_detector import ThaiDuplicateWordDetector
+from core.text_normalizer import clean_text, normalize_whitespace, remove_special_chars
+from core.text_stream import split_on_boundaries
+
+SAMPLE_PARAGRAPH = (
+    "ท่านประธานที่เคารพ กระผมขออภิปรายเรื่องงบประมาณรายจ่ายประจำปี "
+    "การศึกษาของประเทศไทยต้องได้รับการพัฒนา นักเรียนและครูต้องได้รับการสนับสนุน "
+    "ระบบหลักประกันสุขภาพถ้วนหน้าเป็นนโยบายสำคัญของรัฐบาล "
+    "เกษตรกรชาวนาได้รับผลกระทบจากภัยแล้งและราคาข้าวตกต่ำ\n\n"
+)
+
+# คำใน dictionary ของ PyThaiNLP ที่มีช่องว่าง (newmm ตัดเป็นคำเดียวข้ามช่องว่าง)
+SPACED_PARAGRAPH = 'ประชาชนมาประชุมสภา ทั้งๆ ที่ฝนตกหนัก นานๆ ครั้งจะมีการประชุม '
+SPACED_CHUNK_CHARS = (64, 85, 99)
+# สระที่ห้ามซ้ำอยู่สองข้างช่องว่าง ซึ่ง normalize() รวมเป็นตัวเดียวข้ามช่องว่าง
+REPEATED_VOWEL_TEXT = 'กข' * 5 + 'า ' + 'าคง' * 5
+
+
+def measure(func, *args, **kwargs):
+    """คืนค่า (ผลลัพธ์, เวลา, หน่วยความจำสูงสุด bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def is_identical(single_result, stream_result) -> bool:
+    """ผลรวมของการวิเคราะห์ครั้งเดียวและแบบ streaming เหมือนกันทุกประการหรือไม่"""
+    return (
+        single_result['word_frequency'] == stream_result['word_frequency'] and
+        single_result['pos_frequency'] == stream_result['pos_frequency'] and
+        single_result['total_words'] == stream_result['total_words']
+    )
+
+
+def check_spaced_phrases(repeats: int = 20) -> bool:
+    """เทียบผลของข้อความที่มีคำที่มีช่องว่าง เมื่อจุดแบ่งช่วงตกอยู่กลางคำ"""
+    text = SPACED_PARAGRAPH * repeats
+    single_result = ThaiDuplicateWordDetector().analyze_text(text, filter_pos=False, track_time=False)
+    identical = True
+    for chunk_chars in SPACED_CHUNK_CHARS:
+        stream_result = ThaiDuplicateWordDetector().analyze_text_stream(
+            text, filter_pos=False, chunk_chars=chunk_chars, track_time=False
+        )
+        same = is_identical(single_result, stream_result)
+        identical = identical and same
+        print(f"คำที่มีช่องว่าง chunk_chars={chunk_chars:<4} {stream_result['total_words']:>5} คำ"
+              f" (ครั้งเดียว {single_result['total_words']}) {'✅' if same else '❌'}")
+    return identical
+
+
+def check_repeated_vowels() -> bool:
+    """เทียบการแบ่งช่วงกับ clean_text() เมื่อจุดแบ่งตกอยู่ระหว่างสระที่ห้ามซ้ำซึ่งมีช่องว่างคั่น"""
+    text = REPEATED_VOWEL_TEXT
+    expected = clean_text(text)
+    identical = True
+    for chunk_chars in range(1, len(text)):
+        chunks = split_on_boundaries([remove_special_chars(text)], chunk_chars)
+        cleaned = ' '.join(filter(None, (normalize_whitespace(chunk) for chunk in chunks)))
+        identical = identical and cleaned == expected
+    print(f"สระซ้ำข้ามช่องว่าง chunk_chars=1..{len(text) - 1} {'✅' if identical else '❌'}")
+    return identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming analysis')
+    parser.add_argument('--file', help='ไฟล์ข้อความ UTF-8 ที่ต้องการทดสอบ')
+    parser.add_argument('--paragraphs', type=int, default=2000, help='จำนวนย่อหน้าของข้อความสังเคราะห์')
+    parser.add_argument('--chunk-chars', type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            text = f.read()
+    else:
+        text = SAMPLE_PARAGRAPH * args.paragraphs
+
+    print(f"ขนาดข้อความ: {len(text):,} ตัวอักษร")
+
+    single = ThaiDuplicateWordDetector()
+    single.clear_cache()
+    single_result, single_time, single_peak = measure(
+        single.analyze_text, text, track_time=False
+    )
+
+    streaming = ThaiDuplicateWordDetector()
+    stream_result, stream_time, stream_peak = measure(
+        streaming.analyze_text_stream, text, chunk_chars=args.chunk_chars, track_time=False
+    )
+
+    print(f"{'mode':<12} {'time (s)':>10} {'peak MB':>10}")
+    print(f"{'single-shot':<12} {single_time:>10.2f} {single_peak / 1e6:>10.1f}")
+    print(f"{'streaming':<12} {stream_time:>10.2f} {stream_peak / 1e6:>10.1f}  ({stream_result['chunks']} chunks)")
+
+    identical = is_identical(single_result, stream_result)
+    print(f"ผลรวมเหมือนกัน: {'✅' if identical else '❌'}")
+
+    if not args.file:
+        identical = check_spaced_phrases() and identical
+        identical = check_repeated_vowels() and identical
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: คำถาม top-n ของความถี่สะสมที่ขนาด vocabulary 10^4 - 10^6
+เปรียบเทียบ Counter.most_common, FrequencyTable แบบสแกนทั้ง vocabulary (argpartition)
+และ FrequencyTable ที่มีดัชนี top-k แบบ incremental
+วัดเวลาเพิ่มเอกสารหนึ่งชุด (ต้นทุนการดูแลดัชนี) และเวลาตอบ top-n หลังเพิ่มเอกสาร
+และตรวจสอบว่าผลลัพธ์เหมือน Counter.most_common
+
+การใช้งาน:
+    python scripts/benchmark_topk.py
+    python scripts/benchmark_topk.py --sizes 10000 100000 1000000 --documents 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vocabulary import FrequencyTable
+
+
+def build_corpus(vocabulary: int, seed: int = 42) -> Counter:
+    """ความถี่สะสมเริ่มต้น: ทุกคำปรากฏอย่างน้อยหนึ่งครั้ง ความถี่แบบ Zipf"""
+    rng = np.random.default_rng(seed)
+    counts = np.maximum(1, (rng.zipf(1.3, vocabulary) % 100000)).tolist()
+    return Counter({f'คำ{i}': count for i, count in enumerate(counts)})
+
+
+def build_documents(vocabulary: int, documents: int, words_per_document: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    words = [f'คำ{i}' for i in range(vocabulary)]
+    return [Counter(rng.choices(words, weights=weights, k=words_per_document)) for _ in range(documents)]
+
+
+def run_counter(corpus: Counter, documents: list, n: int):
+    counter = Counter(corpus)
+    update_seconds = query_seconds = 0.0
+    for document in documents:
+        start = time.perf_counter()
+        counter.update(document)
+        update_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        result = counter.most_common(n)
+        query_seconds += time.perf_counter() - start
+    return update_seconds, query_seconds, result
+
+
+def run_table(corpus: Counter, documents: list, n: int, top_capacity: int):
+    table = FrequencyTable(top_capacity=top_capacity)
+    table.add_counts(corpus)
+    update_seconds = query_seconds = 0.0
+    for document in documents:
+        start = time.perf_counter()
+        table.add_counts(document)
+        update_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        result = table.most_common(n)
+        query_seconds += time.perf_counter() - start
+    return update_seconds, query_seconds, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark คำถาม top-n ของความถี่สะสม')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--documents', type=int, default=100)
+    parser.add_argument('--words-per-document', type=int, default=500)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"เอกสาร {args.documents} ชุด ชุดละ {args.words_per_document} คำ, top-{args.top}")
+    print("(เวลาเฉลี่ยต่อเอกสาร, หน่วย ms)")
+    print()
+    print(f"{'vocabulary':>11} {'method':<22} {'update':>10} {'top-n':>10}")
+
+    for size in args.sizes:
+        corpus = build_corpus(size)
+        documents = build_documents(size, args.documents, args.words_per_document)
+
+        rows = [
+            ('Counter', run_counter(corpus, documents, args.top)),
+            ('FrequencyTable scan', run_table(corpus, documents, args.top, top_capacity=0)),
+            ('FrequencyTable top-k', run_table(corpus, documents, args.top, top_capacity=128)),
+        ]
+
+        expected = rows[0][1][2]
+        for name, (_, _, result) in rows[1:]:
+            assert result == expected, f'{name}: top-{args.top} ไม่ตรงกับ Counter ที่ vocabulary {size:,}'
+
+        for name, (update_seconds, query_seconds, _) in rows:
+            print(f"{size:>11,} {name:<22} {update_seconds / args.documents * 1000:>10.3f} "
+                  f"{query_seconds / args.documents * 1000:>10.3f}")
+        print()
+
+    print("✅ ผลลัพธ์ตรงกัน")
+
+
+if __name__ == '__main__':
+    main()
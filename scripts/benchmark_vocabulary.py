@@ -0,0 +1,109 @@
+"""
+Benchmark: ความถี่สะสมแบบ Counter/defaultdict(Counter) vs FrequencyTable (integer id + NumPy)
+จำลองการรวมผลการวิเคราะห์หลาย session เข้ากับตารางเดียว วัดเวลารวม, top-k, หน่วยความจำ
+และตรวจสอบว่าผลลัพธ์ (most_common และการกระจาย POS) เหมือนกัน
+
+การใช้งาน:
+    python scripts/benchmark_vocabulary.py
+    python scripts/benchmark_vocabulary.py --sessions 2000 --vocabulary 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vocabulary import FrequencyTable
+
+POS_TAGS = ['NCMN', 'VACT', 'VSTA', 'NPRP', 'ADVN', 'JSBR', 'RPRE', 'NCNM']
+
+
+def build_sessions(sessions: int, vocabulary: int, words_per_session: int, seed: int = 42) -> list:
+    """สร้าง Counter ของคู่ (คำ, POS) ต่อ session (คำกระจายแบบ Zipf คล้ายภาษาจริง)"""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    words = [f'คำ{i}' for i in range(vocabulary)]
+    result = []
+    for _ in range(sessions):
+        sample = rng.choices(words, weights=weights, k=words_per_session)
+        result.append(Counter((word, rng.choice(POS_TAGS)) for word in sample))
+    return result
+
+
+def aggregate_counter(sessions: list):
+    word_frequency = Counter()
+    pos_frequency = defaultdict(Counter)
+    for word_pos_counts in sessions:
+        for (word, pos), count in word_pos_counts.items():
+            word_frequency[word] += count
+            pos_frequency[word][pos] += count
+    return word_frequency, pos_frequency
+
+
+def aggregate_table(sessions: list) -> FrequencyTable:
+    table = FrequencyTable()
+    for word_pos_counts in sessions:
+        table.add_pairs(word_pos_counts)
+    return table
+
+
+def measure(func, *args):
+    """เวลา (วินาที), หน่วยความจำที่ผลลัพธ์ยังใช้อยู่ (MB) และผลลัพธ์"""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    # วัดหน่วยความจำแยกรอบ (tracemalloc ทำให้โค้ด Python ช้าลงมาก จึงไม่วัดพร้อมเวลา)
+    tracemalloc.start()
+    retained = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return elapsed, current / (1024 * 1024), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ตารางความถี่สะสม')
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--vocabulary', type=int, default=100000)
+    parser.add_argument('--words-per-session', type=int, default=2000)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"กำลังสร้างข้อมูล {args.sessions:,} sessions (vocabulary {args.vocabulary:,} คำ)...")
+    sessions = build_sessions(args.sessions, args.vocabulary, args.words_per_session)
+
+    counter_seconds, counter_mb, (word_frequency, pos_frequency) = measure(aggregate_counter, sessions)
+    table_seconds, table_mb, table = measure(aggregate_table, sessions)
+
+    start = time.perf_counter()
+    counter_top = word_frequency.most_common(args.top)
+    counter_top_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table_top = table.most_common(args.top)
+    table_top_seconds = time.perf_counter() - start
+
+    # ตรวจสอบความถูกต้อง
+    assert table_top == counter_top, 'most_common ไม่ตรงกัน'
+    assert table.to_counter() == word_frequency, 'ความถี่คำไม่ตรงกัน'
+    for word, _ in counter_top:
+        assert table.pos_distribution(word) == dict(pos_frequency[word]), f'POS ของ {word} ไม่ตรงกัน'
+
+    print(f"คำไม่ซ้ำ: {len(table):,}  คู่ (คำ, POS): {len(table._pair_keys):,}")
+    print()
+    print(f"{'':<22} {'aggregate (s)':>14} {'memory (MB)':>17} {'top-' + str(args.top) + ' (ms)':>12}")
+    print(f"{'Counter + dict':<22} {counter_seconds:>14.3f} {counter_mb:>17.1f} {counter_top_seconds * 1000:>12.2f}")
+    print(f"{'FrequencyTable':<22} {table_seconds:>14.3f} {table_mb:>17.1f} {table_top_seconds * 1000:>12.2f}")
+    print(f"{'FrequencyTable arrays':<22} {'':>14} {table.nbytes / (1024 * 1024):>17.1f}")
+    print()
+    print("✅ ผลลัพธ์ตรงกัน")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Production server แบบ prefork สำหรับระบบตรวจจับคำซ้ำ
+โหลดและ warm-up โมเดล PyThaiNLP + categorizer ใน process แม่ แล้ว fork worker หลายตัว
+(worker ใช้หน่วยความจำของโมเดลร่วมกันแบบ copy-on-write) และรายงานหน่วยความจำของแต่ละ worker
+
+การใช้งาน:
+    python serve.py
+    python serve.py --workers 4 --port 8000 --warmup-corpus samples/
+    python serve.py --no-warmup
+"""
+
+import argparse
+import sys
+import time
+
+from app import app, analysis_data
+from config.config import (
+    SERVER_HOST, SERVER_PORT, PREFORK_WORKERS, WARMUP_CORPUS, WARMUP_COMPONENTS, MEMORY_REPORT_INTERVAL
+)
+from core.prefork import PreforkServer, load_warmup_corpus, warm_up_models
+
+
+def main():
+    parser = argparse.ArgumentParser(description='รันเซิร์ฟเวอร์แบบ prefork พร้อมโมเดลที่โหลดไว้ล่วงหน้า')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=PREFORK_WORKERS, help='จำนวน worker (ค่าเริ่มต้น = จำนวน CPU)')
+    parser.add_argument('--warmup-corpus', default=WARMUP_CORPUS, help='ไฟล์ .txt หรือโฟลเดอร์สำหรับ warm-up')
+    parser.add_argument('--no-warmup', action='store_true', help='ไม่โหลดโมเดลก่อน fork')
+    parser.add_argument('--report-interval', type=float, default=MEMORY_REPORT_INTERVAL,
+                        help='รายงานหน่วยความจำทุกกี่วินาที (0 = ครั้งเดียว)')
+    args = parser.parse_args()
+
+    # สถานะของงานเบื้องหลังอยู่ใน worker ที่สร้างงาน แต่ request ถัดไปอาจไปถึง worker อื่น
+    # จึงประมวลผล /api/upload และ /api/batch ให้เสร็จใน request เดียว
+    app.config['SYNC_JOBS'] = True
+    # สถิติสะสม (/api/stats, ?recent=N), ผลการวิเคราะห์สำหรับ /api/export และ /metrics
+    # เป็นของแต่ละ worker เช่นกัน (ไม่รวมข้าม worker) response ของ endpoint เหล่านี้จะระบุ worker ที่ตอบ
+    app.config['PER_WORKER_STATE'] = True
+
+    def warm_up():
+        texts = load_warmup_corpus(args.warmup_corpus)
+        print(f"🔥 กำลัง warm-up โมเดล ({len(texts)} ข้อความ)...")
+        summary = warm_up_models(analysis_data, WARMUP_COMPONENTS, texts)
+        for name, seconds in summary['build_seconds'].items():
+            print(f"   สร้าง {name}: {seconds:.2f}s")
+        print(f"   warm-up: {summary['warmup_seconds']:.2f}s ({summary['unique_words']} คำไม่ซ้ำ)")
+        
+        # matplotlib + การค้นหาฟอนต์ไทย ใช้ร่วมกันได้เช่นเดียวกับโมเดล
+        start = time.perf_counter()
+        analysis_data['chart_service'].warm_up()
+        summary['build_seconds']['chart_service'] = time.perf_counter() - start
+        print(f"   matplotlib: {summary['build_seconds']['chart_service']:.2f}s")
+        return summary
+
+    try:
+        server = PreforkServer(
+            app,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            warm_up=None if args.no_warmup else warm_up,
+            report_interval=args.report_interval
+        )
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
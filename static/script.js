@@ -188,7 +188,8 @@ class WordFrequencyAnalyzer {
                 },
                 body: JSON.stringify({
                     text: text,
-                    filter_pos: true
+                    filter_pos: true,
+                    charts: 'none'  // กราฟวาดด้วย Chart.js จึงไม่ต้องให้ server สร้างภาพ
                 })
             });
 
@@ -698,18 +699,19 @@ class WordFrequencyAnalyzer {
             const formData = new FormData();
             formData.append('file', file);
 
-            this.updateProgress(30, 'กำลังแปลง PDF เป็น text...');
-
-            const response = await fetch('/api/upload', {
+            const response = await fetch('/api/upload?charts=none', {
                 method: 'POST',
                 body: formData
             });
 
-            this.updateProgress(60, 'กำลังวิเคราะห์ข้อความ...');
+            let result = await response.json();
 
-            const result = await response.json();
+            // เซิร์ฟเวอร์สร้างงานเบื้องหลัง: ติดตามความคืบหน้าจนกว่าจะเสร็จ
+            if (result.success && result.job_id) {
+                result = await this.waitForJob(result);
+            }
 
-            this.updateProgress(90, 'กำลังสร้างกราฟและรายงาน...');
+            this.updateProgress(95, 'กำลังแสดงผลลัพธ์...');
 
             if (result.success) {
                 this.currentData = result.data;
@@ -746,6 +748,64 @@ class WordFrequencyAnalyzer {
         }
     }
 
+    waitForJob(job) {
+        const stageMessages = {
+            'extract': 'กำลังแปลง PDF เป็น text...',
+            'tokenize': 'กำลังวิเคราะห์ข้อความ...',
+            'categorize': 'กำลังจัดหมวดหมู่คำ...',
+            'render': 'กำลังสร้างกราฟและรายงาน...'
+        };
+
+        const showStatus = (status) => {
+            const percent = Math.max(10, Math.round(status.progress.progress_percent));
+            this.updateProgress(Math.min(percent, 95), stageMessages[status.stage] || status.message || 'กำลังประมวลผล...');
+        };
+
+        const toResult = (status) => status.status === 'done'
+            ? { success: true, data: status.result }
+            : { success: false, error: status.error };
+
+        return new Promise((resolve) => {
+            const poll = async () => {
+                try {
+                    const response = await fetch(job.status_url);
+                    const body = await response.json();
+                    if (!body.success) {
+                        resolve(body);
+                        return;
+                    }
+                    if (body.data.status === 'done' || body.data.status === 'failed') {
+                        resolve(toResult(body.data));
+                        return;
+                    }
+                    showStatus(body.data);
+                    setTimeout(poll, 1000);
+                } catch (error) {
+                    resolve({ success: false, error: error.message });
+                }
+            };
+
+            // ใช้ Server-Sent Events ถ้าเบราว์เซอร์รองรับ ไม่เช่นนั้น poll ทุก 1 วินาที
+            if (!window.EventSource) {
+                poll();
+                return;
+            }
+
+            const source = new EventSource(job.events_url);
+            source.addEventListener('progress', (event) => showStatus(JSON.parse(event.data)));
+            ['done', 'failed'].forEach((name) => {
+                source.addEventListener(name, (event) => {
+                    source.close();
+                    resolve(toResult(JSON.parse(event.data)));
+                });
+            });
+            source.onerror = () => {
+                source.close();
+                poll();
+            };
+        });
+    }
+
     showProgress(show) {
         const progressContainer = document.getElementById('progressContainer');
         progressContainer.style.display = show ? 'block' : 'none';